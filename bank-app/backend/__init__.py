@@ -1,5 +1,92 @@
+from .analytics import LedgerAnalytics
+from .archive import ArchivePeriod, LedgerArchive
+from .audit import AuditEvent, AuditStats, LoginAuditTrail
 from .auth_service import AuthResult, AuthService
-from .database import BankDatabase
+from .database import BankDatabase, DatabaseActivity, RetryCounter, RetryPolicy
 from .handlers import Backend
+from .history import HistoryEntry, HistoryService
+from .interest import AccrualResult, InterestAccrual, InterestPolicy
+from .limits import TransferLimits
+from .maintenance import MaintenanceScheduler, MaintenanceTask, TaskRun
+from .message_search import MessageHit, MessagePage, MessageSearchService
+from .notifications import CollectingSink, Notification, NotificationSink
+from .payroll import PayrollResult, PayrollService, RowError
+from .recipients import Recipient, RecipientService
+from .reconciliation import Mismatch, ReconciliationResult, ReconciliationService
+from .rollups import AccountDay, DailyStats, RollupService
+from .scheduled_payments import PaymentRun, PaymentScheduler, Schedule, ScheduleResult
+from .sessions import SessionService
+from .snapshots import RefreshResult, Snapshot, SnapshotExporter
+from .storage import (
+    DuplicateError,
+    MemoryUserStore,
+    NewUser,
+    SqliteUserStore,
+    StoreBusyError,
+    UserProfile,
+    UserStore,
+)
+from .transfers import TransferResult, TransferService
+from .workload import WorkloadEvent, WorkloadRecorder, read_workload
 
-__all__ = ["AuthResult", "AuthService", "BankDatabase", "Backend"]
+__all__ = [
+    "AccountDay",
+    "AccrualResult",
+    "ArchivePeriod",
+    "AuditEvent",
+    "AuditStats",
+    "AuthResult",
+    "AuthService",
+    "BankDatabase",
+    "Backend",
+    "CollectingSink",
+    "DailyStats",
+    "DatabaseActivity",
+    "DuplicateError",
+    "HistoryEntry",
+    "HistoryService",
+    "InterestAccrual",
+    "InterestPolicy",
+    "LedgerAnalytics",
+    "LedgerArchive",
+    "LoginAuditTrail",
+    "MaintenanceScheduler",
+    "MaintenanceTask",
+    "MemoryUserStore",
+    "MessageHit",
+    "MessagePage",
+    "MessageSearchService",
+    "Mismatch",
+    "NewUser",
+    "Notification",
+    "NotificationSink",
+    "PaymentRun",
+    "PaymentScheduler",
+    "PayrollResult",
+    "PayrollService",
+    "Recipient",
+    "RecipientService",
+    "ReconciliationResult",
+    "ReconciliationService",
+    "RefreshResult",
+    "RetryCounter",
+    "RetryPolicy",
+    "RollupService",
+    "RowError",
+    "Schedule",
+    "ScheduleResult",
+    "SessionService",
+    "Snapshot",
+    "SnapshotExporter",
+    "SqliteUserStore",
+    "StoreBusyError",
+    "TaskRun",
+    "TransferLimits",
+    "TransferResult",
+    "TransferService",
+    "UserProfile",
+    "UserStore",
+    "WorkloadEvent",
+    "WorkloadRecorder",
+    "read_workload",
+]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Sequence
+
+from .numpy_support import require_numpy
+from .snapshots import Snapshot
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Bucket edges for balance_distribution, in kopecks.
+DEFAULT_BALANCE_EDGES = (0, 100_00, 1_000_00, 10_000_00, 100_000_00, 1_000_000_00)
+
+
+class LedgerAnalytics:
+    """Aggregations over a columnar ledger snapshot.
+
+    Every method returns plain Python values in the same shape as the
+    equivalent SQL in ``tools.bench_analytics`` would, so results can be
+    compared directly.
+    """
+
+    def __init__(self, snapshot: Snapshot) -> None:
+        self._np = require_numpy("Ledger analytics")
+        self.snapshot = snapshot
+
+    def spend_per_month(self, account_id: int | None = None) -> list[tuple[str, int]]:
+        """``(YYYY-MM, kopecks debited)`` in month order."""
+        np = self._np
+        ledger = self.snapshot.ledger
+        mask = ledger["amount"] < 0
+        if account_id is not None:
+            mask &= ledger["account_id"] == account_id
+        days = ledger["created_at"][mask] // 86400
+        months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        keys, sums, _counts = self._group_sum(months, -ledger["amount"][mask])
+        labels = keys.astype("datetime64[M]").astype(str)
+        return [(str(label), int(total)) for label, total in zip(labels, sums)]
+
+    def top_recipients(self, limit: int = 10) -> list[tuple[int, int, int]]:
+        """``(account id, kopecks received, credit count)`` by volume, largest first.
+
+        Only transfers count; credits without a counterparty (interest) don't.
+        """
+        np = self._np
+        ledger = self.snapshot.ledger
+        mask = (ledger["amount"] > 0) & (ledger["counterparty_id"] != 0)
+        keys, sums, counts = self._group_sum(ledger["account_id"][mask], ledger["amount"][mask])
+        order = np.lexsort((keys, -sums))[:limit]
+        return [(int(keys[i]), int(sums[i]), int(counts[i])) for i in order]
+
+    def balance_distribution(
+        self, edges: Sequence[int] = DEFAULT_BALANCE_EDGES
+    ) -> list[tuple[int | None, int | None, int]]:
+        """``(low, high, accounts)`` per half-open bucket; open ends are ``None``."""
+        np = self._np
+        buckets = np.searchsorted(np.asarray(edges, dtype=np.int64), self.snapshot.accounts["balance"], side="right")
+        counts = np.bincount(buckets, minlength=len(edges) + 1)
+        bounds = [None, *edges, None]
+        return [(bounds[i], bounds[i + 1], int(counts[i])) for i in range(len(edges) + 1)]
+
+    def _group_sum(self, keys: np.ndarray, values: np.ndarray) -> tuple[Any, Any, Any]:
+        # Sort once, then reduce contiguous runs; exact for int64, unlike
+        # bincount's float weights.
+        np = self._np
+        if len(keys) == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, empty
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+        sums = np.add.reduceat(values[order], starts)
+        counts = np.diff(np.append(starts, len(sorted_keys)))
+        return sorted_keys[starts], sums, counts
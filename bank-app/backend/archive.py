@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .database import BankDatabase
+
+KEEP_MONTHS = 3
+ARCHIVE_SCHEMA = "archive"
+
+
+@dataclass(frozen=True)
+class ArchivePeriod:
+    period: str
+    path: Path
+    first_id: int
+    last_id: int
+    rows: int
+
+
+class LedgerArchive:
+    """Moves closed months of the ledger into per-month SQLite files.
+
+    Months are archived oldest first, so every archived id is below every
+    hot id. Each move happens in one transaction across the hot database
+    and the new file (both use a rollback journal): the rows are copied,
+    their per-account sums are added to ``archived_totals``, and they are
+    deleted from the hot ledger. Archive files are only ever attached
+    read-only afterwards.
+    """
+
+    def __init__(self, database: BankDatabase, directory: Path) -> None:
+        self.database = database
+        self.directory = directory
+
+    def periods(self, first_id: int | None = None) -> list[ArchivePeriod]:
+        """Archived months, oldest first; with ``first_id``, only those holding ids ≥ it."""
+        with self.database.connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT period, file_name, first_id, last_id, rows
+                FROM ledger_archives
+                WHERE last_id >= ?
+                ORDER BY period
+                """,
+                (first_id or 0,),
+            ).fetchall()
+        return [
+            ArchivePeriod(
+                period=row["period"],
+                path=self.directory / row["file_name"],
+                first_id=row["first_id"],
+                last_id=row["last_id"],
+                rows=row["rows"],
+            )
+            for row in rows
+        ]
+
+    def archivable(self, keep_months: int = KEEP_MONTHS, today: date | None = None) -> list[str]:
+        """Hot months with rows, older than the current month and ``keep_months`` before it."""
+        today = today or date.today()
+        month_index = today.year * 12 + today.month - 1 - keep_months
+        cutoff = f"{month_index // 12:04d}-{month_index % 12 + 1:02d}"
+        with self.database.connection() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT substr(created_at, 1, 7) FROM ledger WHERE created_at < ? ORDER BY 1",
+                (f"{cutoff}-01",),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def archive(
+        self,
+        keep_months: int = KEEP_MONTHS,
+        progress: Callable[[ArchivePeriod], None] | None = None,
+    ) -> list[ArchivePeriod]:
+        archived = []
+        for period in self.archivable(keep_months):
+            result = self.archive_period(period)
+            archived.append(result)
+            if progress is not None:
+                progress(result)
+        return archived
+
+    def archive_period(self, period: str) -> ArchivePeriod:
+        year, month = int(period[:4]), int(period[5:7])
+        end = f"{year + 1:04d}-01-01" if month == 12 else f"{year:04d}-{month + 1:02d}-01"
+        if end > datetime.now().strftime("%Y-%m-01"):
+            raise ValueError(f"Period {period} is not closed yet.")
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        file_name = f"ledger-{period}.db"
+        path = self.directory / file_name
+
+        with self.database.connection() as conn:
+            if conn.execute("SELECT 1 FROM ledger_archives WHERE period = ?", (period,)).fetchone():
+                raise ValueError(f"Period {period} is already archived.")
+            # A file without a ledger_archives row is left over from a failed run.
+            path.unlink(missing_ok=True)
+
+            conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (str(path),))
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                older = conn.execute(
+                    "SELECT COUNT(*) FROM ledger WHERE created_at < ?",
+                    (f"{period}-01",),
+                ).fetchone()[0]
+                if older:
+                    raise ValueError(f"Older months must be archived before {period}.")
+
+                conn.execute(
+                    f"""
+                    CREATE TABLE {ARCHIVE_SCHEMA}.ledger (
+                        id INTEGER PRIMARY KEY,
+                        account_id INTEGER NOT NULL,
+                        counterparty_account_id INTEGER,
+                        amount INTEGER NOT NULL,
+                        message TEXT NOT NULL DEFAULT '',
+                        created_at TEXT NOT NULL
+                    )
+                    """
+                )
+                conn.execute(
+                    f"""
+                    INSERT INTO {ARCHIVE_SCHEMA}.ledger
+                    SELECT id, account_id, counterparty_account_id, amount, message, created_at
+                    FROM main.ledger
+                    WHERE created_at < ?
+                    ORDER BY id
+                    """,
+                    (end,),
+                )
+                conn.execute(
+                    f"CREATE INDEX {ARCHIVE_SCHEMA}.idx_ledger_account_id ON ledger (account_id, id)"
+                )
+                first_id, last_id, rows = conn.execute(
+                    f"SELECT COALESCE(MIN(id), 0), COALESCE(MAX(id), 0), COUNT(*) FROM {ARCHIVE_SCHEMA}.ledger"
+                ).fetchone()
+
+                conn.execute(
+                    f"""
+                    INSERT INTO archived_totals (account_id, amount, entries)
+                    SELECT account_id, SUM(amount), COUNT(*)
+                    FROM {ARCHIVE_SCHEMA}.ledger
+                    WHERE true
+                    GROUP BY account_id
+                    ON CONFLICT (account_id) DO UPDATE SET
+                        amount = amount + excluded.amount,
+                        entries = entries + excluded.entries
+                    """
+                )
+                conn.execute(
+                    """
+                    INSERT INTO ledger_archives (period, file_name, first_id, last_id, rows, archived_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (period, file_name, first_id, last_id, rows, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+                )
+                conn.execute("DELETE FROM main.ledger WHERE created_at < ?", (end,))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                conn.execute(f"DETACH DATABASE {ARCHIVE_SCHEMA}")
+                path.unlink(missing_ok=True)
+                raise
+            conn.execute(f"DETACH DATABASE {ARCHIVE_SCHEMA}")
+
+        os.chmod(path, 0o444)
+        return ArchivePeriod(period, path, first_id, last_id, rows)
+
+    @contextmanager
+    def attached(
+        self, conn: sqlite3.Connection, period: ArchivePeriod, schema: str = ARCHIVE_SCHEMA
+    ) -> Iterator[str]:
+        """Attach one archive read-only for the duration of the block."""
+        conn.execute(f"ATTACH DATABASE ? AS {schema}", (f"{period.path.resolve().as_uri()}?mode=ro",))
+        try:
+            yield schema
+        finally:
+            conn.execute(f"DETACH DATABASE {schema}")
+
+    @contextmanager
+    def connection(self, first_id: int | None = None) -> Iterator[sqlite3.Connection]:
+        """Hot connection with a ``ledger_all`` view spanning hot and archived rows.
+
+        Only archives that can hold ids ≥ ``first_id`` are attached. SQLite
+        pushes WHERE clauses into each branch of the view, so queries that
+        filter by account or id stay indexed.
+        """
+        periods = self.periods(first_id)
+        with self.database.connection() as conn:
+            limit = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+            if len(periods) > limit:
+                raise RuntimeError(
+                    f"{len(periods)} archives needed but SQLite attaches at most {limit}; "
+                    "narrow the query with first_id."
+                )
+            branches = ["SELECT * FROM main.ledger"]
+            for index, period in enumerate(periods):
+                schema = f"archive{index}"
+                conn.execute(f"ATTACH DATABASE ? AS {schema}", (f"{period.path.resolve().as_uri()}?mode=ro",))
+                branches.append(f"SELECT * FROM {schema}.ledger")
+            conn.execute(f"CREATE TEMP VIEW ledger_all AS {' UNION ALL '.join(branches)}")
+            yield conn
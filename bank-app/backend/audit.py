@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+
+from .database import BankDatabase, is_lock_error
+
+SUCCESS = "success"
+WRONG_PASSWORD = "wrong_password"
+UNKNOWN_USER = "unknown_user"
+SESSION = "session"
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+
+CAPACITY = 4096
+BATCH_SIZE = 256
+FLUSH_INTERVAL_SECONDS = 0.5
+
+
+@dataclass(frozen=True)
+class AuditEvent:
+    login: str
+    outcome: str
+    user_id: int | None
+    attempted_at: str
+
+
+@dataclass(frozen=True)
+class AuditStats:
+    recorded: int
+    written: int
+    dropped: int
+    batches: int
+    pending: int
+
+
+class LoginAuditTrail:
+    """Login attempts, written to ``login_audit`` in batches by a background thread.
+
+    ``record`` only appends to a bounded in-memory buffer, so logging in
+    stays a read-only transaction. When the buffer is full, ``BLOCK`` makes
+    the caller wait for the writer and ``DROP_OLDEST`` discards the oldest
+    unwritten event (counted in ``stats().dropped``). A batch that hits a
+    locked database is kept and retried on the next cycle. ``close`` writes
+    whatever is left.
+    """
+
+    def __init__(
+        self,
+        database: BankDatabase,
+        capacity: int = CAPACITY,
+        overflow: str = BLOCK,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+    ) -> None:
+        if overflow not in (BLOCK, DROP_OLDEST):
+            raise ValueError(f"unknown overflow policy {overflow!r}")
+        self.database = database
+        self.capacity = capacity
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: deque[AuditEvent] = deque()
+        self._batch: list[AuditEvent] = []
+        self._changed = threading.Condition()
+        self._stopping = False
+        self._flush_requested = False
+        self._thread: threading.Thread | None = None
+        self._recorded = self._written = self._dropped = self._batches = 0
+
+    def start(self) -> None:
+        with self._changed:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._loop, name="login-audit", daemon=True)
+            self._thread.start()
+
+    def record(self, login: str, outcome: str, user_id: int | None = None) -> None:
+        event = AuditEvent(login, outcome, user_id, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        with self._changed:
+            while len(self._buffer) >= self.capacity:
+                if self.overflow == DROP_OLDEST or self._thread is None:
+                    # Without a writer a blocked caller would never wake up.
+                    self._buffer.popleft()
+                    self._dropped += 1
+                else:
+                    self._flush_requested = True
+                    self._changed.notify_all()
+                    self._changed.wait()
+            self._buffer.append(event)
+            self._recorded += 1
+            if len(self._buffer) >= self.batch_size:
+                self._changed.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until everything recorded so far is written; False on timeout."""
+        if self._thread is None:
+            self._write_pending()
+            return not self._buffer
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._changed:
+            self._flush_requested = True
+            self._changed.notify_all()
+            while self._buffer or self._batch:
+                left = None if deadline is None else deadline - time.monotonic()
+                if left is not None and left <= 0:
+                    return False
+                self._changed.wait(left)
+        return True
+
+    def close(self) -> None:
+        with self._changed:
+            thread = self._thread
+            self._stopping = True
+            self._changed.notify_all()
+        if thread is not None:
+            thread.join()
+            self._thread = None
+        self._write_pending()
+
+    def stats(self) -> AuditStats:
+        with self._changed:
+            return AuditStats(
+                self._recorded,
+                self._written,
+                self._dropped,
+                self._batches,
+                len(self._buffer) + len(self._batch),
+            )
+
+    def recent(
+        self, login: str | None = None, since: str | None = None, limit: int = 100
+    ) -> list[AuditEvent]:
+        """Newest attempts first, optionally for one login and from ``since`` on."""
+        conditions, params = [], []
+        if login is not None:
+            conditions.append("login = ?")
+            params.append(login)
+        if since is not None:
+            conditions.append("attempted_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self.database.connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT login, outcome, user_id, attempted_at
+                FROM login_audit
+                {where}
+                ORDER BY attempted_at DESC, id DESC
+                LIMIT ?
+                """,
+                (*params, limit),
+            ).fetchall()
+        return [AuditEvent(row["login"], row["outcome"], row["user_id"], row["attempted_at"]) for row in rows]
+
+    def _loop(self) -> None:
+        while True:
+            with self._changed:
+                if not self._stopping and not self._flush_requested and len(self._buffer) < self.batch_size:
+                    self._changed.wait(self.flush_interval)
+                self._flush_requested = False
+                if self._stopping:
+                    return
+            try:
+                self._write_pending()
+            except sqlite3.Error:
+                # Audit must never take the app down; the batch stays for the next cycle.
+                time.sleep(self.flush_interval)
+
+    def _write_pending(self) -> None:
+        while True:
+            with self._changed:
+                if not self._batch:
+                    while self._buffer and len(self._batch) < self.batch_size:
+                        self._batch.append(self._buffer.popleft())
+                    # Room was made for callers blocked in record().
+                    self._changed.notify_all()
+                batch = list(self._batch)
+            if not batch:
+                return
+            try:
+                self.database.write("login_audit", lambda conn: _insert(conn, batch))
+            except sqlite3.OperationalError as exc:
+                if not is_lock_error(exc):
+                    raise
+                return
+            with self._changed:
+                self._batch.clear()
+                self._written += len(batch)
+                self._batches += 1
+                self._changed.notify_all()
+
+
+def _insert(conn: sqlite3.Connection, batch: list[AuditEvent]) -> None:
+    conn.executemany(
+        "INSERT INTO login_audit (login, outcome, user_id, attempted_at) VALUES (?, ?, ?, ?)",
+        ((event.login, event.outcome, event.user_id, event.attempted_at) for event in batch),
+    )
+    last_logins: dict[int, str] = {}
+    for event in batch:
+        if event.user_id is not None and event.outcome in (SUCCESS, SESSION):
+            last_logins[event.user_id] = max(event.attempted_at, last_logins.get(event.user_id, ""))
+    conn.executemany(
+        """
+        UPDATE users SET last_login_at = ?
+        WHERE id = ? AND (last_login_at IS NULL OR last_login_at < ?)
+        """,
+        ((moment, user_id, moment) for user_id, moment in last_logins.items()),
+    )
@@ -7,54 +7,91 @@ import sqlite3
 from dataclasses import dataclass
 from datetime import datetime
 
+from .audit import SESSION, SUCCESS, UNKNOWN_USER, WRONG_PASSWORD, LoginAuditTrail
+from .cards import luhn_check_digit
 from .database import BankDatabase
+from .storage import (
+    ACCOUNT_NUMBER,
+    CARD_NUMBER,
+    LOGIN,
+    DuplicateError,
+    NewUser,
+    SqliteUserStore,
+    StoreBusyError,
+    UserProfile,
+    UserStore,
+)
+
+NUMBER_ATTEMPTS = 3
 
 
 @dataclass
 class AuthResult:
     ok: bool
     message: str
+    account_id: int | None = None
+    user_id: int | None = None
 
 
 class AuthService:
-    def __init__(self, database: BankDatabase) -> None:
+    """Login, session resume and registration on top of a ``UserStore``.
+
+    The store defaults to ``SqliteUserStore(database)``; pass ``store`` to
+    run against another engine, e.g. ``MemoryUserStore`` in benchmarks.
+    """
+
+    def __init__(
+        self,
+        database: BankDatabase | None = None,
+        audit: LoginAuditTrail | None = None,
+        store: UserStore | None = None,
+    ) -> None:
+        if store is None:
+            if database is None:
+                raise ValueError("either database or store is required")
+            store = SqliteUserStore(database)
         self.database = database
+        self.audit = audit
+        self.store = store
 
     def bootstrap(self) -> None:
-        self.database.initialize()
+        self.store.initialize()
         self._ensure_demo_user()
 
     def authenticate(self, login: str, password: str) -> AuthResult:
-        with self.database.connection() as conn:
-            row = conn.execute(
-                """
-                SELECT
-                    u.first_name,
-                    u.last_name,
-                    u.password_hash,
-                    a.account_number,
-                    c.card_number
-                FROM users u
-                JOIN accounts a ON a.user_id = u.id
-                JOIN cards c ON c.account_id = a.id
-                WHERE u.login = ?
-                """,
-                (login,),
-            ).fetchone()
-
-        if row is None:
+        profile = self.store.profile_by_login(login)
+        if profile is None:
+            self._audit(login, UNKNOWN_USER)
             return AuthResult(False, "Пользователь с таким логином не найден.")
 
-        if not _verify_password(password, row["password_hash"]):
+        if not _verify_password(password, profile.password_hash):
+            self._audit(login, WRONG_PASSWORD, profile.user_id)
             return AuthResult(False, "Неверный пароль.")
 
-        card_tail = row["card_number"][-4:]
+        self._audit(login, SUCCESS, profile.user_id)
+        return self._welcome(profile)
+
+    def resume(self, user_id: int) -> AuthResult:
+        """Log in a user whose identity was already proven by a session token."""
+        profile = self.store.profile_by_id(user_id)
+        if profile is None:
+            return AuthResult(False, "Пользователь с таким логином не найден.")
+        self._audit(profile.login, SESSION, user_id)
+        return self._welcome(profile)
+
+    def _audit(self, login: str, outcome: str, user_id: int | None = None) -> None:
+        if self.audit is not None:
+            self.audit.record(login, outcome, user_id)
+
+    @staticmethod
+    def _welcome(profile: UserProfile) -> AuthResult:
+        card_tail = profile.card_number[-4:]
         message = (
-            f"Добро пожаловать, {row['first_name']} {row['last_name']}\n"
-            f"Л/С: {row['account_number']}\n"
+            f"Добро пожаловать, {profile.first_name} {profile.last_name}\n"
+            f"Л/С: {profile.account_number}\n"
             f"Карта: **** **** **** {card_tail}"
         )
-        return AuthResult(True, message)
+        return AuthResult(True, message, account_id=profile.account_id, user_id=profile.user_id)
 
     def register_user(
         self,
@@ -66,56 +103,38 @@ class AuthService:
         registered_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         password_hash = _hash_password(password)
 
-        try:
-            with self.database.connection() as conn:
-                account_number = self._generate_unique_account_number(conn)
-                card_number = self._generate_unique_card_number(conn)
-
-                cursor = conn.execute(
-                    """
-                    INSERT INTO users (login, first_name, last_name, password_hash, registered_at)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (login, first_name, last_name, password_hash, registered_at),
-                )
-                user_id = cursor.lastrowid
-
-                cursor = conn.execute(
-                    """
-                    INSERT INTO accounts (user_id, account_number)
-                    VALUES (?, ?)
-                    """,
-                    (user_id, account_number),
-                )
-                account_id = cursor.lastrowid
-
-                conn.execute(
-                    """
-                    INSERT INTO cards (account_id, card_number)
-                    VALUES (?, ?)
-                    """,
-                    (account_id, card_number),
-                )
-        except sqlite3.IntegrityError as exc:
-            text = str(exc)
-            if "users.login" in text:
-                return AuthResult(False, "Логин уже существует.")
-            if "accounts.account_number" in text:
-                return AuthResult(False, "Л/С уже существует.")
-            if "cards.card_number" in text:
+        # Numbers are picked before the insert, so another registration can
+        # take the same one in between; that collision just picks again.
+        for attempt in range(NUMBER_ATTEMPTS):
+            user = NewUser(
+                login=login,
+                first_name=first_name,
+                last_name=last_name,
+                password_hash=password_hash,
+                registered_at=registered_at,
+                account_number=self._generate_unique_number(ACCOUNT_NUMBER, prefix="40817", total_length=20),
+                card_number=self._generate_unique_number(CARD_NUMBER, prefix="2200", total_length=16, luhn=True),
+            )
+            try:
+                self.store.insert_user(user)
+            except DuplicateError as exc:
+                if exc.field == LOGIN:
+                    return AuthResult(False, "Логин уже существует.")
+                if attempt + 1 < NUMBER_ATTEMPTS:
+                    continue
+                if exc.field == ACCOUNT_NUMBER:
+                    return AuthResult(False, "Л/С уже существует.")
                 return AuthResult(False, "Номер карты уже существует.")
-            return AuthResult(False, "Ошибка регистрации в базе данных.")
+            except StoreBusyError:
+                return AuthResult(False, "База данных занята, повторите попытку позже.")
+            except sqlite3.IntegrityError:
+                return AuthResult(False, "Ошибка регистрации в базе данных.")
+            break
 
         return AuthResult(True, "Пользователь зарегистрирован.")
 
     def _ensure_demo_user(self) -> None:
-        with self.database.connection() as conn:
-            row = conn.execute(
-                "SELECT id FROM users WHERE login = ?",
-                ("demo",),
-            ).fetchone()
-
-        if row is not None:
+        if self.store.profile_by_login("demo") is not None:
             return
 
         self.register_user(
@@ -125,43 +144,22 @@ class AuthService:
             password="demo123",
         )
 
-    def _generate_unique_account_number(self, conn: sqlite3.Connection) -> str:
-        return self._generate_unique_number(
-            conn=conn,
-            table="accounts",
-            column="account_number",
-            prefix="40817",
-            total_length=20,
-        )
-
-    def _generate_unique_card_number(self, conn: sqlite3.Connection) -> str:
-        return self._generate_unique_number(
-            conn=conn,
-            table="cards",
-            column="card_number",
-            prefix="2200",
-            total_length=16,
-        )
-
-    @staticmethod
     def _generate_unique_number(
-        conn: sqlite3.Connection,
-        table: str,
-        column: str,
+        self,
+        field: str,
         prefix: str,
         total_length: int,
+        luhn: bool = False,
     ) -> str:
-        random_len = total_length - len(prefix)
+        random_len = total_length - len(prefix) - (1 if luhn else 0)
         if random_len <= 0:
             raise ValueError("total_length must be greater than prefix length")
 
         for _ in range(1000):
             value = prefix + "".join(secrets.choice("0123456789") for _ in range(random_len))
-            row = conn.execute(
-                f"SELECT 1 FROM {table} WHERE {column} = ? LIMIT 1",
-                (value,),
-            ).fetchone()
-            if row is None:
+            if luhn:
+                value += luhn_check_digit(value)
+            if not self.store.number_exists(field, value):
                 return value
 
         raise RuntimeError("Не удалось сгенерировать уникальный номер")
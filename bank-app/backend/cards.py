@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+
+def luhn_check_digit(digits: str) -> str:
+    """Check digit that makes ``digits + check`` pass the Luhn test."""
+    total = 0
+    for index, char in enumerate(reversed(digits)):
+        value = ord(char) - 48
+        if index % 2 == 0:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return str((10 - total % 10) % 10)
+
+
+def is_luhn_valid(number: str) -> bool:
+    if len(number) < 2 or not number.isdigit():
+        return False
+    return luhn_check_digit(number[:-1]) == number[-1]
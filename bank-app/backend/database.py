@@ -1,32 +1,219 @@
 from __future__ import annotations
 
+import random
 import sqlite3
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Iterator
+from typing import Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+ACTIVITY_WINDOW_SECONDS = 300.0
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How long to wait for a locked database.
+
+    ``busy_timeout`` is SQLite's own wait inside a single statement.
+    ``write()`` additionally retries a whole transaction up to ``attempts``
+    times, sleeping a random delay of up to ``base_delay * 2**attempt``
+    (capped at ``max_delay``) so competing writers do not retry in lockstep.
+    """
+
+    busy_timeout: float = 1.0
+    attempts: int = 5
+    base_delay: float = 0.02
+    max_delay: float = 0.5
+
+
+@dataclass
+class RetryCounter:
+    calls: int = 0
+    retries: int = 0
+    failures: int = 0
+    lock_wait: float = 0.0
+
+
+class DatabaseActivity:
+    """Recent connections and lock errors in this process.
+
+    Background jobs use it to stay out of the way of interactive traffic.
+    """
+
+    def __init__(self, window_seconds: float = ACTIVITY_WINDOW_SECONDS) -> None:
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._connections: deque[float] = deque()
+        self._busy: deque[float] = deque()
+
+    def connection_opened(self) -> None:
+        self._record(self._connections)
+
+    def busy(self) -> None:
+        self._record(self._busy)
+
+    def recent(self, seconds: float) -> tuple[int, int]:
+        """Connections opened and lock errors seen in the last ``seconds``."""
+        since = time.monotonic() - seconds
+        with self._lock:
+            return (
+                sum(1 for moment in self._connections if moment >= since),
+                sum(1 for moment in self._busy if moment >= since),
+            )
+
+    def _record(self, events: deque[float]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            events.append(now)
+            while events and events[0] < now - self.window_seconds:
+                events.popleft()
+
+
+# Full-text index over the messages of transfers and payroll credits. A
+# transfer writes a debit and a credit row with the same message; only the
+# credit (amount > 0 with a counterparty) is indexed, so each transfer is
+# found once. System rows (opening balances, interest) have no
+# counterparty and are left out: one message repeated on every account is
+# not worth indexing. The index stores no text of its own (content='ledger'); the
+# triggers keep it in step with inserts and with the deletes done by
+# archiving. The ledger is append-only otherwise.
+MESSAGE_INDEX_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS ledger_messages USING fts5(
+    message,
+    content = 'ledger',
+    content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_ledger_messages_insert
+AFTER INSERT ON ledger
+WHEN NEW.message != '' AND NEW.amount > 0 AND NEW.counterparty_account_id IS NOT NULL
+BEGIN
+    INSERT INTO ledger_messages (rowid, message) VALUES (NEW.id, NEW.message);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_ledger_messages_delete
+AFTER DELETE ON ledger
+WHEN OLD.message != '' AND OLD.amount > 0 AND OLD.counterparty_account_id IS NOT NULL
+BEGIN
+    INSERT INTO ledger_messages (ledger_messages, rowid, message) VALUES ('delete', OLD.id, OLD.message);
+END;
+"""
+
+
+def reindex_messages(conn: sqlite3.Connection) -> None:
+    # 'rebuild' would index every ledger row; only the triggers' rows belong here.
+    conn.execute("INSERT INTO ledger_messages (ledger_messages) VALUES ('delete-all')")
+    conn.execute(
+        """
+        INSERT INTO ledger_messages (rowid, message)
+        SELECT id, message FROM ledger
+        WHERE message != '' AND amount > 0 AND counterparty_account_id IS NOT NULL
+        """
+    )
+
+
+def fts5_available(conn: sqlite3.Connection) -> bool:
+    return bool(conn.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')").fetchone()[0])
+
+
+def is_lock_error(exc: BaseException) -> bool:
+    return isinstance(exc, sqlite3.OperationalError) and (
+        "locked" in str(exc) or "busy" in str(exc)
+    )
 
 
 class BankDatabase:
-    def __init__(self, db_path: Path) -> None:
+    def __init__(self, db_path: Path, retry: RetryPolicy | None = None) -> None:
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.retry = retry or RetryPolicy()
+        self.activity = DatabaseActivity()
+        self._retry_stats: dict[str, RetryCounter] = {}
+        self._stats_lock = threading.Lock()
 
     @contextmanager
-    def connection(self) -> Iterator[sqlite3.Connection]:
-        conn = sqlite3.connect(self.db_path)
+    def connection(self, track: bool = True) -> Iterator[sqlite3.Connection]:
+        # Maintenance passes track=False so its own work is not mistaken for traffic.
+        if track:
+            self.activity.connection_opened()
+        conn = sqlite3.connect(self.db_path, timeout=self.retry.busy_timeout)
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA foreign_keys = ON;")
         try:
             yield conn
             conn.commit()
-        except Exception:
+        except Exception as exc:
+            if is_lock_error(exc):
+                self.activity.busy()
             conn.rollback()
             raise
         finally:
             conn.close()
 
+    def write(self, name: str, work: Callable[[sqlite3.Connection], T]) -> T:
+        """Run ``work`` in an IMMEDIATE transaction, retrying it on lock errors.
+
+        Taking the write lock up front means a busy database fails at BEGIN,
+        before any work is done, rather than at the first write or at COMMIT.
+        ``name`` keys the counters returned by ``retry_stats()``.
+        """
+        policy = self.retry
+        waited = 0.0
+        attempt = 0
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    with self.connection() as conn:
+                        conn.execute("BEGIN IMMEDIATE")
+                        waited += time.perf_counter() - started
+                        started = time.perf_counter()
+                        return work(conn)
+                except sqlite3.OperationalError as exc:
+                    if not is_lock_error(exc):
+                        raise
+                    # Work done before a lock error at COMMIT is lost too.
+                    waited += time.perf_counter() - started
+                    attempt += 1
+                    if attempt == policy.attempts:
+                        self._count(name, failed=True)
+                        raise
+                    self._count(name, retried=True)
+                    delay = random.uniform(0, min(policy.max_delay, policy.base_delay * 2 ** (attempt - 1)))
+                    time.sleep(delay)
+                    waited += delay
+        finally:
+            self._count(name, lock_wait=waited)
+
+    def retry_stats(self) -> dict[str, RetryCounter]:
+        with self._stats_lock:
+            return {name: replace(counter) for name, counter in self._retry_stats.items()}
+
+    def _count(
+        self, name: str, retried: bool = False, failed: bool = False, lock_wait: float | None = None
+    ) -> None:
+        with self._stats_lock:
+            counter = self._retry_stats.setdefault(name, RetryCounter())
+            if lock_wait is not None:
+                counter.calls += 1
+                counter.lock_wait += lock_wait
+            counter.retries += retried
+            counter.failures += failed
+
     def initialize(self) -> None:
         with self.connection() as conn:
+            # Only takes effect on a new, empty file; older databases are
+            # converted by the maintenance job.
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            existing = {
+                row["name"] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            }
             conn.executescript(
                 """
                 CREATE TABLE IF NOT EXISTS users (
@@ -35,13 +222,15 @@ class BankDatabase:
                     first_name TEXT NOT NULL,
                     last_name TEXT NOT NULL,
                     password_hash TEXT NOT NULL,
-                    registered_at TEXT NOT NULL
+                    registered_at TEXT NOT NULL,
+                    last_login_at TEXT
                 );
 
                 CREATE TABLE IF NOT EXISTS accounts (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     user_id INTEGER NOT NULL UNIQUE,
                     account_number TEXT NOT NULL UNIQUE,
+                    balance INTEGER NOT NULL DEFAULT 0,
                     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
                 );
 
@@ -51,5 +240,257 @@ class BankDatabase:
                     card_number TEXT NOT NULL UNIQUE,
                     FOREIGN KEY (account_id) REFERENCES accounts(id) ON DELETE CASCADE
                 );
+
+                CREATE TABLE IF NOT EXISTS ledger (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    account_id INTEGER NOT NULL,
+                    counterparty_account_id INTEGER,
+                    amount INTEGER NOT NULL,
+                    message TEXT NOT NULL DEFAULT '',
+                    created_at TEXT NOT NULL,
+                    FOREIGN KEY (account_id) REFERENCES accounts(id) ON DELETE CASCADE
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_ledger_account_id
+                    ON ledger (account_id, id);
+
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id TEXT PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    created_at TEXT NOT NULL,
+                    expires_at INTEGER NOT NULL,
+                    revoked_at TEXT,
+                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_sessions_user_revoked
+                    ON sessions (user_id, revoked_at);
+
+                CREATE INDEX IF NOT EXISTS idx_sessions_expires_at
+                    ON sessions (expires_at);
+
+                CREATE TABLE IF NOT EXISTS daily_stats (
+                    day TEXT PRIMARY KEY,
+                    new_users INTEGER NOT NULL DEFAULT 0,
+                    transfers INTEGER NOT NULL DEFAULT 0,
+                    volume INTEGER NOT NULL DEFAULT 0
+                );
+
+                CREATE TABLE IF NOT EXISTS daily_account_stats (
+                    account_id INTEGER NOT NULL,
+                    day TEXT NOT NULL,
+                    credits INTEGER NOT NULL DEFAULT 0,
+                    credit_volume INTEGER NOT NULL DEFAULT 0,
+                    debits INTEGER NOT NULL DEFAULT 0,
+                    debit_volume INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (account_id, day)
+                ) WITHOUT ROWID;
+
+                CREATE TRIGGER IF NOT EXISTS trg_users_daily_stats
+                AFTER INSERT ON users
+                BEGIN
+                    INSERT INTO daily_stats (day, new_users)
+                    VALUES (substr(NEW.registered_at, 1, 10), 1)
+                    ON CONFLICT (day) DO UPDATE SET new_users = new_users + 1;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS trg_ledger_daily_stats
+                AFTER INSERT ON ledger
+                BEGIN
+                    INSERT INTO daily_stats (day, transfers, volume)
+                    SELECT substr(NEW.created_at, 1, 10), 1, NEW.amount
+                    WHERE NEW.amount > 0 AND NEW.counterparty_account_id IS NOT NULL
+                    ON CONFLICT (day) DO UPDATE SET
+                        transfers = transfers + 1,
+                        volume = volume + excluded.volume;
+
+                    INSERT INTO daily_account_stats (
+                        account_id, day, credits, credit_volume, debits, debit_volume
+                    )
+                    VALUES (
+                        NEW.account_id,
+                        substr(NEW.created_at, 1, 10),
+                        NEW.amount > 0,
+                        MAX(NEW.amount, 0),
+                        NEW.amount < 0,
+                        MAX(-NEW.amount, 0)
+                    )
+                    ON CONFLICT (account_id, day) DO UPDATE SET
+                        credits = credits + excluded.credits,
+                        credit_volume = credit_volume + excluded.credit_volume,
+                        debits = debits + excluded.debits,
+                        debit_volume = debit_volume + excluded.debit_volume;
+                END;
+
+                CREATE TABLE IF NOT EXISTS limit_buckets (
+                    account_id INTEGER NOT NULL,
+                    hour INTEGER NOT NULL,
+                    volume INTEGER NOT NULL DEFAULT 0,
+                    transfers INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (account_id, hour)
+                ) WITHOUT ROWID;
+
+                -- Outgoing transfers per account and hour, for the daily limits.
+                -- Payroll debits have no counterparty and are not limited.
+                CREATE TRIGGER IF NOT EXISTS trg_ledger_limit_buckets
+                AFTER INSERT ON ledger
+                WHEN NEW.amount < 0 AND NEW.counterparty_account_id IS NOT NULL
+                BEGIN
+                    INSERT INTO limit_buckets (account_id, hour, volume, transfers)
+                    VALUES (
+                        NEW.account_id,
+                        CAST(strftime('%s', NEW.created_at) AS INTEGER) / 3600,
+                        -NEW.amount,
+                        1
+                    )
+                    ON CONFLICT (account_id, hour) DO UPDATE SET
+                        volume = volume + excluded.volume,
+                        transfers = transfers + 1;
+                END;
+
+                CREATE TABLE IF NOT EXISTS reconciliation_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    started_at TEXT NOT NULL,
+                    finished_at TEXT NOT NULL,
+                    accounts INTEGER NOT NULL,
+                    mismatches INTEGER NOT NULL,
+                    workers INTEGER NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS reconciliation_mismatches (
+                    run_id INTEGER NOT NULL,
+                    account_id INTEGER NOT NULL,
+                    balance INTEGER NOT NULL,
+                    ledger_total INTEGER NOT NULL,
+                    ledger_id INTEGER NOT NULL,
+                    PRIMARY KEY (run_id, account_id),
+                    FOREIGN KEY (run_id) REFERENCES reconciliation_runs(id) ON DELETE CASCADE
+                ) WITHOUT ROWID;
+
+                CREATE TABLE IF NOT EXISTS ledger_archives (
+                    period TEXT PRIMARY KEY,
+                    file_name TEXT NOT NULL,
+                    first_id INTEGER NOT NULL,
+                    last_id INTEGER NOT NULL,
+                    rows INTEGER NOT NULL,
+                    archived_at TEXT NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS maintenance_runs (
+                    task TEXT PRIMARY KEY,
+                    last_run INTEGER NOT NULL,
+                    elapsed REAL NOT NULL,
+                    result TEXT NOT NULL,
+                    ran_at TEXT NOT NULL
+                );
+
+                -- Per-account totals of everything moved to archive files, so
+                -- balances and history counts never have to open them.
+                CREATE TABLE IF NOT EXISTS archived_totals (
+                    account_id INTEGER PRIMARY KEY,
+                    amount INTEGER NOT NULL DEFAULT 0,
+                    entries INTEGER NOT NULL DEFAULT 0
+                );
+
+                -- Written in batches by LoginAuditTrail, never inside a login.
+                CREATE TABLE IF NOT EXISTS login_audit (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    login TEXT NOT NULL,
+                    outcome TEXT NOT NULL,
+                    user_id INTEGER,
+                    attempted_at TEXT NOT NULL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_login_audit_login_time
+                ON login_audit (login, attempted_at);
+
+                CREATE INDEX IF NOT EXISTS idx_login_audit_time
+                ON login_audit (attempted_at);
+
+                -- Standing orders. Run k is due at anchor + k intervals;
+                -- next_run is NULL once a schedule has nothing left to run.
+                CREATE TABLE IF NOT EXISTS payment_schedules (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    payer_account_id INTEGER NOT NULL,
+                    card_number TEXT NOT NULL,
+                    amount INTEGER NOT NULL,
+                    message TEXT NOT NULL DEFAULT '',
+                    interval TEXT NOT NULL,
+                    anchor TEXT NOT NULL,
+                    occurrence INTEGER NOT NULL DEFAULT 0,
+                    next_run TEXT,
+                    active INTEGER NOT NULL DEFAULT 1,
+                    last_run TEXT,
+                    last_result TEXT,
+                    created_at TEXT NOT NULL,
+                    FOREIGN KEY (payer_account_id) REFERENCES accounts(id) ON DELETE CASCADE
+                );
+
+                -- Only active schedules are indexed, so the scheduler's range
+                -- query never touches finished or cancelled ones.
+                CREATE INDEX IF NOT EXISTS idx_payment_schedules_due
+                ON payment_schedules (next_run) WHERE active = 1;
+
+                CREATE INDEX IF NOT EXISTS idx_payment_schedules_payer
+                ON payment_schedules (payer_account_id);
+
+                CREATE TABLE IF NOT EXISTS payment_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    schedule_id INTEGER NOT NULL,
+                    due_at TEXT NOT NULL,
+                    ran_at TEXT NOT NULL,
+                    ok INTEGER NOT NULL,
+                    message TEXT NOT NULL
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_payment_runs_schedule
+                ON payment_runs (schedule_id, due_at);
+
+                -- One row per accrual day; last_account_id is the resume point.
+                CREATE TABLE IF NOT EXISTS interest_runs (
+                    day TEXT PRIMARY KEY,
+                    last_account_id INTEGER NOT NULL,
+                    accounts INTEGER NOT NULL DEFAULT 0,
+                    credited INTEGER NOT NULL DEFAULT 0,
+                    charged INTEGER NOT NULL DEFAULT 0,
+                    started_at TEXT NOT NULL,
+                    finished_at TEXT
+                );
+                """
+            )
+            if fts5_available(conn):
+                conn.executescript(MESSAGE_INDEX_SCHEMA)
+            self._migrate(conn, existing)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection, existing: set[str]) -> None:
+        # Schema added after the first release; CREATE TABLE IF NOT EXISTS
+        # leaves tables of older databases untouched.
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(accounts)")}
+        if "balance" not in columns:
+            conn.execute("ALTER TABLE accounts ADD COLUMN balance INTEGER NOT NULL DEFAULT 0")
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(users)")}
+        if "last_login_at" not in columns:
+            conn.execute("ALTER TABLE users ADD COLUMN last_login_at TEXT")
+
+        if "ledger_messages" not in existing and "ledger" in existing and fts5_available(conn):
+            reindex_messages(conn)
+
+        if "limit_buckets" not in existing and "ledger" in existing:
+            # Ledger rows written before the trigger existed; only the last
+            # day matters for the limits.
+            conn.execute(
+                """
+                INSERT INTO limit_buckets (account_id, hour, volume, transfers)
+                SELECT
+                    account_id,
+                    CAST(strftime('%s', created_at) AS INTEGER) / 3600,
+                    -SUM(amount),
+                    COUNT(*)
+                FROM ledger
+                WHERE amount < 0
+                    AND counterparty_account_id IS NOT NULL
+                    AND created_at >= datetime('now', 'localtime', '-1 day')
+                GROUP BY 1, 2
                 """
             )
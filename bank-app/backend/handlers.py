@@ -1,50 +1,151 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from tkinter import messagebox
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
 
-from .auth_service import AuthService
+from .auth_service import AuthResult, AuthService
+from .history import HistoryEntry, HistoryService
+from .message_search import PAGE_SIZE, MessagePage, MessageSearchService
+from .notifications import (
+    ERROR,
+    INFO,
+    WARNING,
+    CollectingSink,
+    Notification,
+    NotificationSink,
+)
+from .payroll import parse_amount
+from .recipients import Recipient, RecipientService
+from .scheduled_payments import PaymentScheduler
+from .sessions import SessionService
+from .transfers import TransferService
+from .workload import (
+    HISTORY_COUNT,
+    HISTORY_PAGE,
+    LOGIN,
+    REGISTER,
+    SEARCH,
+    TRANSFER,
+    WorkloadRecorder,
+)
 
 
 @dataclass
 class Backend:
     auth_service: AuthService
+    history_service: HistoryService | None = None
+    message_search: MessageSearchService | None = None
+    recipient_service: RecipientService | None = None
+    session_service: SessionService | None = None
+    transfer_service: TransferService | None = None
+    payment_scheduler: PaymentScheduler | None = None
+    current_account_id: int | None = None
+    remember_login: bool = False
+    session_token: str | None = None
+    notifier: NotificationSink = field(default_factory=CollectingSink)
+    recorder: WorkloadRecorder | None = None
 
     def on_help(self) -> None:
-        messagebox.showinfo("Помощь", "Да помоги вам богъ.")
+        self._notify(INFO, "Помощь", "Да помоги вам богъ.")
 
     def on_menu(self) -> None:
-        messagebox.showinfo("Меню", "Не лезь оно тебя тебя сожрет.")
+        self._notify(INFO, "Меню", "Не лезь оно тебя тебя сожрет.")
 
     def on_profile(self) -> None:
-        messagebox.showinfo("Профиль", "Nice Backend bro😉.")
+        self._notify(INFO, "Профиль", "Nice Backend bro😉.")
 
     def on_settings(self) -> None:
-        messagebox.showinfo("Настройки", "У вас недостаточно прав доступа, свяжитесь с администратором.")
+        self._notify(INFO, "Настройки", "У вас недостаточно прав доступа, свяжитесь с администратором.")
 
     def on_security(self) -> None:
-        messagebox.showinfo("Безопасность", "Это вам не понадобяться, мы и так самый безопасный банк, век воли не видать.")
+        self._notify(INFO, "Безопасность", "Это вам не понадобяться, мы и так самый безопасный банк, век воли не видать.")
 
     def on_support(self) -> None:
-        messagebox.showinfo("Поддержка", "+7 (495) 989-50-50-телефон доверия.")
+        self._notify(INFO, "Поддержка", "+7 (495) 989-50-50-телефон доверия.")
 
     def on_logout(self) -> None:
-        messagebox.showinfo("Выход", "Один раз зайдя, оставь надежду всяк сюда входящий.")
+        self.current_account_id = None
+        self._drop_session()
+        self._notify(INFO, "Выход", "Один раз зайдя, оставь надежду всяк сюда входящий.")
 
     def on_login(self, login: str, password: str) -> None:
         if not login.strip() or not password:
-            messagebox.showwarning("Авторизация", "Введите логин и пароль.")
+            self._notify(WARNING, "Авторизация", "Введите логин и пароль.")
             return
 
+        started = time.monotonic()
         result = self.auth_service.authenticate(login.strip(), password)
+        if self.recorder is not None:
+            self.recorder.record(LOGIN, started, result.ok, self.recorder.token(login.strip()))
         if result.ok:
-            messagebox.showinfo("Авторизация", result.message)
+            self.current_account_id = result.account_id
+            if self.remember_login and self.session_service is not None:
+                self._drop_session()
+                self.session_token = self.session_service.issue(result.user_id)
+                self.session_service.save_local(self.session_token)
+            self._notify(INFO, "Авторизация", result.message)
             return
 
-        messagebox.showerror("Авторизация", result.message)
+        self._notify(ERROR, "Авторизация", result.message)
+
+    def history_account(self) -> int | None:
+        if self.history_service is None:
+            return None
+        if self.current_account_id is None:
+            self._notify(WARNING, "История", "Сначала авторизуйтесь.")
+            return None
+        return self.current_account_id
+
+    def history_count(self, account_id: int) -> int:
+        started = time.monotonic()
+        count = self.history_service.count(account_id)
+        if self.recorder is not None:
+            self.recorder.record(HISTORY_COUNT, started, True, self.recorder.token(account_id))
+        return count
+
+    def history_page(
+        self, account_id: int, offset: int, limit: int, before_id: int | None = None
+    ) -> list[HistoryEntry]:
+        started = time.monotonic()
+        rows = self.history_service.page(account_id, offset, limit, before_id)
+        if self.recorder is not None:
+            self.recorder.record(
+                HISTORY_PAGE,
+                started,
+                True,
+                self.recorder.token(account_id),
+                offset,
+                limit,
+                before_id is not None,
+            )
+        return rows
+
+    def search_recipients(self, query: str) -> list[Recipient]:
+        if self.recipient_service is None:
+            return []
+        started = time.monotonic()
+        results = self.recipient_service.search(query)
+        if self.recorder is not None:
+            self.recorder.record(SEARCH, started, bool(results), min(len(query), 255))
+        return results
+
+    def search_messages(
+        self,
+        text: str,
+        offset: int = 0,
+        limit: int = PAGE_SIZE,
+        prefix: bool = False,
+        account_id: int | None = None,
+    ) -> MessagePage:
+        """Ranked page of transfer messages matching ``text``, across all accounts by default."""
+        if self.message_search is None:
+            return MessagePage([], offset, 0)
+        return self.message_search.search(text, offset, limit, prefix, account_id)
 
     def on_register(self) -> None:
-        messagebox.showinfo(
+        self._notify(
+            INFO,
             "Регистрация",
             "Кнопка регистрации пока заглушка.\n"
             "Для теста авторизации используйте: demo / demo123",
@@ -63,28 +164,117 @@ class Backend:
         password = password.strip()
 
         if not all([login, first_name, last_name, password]):
-            messagebox.showwarning("Регистрация", "Заполните все поля.")
+            self._notify(WARNING, "Регистрация", "Заполните все поля.")
             return False
 
+        started = time.monotonic()
         result = self.auth_service.register_user(
             login=login,
             first_name=first_name,
             last_name=last_name,
             password=password,
         )
+        if self.recorder is not None:
+            self.recorder.record(REGISTER, started, result.ok, self.recorder.token(login))
         if result.ok:
-            messagebox.showinfo(
+            self._notify(
+                INFO,
                 "Регистрация",
                 "Пользователь зарегистрирован.\n"
                 "Лицевой счет и номер карты созданы автоматически.",
             )
             return True
 
-        messagebox.showerror("Регистрация", result.message)
+        self._notify(ERROR, "Регистрация", result.message)
         return False
 
-    def on_transfer(self) -> None:
-        messagebox.showinfo("Перевод", "Перевод успешно выполнен! Ваши средства ушли в пользу общака.")
+    def on_transfer(self, card_number: str, amount: str, message: str) -> bool:
+        if self.transfer_service is None:
+            self._notify(INFO, "Перевод", "Перевод успешно выполнен! Ваши средства ушли в пользу общака.")
+            return False
+        if self.current_account_id is None:
+            self._notify(WARNING, "Перевод", "Сначала авторизуйтесь.")
+            return False
+
+        started = time.monotonic()
+        result = self.transfer_service.transfer(self.current_account_id, card_number, amount, message)
+        if self.recorder is not None:
+            self.recorder.record(
+                TRANSFER,
+                started,
+                result.ok,
+                self.recorder.token(self.current_account_id),
+                self.recorder.token(card_number.replace(" ", "").strip()),
+                parse_amount(amount) or 0,
+                min(len(message.strip()), 65535),
+            )
+        self._notify(INFO if result.ok else ERROR, "Перевод", result.message)
+        return result.ok
+
+    def on_schedule_payment(
+        self, card_number: str, amount: str, message: str, interval: str, first_run: datetime
+    ) -> bool:
+        if self.payment_scheduler is None:
+            self._notify(WARNING, "Автоплатёж", "Автоплатежи недоступны.")
+            return False
+        if self.current_account_id is None:
+            self._notify(WARNING, "Автоплатёж", "Сначала авторизуйтесь.")
+            return False
+
+        result = self.payment_scheduler.add(
+            self.current_account_id, card_number, amount, message, interval, first_run
+        )
+        self._notify(INFO if result.ok else ERROR, "Автоплатёж", result.message)
+        return result.ok
+
+    def load_transfer_limits(self) -> None:
+        if self.transfer_service is not None and self.transfer_service.limits is not None:
+            self.transfer_service.limits.load()
+
+    def on_remember_toggle(self) -> bool:
+        self.remember_login = not self.remember_login
+        if not self.remember_login:
+            self._drop_session()
+        return self.remember_login
+
+    def restore_session(self) -> AuthResult | None:
+        """Resume a remembered login from the local token; safe off the Tk thread."""
+        if self.session_service is None:
+            return None
+
+        token = self.session_service.load_local()
+        if token is None:
+            return None
 
-    def on_remember_toggle(self) -> None:
-        messagebox.showinfo("Запомнить", "Переключатель запоминания (заглушка).")
+        user_id = self.session_service.verify(token)
+        if user_id is None:
+            self.session_service.forget_local()
+            return None
+
+        result = self.auth_service.resume(user_id)
+        if not result.ok:
+            self.session_service.forget_local()
+            return None
+
+        self.current_account_id = result.account_id
+        self.session_token = token
+        self.remember_login = True
+        return result
+
+    def on_session_restored(self, result: AuthResult) -> None:
+        self._notify(INFO, "Авторизация", result.message)
+
+    def cleanup_sessions(self) -> int:
+        if self.session_service is None:
+            return 0
+        return self.session_service.cleanup_expired()
+
+    def _notify(self, level: str, title: str, message: str) -> None:
+        self.notifier.emit(Notification(level, title, message))
+
+    def _drop_session(self) -> None:
+        if self.session_service is None or self.session_token is None:
+            return
+        self.session_service.revoke(self.session_token)
+        self.session_service.forget_local()
+        self.session_token = None
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+
+from .archive import LedgerArchive
+from .database import BankDatabase
+
+
+@dataclass(frozen=True)
+class HistoryEntry:
+    id: int
+    created_at: str
+    counterparty: str
+    amount: int
+    message: str
+
+
+class HistoryService:
+    """Newest-first ledger pages for one account.
+
+    Amounts are signed kopecks: debits are negative, credits positive. With
+    an archive, pages continue into archived months once the hot ledger
+    runs out; archive files are attached one at a time, newest first.
+    """
+
+    def __init__(self, database: BankDatabase, archive: LedgerArchive | None = None) -> None:
+        self.database = database
+        self.archive = archive
+
+    def count(self, account_id: int) -> int:
+        with self.database.connection() as conn:
+            row = conn.execute(
+                """
+                SELECT
+                    (SELECT COUNT(*) FROM ledger WHERE account_id = ?)
+                    + COALESCE((SELECT entries FROM archived_totals WHERE account_id = ?), 0)
+                """,
+                (account_id, account_id),
+            ).fetchone()
+        return int(row[0])
+
+    def page(
+        self,
+        account_id: int,
+        offset: int,
+        limit: int,
+        before_id: int | None = None,
+    ) -> list[HistoryEntry]:
+        with self.database.connection() as conn:
+            rows = self._fetch(conn, "main", account_id, offset, limit, before_id)
+            if len(rows) == limit or self.archive is None:
+                return rows
+
+            # Archived ids are all below hot ids, so the archives simply
+            # continue the hot ledger in the same order.
+            if before_id is None:
+                hot = conn.execute("SELECT COUNT(*) FROM ledger WHERE account_id = ?", (account_id,)).fetchone()[0]
+                skip = max(offset - hot, 0)
+            for period in reversed(self.archive.periods()):
+                if before_id is not None and period.first_id >= before_id:
+                    continue
+                with self.archive.attached(conn, period) as schema:
+                    if before_id is None and skip:
+                        archived = conn.execute(
+                            f"SELECT COUNT(*) FROM {schema}.ledger WHERE account_id = ?",
+                            (account_id,),
+                        ).fetchone()[0]
+                        if skip >= archived:
+                            skip -= archived
+                            continue
+                    rows += self._fetch(
+                        conn,
+                        schema,
+                        account_id,
+                        skip if before_id is None else 0,
+                        limit - len(rows),
+                        before_id,
+                    )
+                    skip = 0
+                if len(rows) == limit:
+                    break
+        return rows
+
+    @staticmethod
+    def _fetch(
+        conn: sqlite3.Connection,
+        schema: str,
+        account_id: int,
+        offset: int,
+        limit: int,
+        before_id: int | None,
+    ) -> list[HistoryEntry]:
+        # With before_id (the last id of the previous page) the query seeks
+        # straight into idx_ledger_account_id; OFFSET is only used for jumps.
+        if before_id is not None:
+            where = "l.account_id = ? AND l.id < ?"
+            params: tuple = (account_id, before_id, limit)
+        else:
+            where = "l.account_id = ?"
+            params = (account_id, limit, offset)
+
+        rows = conn.execute(
+            f"""
+            SELECT
+                l.id,
+                l.created_at,
+                l.amount,
+                l.message,
+                c.card_number
+            FROM {schema}.ledger l
+            LEFT JOIN main.cards c ON c.account_id = l.counterparty_account_id
+            WHERE {where}
+            ORDER BY l.id DESC
+            LIMIT ?{"" if before_id is not None else " OFFSET ?"}
+            """,
+            params,
+        ).fetchall()
+
+        return [
+            HistoryEntry(
+                id=row["id"],
+                created_at=row["created_at"],
+                counterparty=f"**** {row['card_number'][-4:]}" if row["card_number"] else "—",
+                amount=row["amount"],
+                message=row["message"],
+            )
+            for row in rows
+        ]
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Callable
+
+from .database import BankDatabase
+from .numpy_support import require_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+CHUNK_SIZE = 100_000
+ANNUAL_RATE_BP = 1_600
+OVERDRAFT_RATE_BP = 3_650
+DAYS_IN_YEAR = 365
+MESSAGE = "Начисление процентов"
+
+
+@dataclass(frozen=True)
+class InterestPolicy:
+    """Annual rates in basis points of the end-of-day balance.
+
+    Positive balances earn ``annual_rate_bp``; negative balances are
+    charged ``overdraft_rate_bp``. Balances below ``min_balance`` earn
+    nothing. One day's accrual is ``balance * rate / (10_000 * days_in_year)``
+    kopecks, rounded half to even.
+    """
+
+    annual_rate_bp: int = ANNUAL_RATE_BP
+    overdraft_rate_bp: int = OVERDRAFT_RATE_BP
+    min_balance: int = 0
+    days_in_year: int = DAYS_IN_YEAR
+
+
+@dataclass(frozen=True)
+class AccrualResult:
+    day: str
+    accounts: int
+    credited: int
+    charged: int
+    elapsed: float
+    resumed_from: int
+    already_done: bool = False
+
+    @property
+    def accounts_per_second(self) -> float:
+        return self.accounts / self.elapsed if self.elapsed else 0.0
+
+
+def accrue(balances: np.ndarray, policy: InterestPolicy) -> np.ndarray:
+    """Per-balance accrual in kopecks (int64), computed without floats."""
+    np = require_numpy("Interest accrual")
+    rates = np.where(balances > 0, policy.annual_rate_bp, 0)
+    rates = np.where(balances < 0, policy.overdraft_rate_bp, rates)
+    rates = np.where((balances > 0) & (balances < policy.min_balance), 0, rates)
+    numerator = balances.astype(np.int64) * rates
+    denominator = 10_000 * policy.days_in_year
+    # Round the magnitude so charges and credits round alike.
+    quotient, remainder = np.divmod(np.abs(numerator), denominator)
+    twice = 2 * remainder
+    quotient += (twice > denominator) | ((twice == denominator) & (quotient % 2 == 1))
+    return np.sign(numerator) * quotient
+
+
+class InterestAccrual:
+    """End-of-day interest and overdraft charges for every account.
+
+    Accounts are processed in id order, ``chunk_size`` at a time. Each
+    chunk is one write transaction: its balances are read, the accruals
+    computed with NumPy, the balances and ledger rows written with
+    ``executemany``, and the last processed id saved in ``interest_runs``.
+    An interrupted run resumes after that id; a finished day is never
+    accrued twice.
+
+    Interest is on the balance at the end of ``day``: ledger rows created
+    after ``day 23:59:59`` (a catch-up run the next morning sees them) are
+    subtracted from the loaded balances.
+
+    Ledger ids must follow months for archiving (every archived id is
+    below every hot id), so a day is refused once the ledger has moved
+    past its month: when the month is archived or a later month already
+    has rows. Future days are refused too.
+    """
+
+    def __init__(self, database: BankDatabase, policy: InterestPolicy | None = None) -> None:
+        self.database = database
+        self.policy = policy or InterestPolicy()
+
+    def run(
+        self,
+        day: date | None = None,
+        chunk_size: int = CHUNK_SIZE,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> AccrualResult:
+        np = require_numpy("Interest accrual")
+        today = date.today()
+        day = day or today
+        if day > today:
+            raise ValueError(f"{day} has not come yet.")
+        day_text = day.isoformat()
+        created_at = f"{day_text} 23:59:59"
+        started = time.perf_counter()
+
+        with self.database.connection() as conn:
+            self._check_month(conn, day_text[:7])
+            conn.execute(
+                """
+                INSERT INTO interest_runs (day, last_account_id, started_at)
+                VALUES (?, 0, ?)
+                ON CONFLICT (day) DO NOTHING
+                """,
+                (day_text, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            )
+            # Ids grow with time, so every row created after the day lies
+            # above this id; the hour of slack covers writes whose created_at
+            # was taken before they got the write lock.
+            floor = conn.execute(
+                "SELECT id FROM ledger WHERE created_at <= datetime(?, '-1 hour') ORDER BY id DESC LIMIT 1",
+                (created_at,),
+            ).fetchone()
+            checkpoint = conn.execute(
+                "SELECT last_account_id, finished_at FROM interest_runs WHERE day = ?",
+                (day_text,),
+            ).fetchone()
+            total = conn.execute(
+                "SELECT COUNT(*) FROM accounts WHERE id > ?", (checkpoint["last_account_id"],)
+            ).fetchone()[0]
+        resumed_from = checkpoint["last_account_id"]
+        later_than_id = 0 if floor is None else floor[0]
+        if checkpoint["finished_at"] is not None:
+            return AccrualResult(day_text, 0, 0, 0, 0.0, resumed_from, already_done=True)
+
+        def chunk(conn: sqlite3.Connection, after_id: int) -> tuple[int, int, int, int]:
+            cursor = conn.cursor()
+            cursor.row_factory = None  # plain tuples go straight into NumPy
+            rows = cursor.execute(
+                "SELECT id, balance FROM accounts WHERE id > ? ORDER BY id LIMIT ?",
+                (after_id, chunk_size),
+            ).fetchall()
+            if not rows:
+                conn.execute(
+                    "UPDATE interest_runs SET finished_at = ? WHERE day = ?",
+                    (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), day_text),
+                )
+                return after_id, 0, 0, 0
+            table = np.array(rows, dtype=np.int64)
+            ids, balances = table[:, 0], table[:, 1]
+            later = cursor.execute(
+                """
+                SELECT account_id, SUM(amount)
+                FROM ledger
+                WHERE id > ? AND created_at > ? AND account_id > ? AND account_id <= ?
+                GROUP BY account_id
+                """,
+                (later_than_id, created_at, after_id, int(ids[-1])),
+            ).fetchall()
+            if later:
+                moved = np.array(later, dtype=np.int64)
+                balances[np.searchsorted(ids, moved[:, 0])] -= moved[:, 1]
+            accruals = accrue(balances, self.policy)
+            changed = accruals != 0
+            changed_ids = ids[changed].tolist()
+            changed_amounts = accruals[changed].tolist()
+
+            conn.executemany(
+                "UPDATE accounts SET balance = balance + ? WHERE id = ?",
+                zip(changed_amounts, changed_ids),
+            )
+            conn.executemany(
+                """
+                INSERT INTO ledger (account_id, counterparty_account_id, amount, message, created_at)
+                VALUES (?, NULL, ?, ?, ?)
+                """,
+                (
+                    (account_id, amount, MESSAGE, created_at)
+                    for account_id, amount in zip(changed_ids, changed_amounts)
+                ),
+            )
+            credited = int(accruals[accruals > 0].sum())
+            charged = int(-accruals[accruals < 0].sum())
+            last_id = int(ids[-1])
+            conn.execute(
+                """
+                UPDATE interest_runs
+                SET last_account_id = ?, accounts = accounts + ?,
+                    credited = credited + ?, charged = charged + ?
+                WHERE day = ?
+                """,
+                (last_id, len(rows), credited, charged, day_text),
+            )
+            return last_id, len(rows), credited, charged
+
+        after_id = resumed_from
+        accounts = credited = charged = 0
+        while True:
+            after_id, processed, chunk_credited, chunk_charged = self.database.write(
+                "interest", lambda conn: chunk(conn, after_id)
+            )
+            if not processed:
+                break
+            accounts += processed
+            credited += chunk_credited
+            charged += chunk_charged
+            if progress is not None:
+                progress(accounts, total)
+
+        return AccrualResult(day_text, accounts, credited, charged, time.perf_counter() - started, resumed_from)
+
+    @staticmethod
+    def _check_month(conn: sqlite3.Connection, month: str) -> None:
+        archived = conn.execute("SELECT MAX(period) FROM ledger_archives").fetchone()[0]
+        if archived is not None and month <= archived:
+            raise ValueError(f"{month} is archived; interest can only be accrued for later months.")
+        # The highest id is the newest row: ids grow with time.
+        newest = conn.execute("SELECT created_at FROM ledger ORDER BY id DESC LIMIT 1").fetchone()
+        if newest is not None and newest[0][:7] > month:
+            raise ValueError(f"The ledger already has rows from {newest[0][:7]}; {month} is closed.")
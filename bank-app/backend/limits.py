@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import calendar
+import threading
+from array import array
+from datetime import datetime
+
+from .database import BankDatabase
+
+WINDOW_HOURS = 24
+DAILY_AMOUNT_LIMIT = 300_000_00
+DAILY_TRANSFER_LIMIT = 50
+
+
+def hour_of(moment: datetime) -> int:
+    # Same clock as strftime('%s', created_at) in SQLite: the stored local
+    # time read as if it were UTC.
+    return calendar.timegm(moment.timetuple()) // 3600
+
+
+class _Window:
+    """Outgoing volume and count of one account over the last 24 hours.
+
+    One slot per hour in a ring; moving the window forward clears at most
+    ``WINDOW_HOURS`` slots, so every operation is O(1).
+    """
+
+    __slots__ = ("hour", "volumes", "counts", "volume", "count")
+
+    def __init__(self, hour: int) -> None:
+        self.hour = hour
+        self.volumes = array("q", bytes(8 * WINDOW_HOURS))
+        self.counts = array("q", bytes(8 * WINDOW_HOURS))
+        self.volume = 0
+        self.count = 0
+
+    def advance(self, hour: int) -> None:
+        if hour <= self.hour:
+            return
+        if hour - self.hour >= WINDOW_HOURS:
+            for slot in range(WINDOW_HOURS):
+                self.volumes[slot] = 0
+                self.counts[slot] = 0
+            self.volume = 0
+            self.count = 0
+        else:
+            for expired in range(self.hour + 1, hour + 1):
+                slot = expired % WINDOW_HOURS
+                self.volume -= self.volumes[slot]
+                self.count -= self.counts[slot]
+                self.volumes[slot] = 0
+                self.counts[slot] = 0
+        self.hour = hour
+
+    def add(self, hour: int, volume: int, count: int) -> None:
+        self.advance(hour)
+        if hour <= self.hour - WINDOW_HOURS:
+            return
+        slot = hour % WINDOW_HOURS
+        self.volumes[slot] += volume
+        self.counts[slot] += count
+        self.volume += volume
+        self.count += count
+
+
+class TransferLimits:
+    """Rolling 24-hour limits on outgoing transfers per account.
+
+    The counters live in memory and are loaded at startup from
+    ``limit_buckets``, which a ledger trigger keeps up to date in the same
+    transaction as every transfer. Checks never touch the database.
+    The UI and the payment scheduler share one instance, so every window
+    is read and moved under ``_lock``.
+    """
+
+    def __init__(
+        self,
+        database: BankDatabase,
+        daily_amount: int = DAILY_AMOUNT_LIMIT,
+        daily_transfers: int = DAILY_TRANSFER_LIMIT,
+    ) -> None:
+        self.database = database
+        self.daily_amount = daily_amount
+        self.daily_transfers = daily_transfers
+        self._windows: dict[int, _Window] = {}
+        self._lock = threading.Lock()
+
+    def load(self, now: datetime | None = None) -> int:
+        current = hour_of(now or datetime.now())
+        oldest = current - WINDOW_HOURS + 1
+        with self.database.connection() as conn:
+            conn.execute("DELETE FROM limit_buckets WHERE hour < ?", (oldest,))
+            rows = conn.execute(
+                "SELECT account_id, hour, volume, transfers FROM limit_buckets WHERE hour >= ?",
+                (oldest,),
+            ).fetchall()
+
+        with self._lock:
+            self._windows.clear()
+            for account_id, hour, volume, transfers in rows:
+                window = self._windows.get(account_id)
+                if window is None:
+                    window = self._windows[account_id] = _Window(current)
+                window.add(hour, volume, transfers)
+            return len(self._windows)
+
+    def usage(self, account_id: int, now: datetime | None = None) -> tuple[int, int]:
+        hour = hour_of(now or datetime.now())
+        with self._lock:
+            window = self._windows.get(account_id)
+            if window is None:
+                return 0, 0
+            window.advance(hour)
+            return window.volume, window.count
+
+    def check(self, account_id: int, amount: int, now: datetime | None = None) -> str | None:
+        """Reason the transfer would exceed a limit, or ``None`` if it fits."""
+        volume, count = self.usage(account_id, now)
+        return self._exceeded(volume, count, amount)
+
+    def reserve(self, account_id: int, amount: int, now: datetime | None = None) -> str | None:
+        """Check the limits and count the transfer in one step; ``None`` if it fits.
+
+        Two threads can't both pass for the same account before either is
+        counted. A reservation whose transfer is not written must be undone
+        with ``release``, passing the same ``now``.
+        """
+        hour = hour_of(now or datetime.now())
+        with self._lock:
+            window = self._windows.get(account_id)
+            if window is None:
+                window = self._windows[account_id] = _Window(hour)
+            window.advance(hour)
+            reason = self._exceeded(window.volume, window.count, amount)
+            if reason is None:
+                window.add(hour, amount, 1)
+            return reason
+
+    def release(self, account_id: int, amount: int, now: datetime) -> None:
+        hour = hour_of(now)
+        with self._lock:
+            window = self._windows.get(account_id)
+            if window is not None:
+                window.add(hour, -amount, -1)
+
+    def _exceeded(self, volume: int, count: int, amount: int) -> str | None:
+        if count + 1 > self.daily_transfers:
+            return f"Превышен лимит: не более {self.daily_transfers} переводов за сутки."
+        if volume + amount > self.daily_amount:
+            left = max(self.daily_amount - volume, 0)
+            return f"Превышен суточный лимит переводов. Доступно: {left / 100:,.2f} ₽.".replace(",", " ")
+        return None
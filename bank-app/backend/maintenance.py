@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from .database import BankDatabase, is_lock_error
+
+TICK_SECONDS = 30.0
+QUIET_WINDOW_SECONDS = 60.0
+MAX_CONNECTIONS_PER_WINDOW = 120
+VACUUM_STEP_PAGES = 256
+# Rough VACUUM throughput, used to decide whether a full rebuild fits a budget.
+VACUUM_BYTES_PER_SECOND = 40 * 2**20
+
+INCREMENTAL = 2
+
+
+@dataclass(frozen=True)
+class MaintenanceTask:
+    """``action(conn, deadline, should_stop)`` returns a one-line summary.
+
+    ``deadline`` is a ``time.monotonic()`` value; long actions work in steps
+    and stop when it passes or ``should_stop()`` reports traffic.
+    """
+
+    name: str
+    interval: float
+    budget: float
+    action: Callable[[sqlite3.Connection, float, Callable[[], bool]], str]
+
+
+@dataclass(frozen=True)
+class TaskRun:
+    task: str
+    ran: bool
+    result: str
+    elapsed: float = 0.0
+
+
+def analyze(conn: sqlite3.Connection, _deadline: float, _should_stop: Callable[[], bool]) -> str:
+    # analysis_limit samples each index instead of reading it whole, which
+    # keeps ANALYZE short on big tables.
+    conn.execute("PRAGMA analysis_limit = 1000")
+    conn.execute("ANALYZE")
+    return "statistics refreshed"
+
+
+def optimize(conn: sqlite3.Connection, _deadline: float, _should_stop: Callable[[], bool]) -> str:
+    conn.execute("PRAGMA optimize")
+    return "optimize done"
+
+
+def checkpoint(conn: sqlite3.Connection, _deadline: float, _should_stop: Callable[[], bool]) -> str:
+    mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    if mode != "wal":
+        return f"skipped: journal_mode is {mode}"
+    busy, log_frames, checkpointed = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+    return f"{checkpointed}/{log_frames} frames checkpointed" + (" (readers active)" if busy else "")
+
+
+def incremental_vacuum(
+    conn: sqlite3.Connection, deadline: float, should_stop: Callable[[], bool]
+) -> str:
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != INCREMENTAL:
+        return "skipped: auto_vacuum is not INCREMENTAL yet"
+    freed = 0
+    while time.monotonic() < deadline and not should_stop():
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if free == 0:
+            break
+        step = min(free, VACUUM_STEP_PAGES)
+        # execute() steps the pragma once, which frees a single page;
+        # executescript() runs it to completion.
+        conn.executescript(f"PRAGMA incremental_vacuum({step});")
+        freed += step
+    left = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return f"{freed} pages returned, {left} free pages left"
+
+
+def enable_incremental_vacuum(
+    conn: sqlite3.Connection, deadline: float, should_stop: Callable[[], bool]
+) -> str:
+    # Databases created before auto_vacuum was set need one full VACUUM to
+    # switch modes. It is done only when it fits the budget in a quiet
+    # period; after that, incremental_vacuum frees space a few pages at a time.
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == INCREMENTAL:
+        return "already INCREMENTAL"
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    expected = page_count * page_size / VACUUM_BYTES_PER_SECOND
+    if time.monotonic() + expected > deadline:
+        return f"skipped: VACUUM of {page_count * page_size / 2**20:.0f} MiB would exceed the budget"
+    if should_stop():
+        return "skipped: traffic"
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    return "switched to INCREMENTAL"
+
+
+DEFAULT_TASKS = (
+    MaintenanceTask("checkpoint", interval=5 * 60, budget=0.5, action=checkpoint),
+    MaintenanceTask("incremental_vacuum", interval=15 * 60, budget=1.0, action=incremental_vacuum),
+    MaintenanceTask("optimize", interval=60 * 60, budget=0.5, action=optimize),
+    MaintenanceTask("analyze", interval=6 * 60 * 60, budget=5.0, action=analyze),
+    MaintenanceTask(
+        "enable_incremental_vacuum",
+        interval=24 * 60 * 60,
+        budget=10.0,
+        action=enable_incremental_vacuum,
+    ),
+)
+
+
+class MaintenanceScheduler:
+    """Runs ``DEFAULT_TASKS`` when they are due and the database is quiet.
+
+    "Quiet" means no lock errors and fewer than ``max_connections``
+    connections in this process over the last ``quiet_window`` seconds, and
+    no other connection holding a write lock right now. A task that finds
+    the database busy is retried on the next tick. Last runs are stored in
+    ``maintenance_runs`` so intervals survive restarts.
+    """
+
+    def __init__(
+        self,
+        database: BankDatabase,
+        tasks: tuple[MaintenanceTask, ...] = DEFAULT_TASKS,
+        tick: float = TICK_SECONDS,
+        quiet_window: float = QUIET_WINDOW_SECONDS,
+        max_connections: int = MAX_CONNECTIONS_PER_WINDOW,
+    ) -> None:
+        self.database = database
+        self.tasks = tasks
+        self.tick = tick
+        self.quiet_window = quiet_window
+        self.max_connections = max_connections
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="db-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def busy_reason(self) -> str | None:
+        connections, lock_errors = self.database.activity.recent(self.quiet_window)
+        if lock_errors:
+            return f"{lock_errors} lock error(s) in the last {self.quiet_window:.0f} s"
+        if connections >= self.max_connections:
+            return f"{connections} connections in the last {self.quiet_window:.0f} s"
+        return self._probe_write_lock()
+
+    def run_due(self, force: bool = False, only: set[str] | None = None) -> list[TaskRun]:
+        last_runs = self._last_runs()
+        now = time.time()
+        runs = []
+        for task in self.tasks:
+            if only is not None and task.name not in only:
+                continue
+            if not force and now - last_runs.get(task.name, 0) < task.interval:
+                continue
+            if self._stop.is_set():
+                break
+            reason = None if force else self.busy_reason()
+            if reason is not None:
+                runs.append(TaskRun(task.name, False, f"postponed: {reason}"))
+                continue
+            runs.append(self._run(task, force))
+        return runs
+
+    def _run(self, task: MaintenanceTask, force: bool) -> TaskRun:
+        started = time.monotonic()
+        deadline = started + task.budget
+
+        def should_stop() -> bool:
+            return self._stop.is_set() or (not force and self.busy_reason() is not None)
+
+        try:
+            with self.database.connection(track=False) as conn:
+                result = task.action(conn, float("inf") if force else deadline, should_stop)
+        except sqlite3.OperationalError as exc:
+            if not is_lock_error(exc):
+                raise
+            return TaskRun(task.name, False, f"postponed: {exc}")
+
+        elapsed = time.monotonic() - started
+        with self.database.connection(track=False) as conn:
+            conn.execute(
+                """
+                INSERT INTO maintenance_runs (task, last_run, elapsed, result, ran_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (task) DO UPDATE SET
+                    last_run = excluded.last_run,
+                    elapsed = excluded.elapsed,
+                    result = excluded.result,
+                    ran_at = excluded.ran_at
+                """,
+                (task.name, int(time.time()), elapsed, result, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            )
+        return TaskRun(task.name, True, result, elapsed)
+
+    def _last_runs(self) -> dict[str, int]:
+        with self.database.connection(track=False) as conn:
+            rows = conn.execute("SELECT task, last_run FROM maintenance_runs").fetchall()
+        return {row["task"]: row["last_run"] for row in rows}
+
+    def _probe_write_lock(self) -> str | None:
+        # Another process may be writing; a zero-timeout IMMEDIATE transaction
+        # fails at once instead of waiting for it.
+        conn = sqlite3.connect(self.database.db_path, timeout=0, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("ROLLBACK")
+        except sqlite3.OperationalError as exc:
+            if is_lock_error(exc):
+                return "another connection holds the write lock"
+            raise
+        finally:
+            conn.close()
+        return None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.tick):
+            try:
+                self.run_due()
+            except sqlite3.Error:
+                # Maintenance must never take the app down; the next tick retries.
+                continue
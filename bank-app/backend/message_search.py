@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass
+
+from .database import BankDatabase, fts5_available, reindex_messages
+
+PAGE_SIZE = 20
+RANK_WINDOW = 5_000
+_TERM = re.compile(r"\w+\*?")
+_WORD = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class MessageHit:
+    ledger_id: int
+    account_id: int
+    counterparty_account_id: int | None
+    amount: int
+    created_at: str
+    message: str
+    highlighted: str
+    rank: float
+
+
+@dataclass(frozen=True)
+class MessagePage:
+    hits: list[MessageHit]
+    offset: int
+    total: int
+
+    @property
+    def has_more(self) -> bool:
+        return self.offset + len(self.hits) < self.total
+
+
+def match_query(text: str, prefix: bool = False) -> str | None:
+    """Turn free text into an FTS5 MATCH expression of ANDed terms.
+
+    Every word is quoted, so FTS5 operators typed by the user are searched
+    as plain words. ``word*`` is a prefix term; with ``prefix`` the last
+    word is one too, which suits search-as-you-type.
+    """
+    terms = _TERM.findall(text)
+    if not terms:
+        return None
+    if prefix and not terms[-1].endswith("*"):
+        terms[-1] += "*"
+    return " ".join(f'"{term.rstrip("*")}"' + ("*" if term.endswith("*") else "") for term in terms)
+
+
+def highlight(message: str, text: str, prefix: bool = False) -> str:
+    """Wrap the words of ``message`` that ``match_query(text, prefix)`` matched in brackets.
+
+    Messages are short, so this is done here rather than with FTS5's
+    snippet(), which would run the MATCH a second time.
+    """
+    terms = _TERM.findall(text)
+    if prefix and terms and not terms[-1].endswith("*"):
+        terms[-1] += "*"
+    exact = {_fold(term) for term in terms if not term.endswith("*")}
+    prefixes = tuple(_fold(term[:-1]) for term in terms if term.endswith("*"))
+
+    def mark(match: re.Match[str]) -> str:
+        word = _fold(match.group())
+        return f"[{match.group()}]" if word in exact or word.startswith(prefixes) else match.group()
+
+    return _WORD.sub(mark, message)
+
+
+def _fold(word: str) -> str:
+    # What tokenize='unicode61 remove_diacritics 2' does: casefold, strip accents (ё → е).
+    decomposed = unicodedata.normalize("NFD", word.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class MessageSearchService:
+    """Ranked full-text search over transfer messages (``ledger_messages``, FTS5).
+
+    Each transfer is indexed once, by its credit row, so a hit's
+    ``account_id`` is the recipient and ``counterparty_account_id`` the
+    payer. System rows such as interest carry the same text on every
+    account and are not searchable.
+
+    bm25 has to score every match before it can sort, which grows with the
+    corpus: a common word matches hundreds of thousands of messages. Only
+    the newest ``rank_window`` matches are ranked, best first; pages past
+    them continue newest first. Either way a page costs about the same at
+    1M and at 10M messages. Messages of archived months leave the index
+    together with their ledger rows.
+    """
+
+    def __init__(self, database: BankDatabase, rank_window: int = RANK_WINDOW) -> None:
+        self.database = database
+        self.rank_window = rank_window
+
+    def available(self) -> bool:
+        with self.database.connection() as conn:
+            return fts5_available(conn)
+
+    def search(
+        self,
+        text: str,
+        offset: int = 0,
+        limit: int = PAGE_SIZE,
+        prefix: bool = False,
+        account_id: int | None = None,
+    ) -> MessagePage:
+        query = match_query(text, prefix)
+        if query is None:
+            return MessagePage([], offset, 0)
+
+        # The ledger join is only needed to filter by account, which may be
+        # either side of the indexed credit row.
+        if account_id is None:
+            source = "FROM ledger_messages m WHERE ledger_messages MATCH ?"
+            params: tuple = (query,)
+        else:
+            source = (
+                "FROM ledger_messages m JOIN ledger l ON l.id = m.rowid "
+                "WHERE ledger_messages MATCH ? AND (l.account_id = ? OR l.counterparty_account_id = ?)"
+            )
+            params = (query, account_id, account_id)
+
+        with self.database.connection() as conn:
+            total = conn.execute(f"SELECT COUNT(*) {source}", params).fetchone()[0]
+            ranked: list = []
+            if offset < self.rank_window:
+                ranked = conn.execute(
+                    f"""
+                    SELECT id, rank FROM (
+                        SELECT m.rowid AS id, m.rank AS rank {source}
+                        ORDER BY m.rowid DESC
+                        LIMIT ?
+                    )
+                    ORDER BY rank, id DESC
+                    LIMIT ? OFFSET ?
+                    """,
+                    (*params, self.rank_window, limit, offset),
+                ).fetchall()
+            if len(ranked) < limit and offset + len(ranked) >= self.rank_window:
+                ranked += conn.execute(
+                    f"SELECT m.rowid, m.rank {source} ORDER BY m.rowid DESC LIMIT ? OFFSET ?",
+                    (*params, limit - len(ranked), max(offset, self.rank_window)),
+                ).fetchall()
+            if not ranked:
+                return MessagePage([], offset, total)
+
+            ids = [row[0] for row in ranked]
+            rows = conn.execute(
+                f"""
+                SELECT id, account_id, counterparty_account_id, amount, created_at, message
+                FROM ledger
+                WHERE id IN ({", ".join("?" * len(ids))})
+                """,
+                ids,
+            ).fetchall()
+
+        by_id = {row["id"]: row for row in rows}
+        hits = []
+        for ledger_id, rank in ranked:
+            row = by_id[ledger_id]
+            hits.append(
+                MessageHit(
+                    ledger_id=ledger_id,
+                    account_id=row["account_id"],
+                    counterparty_account_id=row["counterparty_account_id"],
+                    amount=row["amount"],
+                    created_at=row["created_at"],
+                    message=row["message"],
+                    highlighted=highlight(row["message"], text, prefix),
+                    rank=rank,
+                )
+            )
+        return MessagePage(hits, offset, total)
+
+    def rebuild(self) -> None:
+        """Re-index every transfer message, e.g. after a bulk load with triggers dropped."""
+        with self.database.connection() as conn:
+            reindex_messages(conn)
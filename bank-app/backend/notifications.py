@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Protocol
+
+INFO = "info"
+WARNING = "warning"
+ERROR = "error"
+
+KEEP_LAST = 1000
+
+
+@dataclass(frozen=True)
+class Notification:
+    level: str
+    title: str
+    message: str
+    created_at: float = field(default_factory=time.monotonic, compare=False)
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        return self.level, self.title, self.message
+
+
+class NotificationSink(Protocol):
+    def emit(self, notification: Notification) -> None: ...
+
+
+class CollectingSink:
+    """Headless sink for tests and benchmarks; keeps the last ``keep_last`` events."""
+
+    def __init__(self, keep_last: int | None = KEEP_LAST) -> None:
+        self.events: deque[Notification] = deque(maxlen=keep_last)
+        self._lock = threading.Lock()
+
+    def emit(self, notification: Notification) -> None:
+        with self._lock:
+            self.events.append(notification)
+
+    def of_level(self, level: str) -> list[Notification]:
+        with self._lock:
+            return [event for event in self.events if event.level == level]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.events.clear()
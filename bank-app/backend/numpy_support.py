@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import importlib.util
+from typing import Any
+
+# NumPy is optional: the app itself never needs it, only snapshots,
+# analytics and interest accrual do.
+
+
+def numpy_available() -> bool:
+    return importlib.util.find_spec("numpy") is not None
+
+
+def require_numpy(feature: str) -> Any:
+    """The numpy module, or RuntimeError naming ``feature`` when it is not installed."""
+    try:
+        import numpy
+    except ImportError as exc:
+        raise RuntimeError(f"{feature} requires NumPy (pip install numpy).") from exc
+    return numpy
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import csv
+import sqlite3
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+from .cards import is_luhn_valid
+from .database import BankDatabase, is_lock_error
+
+CHUNK_SIZE = 5000
+MAX_MESSAGE_LENGTH = 140
+MAX_AMOUNT = 100_000_000_00
+
+
+@dataclass(frozen=True)
+class PayrollRow:
+    line: int
+    card_number: str
+    amount: int
+    message: str
+
+
+@dataclass(frozen=True)
+class RowError:
+    line: int
+    card_number: str
+    reason: str
+
+
+@dataclass
+class PayrollResult:
+    ok: bool
+    message: str
+    applied: int = 0
+    total: int = 0
+    errors: list[RowError] = field(default_factory=list)
+    elapsed: float = 0.0
+
+
+class PayrollService:
+    """Batch transfers: one debit from the payer, one credit per row.
+
+    The whole batch is validated first; if any row is invalid nothing is
+    applied and every bad row is reported. Valid batches are written in a
+    single ``BankDatabase.write`` transaction, retried while the database
+    is locked, ``CHUNK_SIZE`` rows per executemany.
+    """
+
+    def __init__(self, database: BankDatabase) -> None:
+        self.database = database
+
+    def run_file(self, payer_account_id: int, path: Path) -> PayrollResult:
+        return self.run(payer_account_id, read_payroll_csv(path))
+
+    def run(self, payer_account_id: int, rows: Iterable[Sequence[str]]) -> PayrollResult:
+        started = time.perf_counter()
+        parsed, errors = parse_rows(rows)
+        if not parsed and not errors:
+            return PayrollResult(False, "Ведомость пуста.")
+
+        with self.database.connection() as conn:
+            accounts = self._resolve_cards(conn, {row.card_number for row in parsed})
+        for row in parsed:
+            account_id = accounts.get(row.card_number)
+            if account_id is None:
+                errors.append(RowError(row.line, row.card_number, "Карта не найдена."))
+            elif account_id == payer_account_id:
+                errors.append(RowError(row.line, row.card_number, "Перевод самому себе."))
+
+        if errors:
+            errors.sort(key=lambda error: error.line)
+            return PayrollResult(
+                False,
+                f"Ведомость отклонена: ошибок в строках — {len(errors)}.",
+                errors=errors,
+                elapsed=time.perf_counter() - started,
+            )
+
+        total = sum(row.amount for row in parsed)
+
+        def pay(conn: sqlite3.Connection) -> PayrollResult | None:
+            # The payer balance is read under the write lock.
+            balance = conn.execute(
+                "SELECT balance FROM accounts WHERE id = ?",
+                (payer_account_id,),
+            ).fetchone()
+            if balance is None:
+                return PayrollResult(False, "Счёт плательщика не найден.")
+            if balance["balance"] < total:
+                return PayrollResult(False, "Недостаточно средств для выплаты.", total=total)
+            self._apply(conn, payer_account_id, parsed, accounts, total)
+            return None
+
+        try:
+            rejected = self.database.write("payroll", pay)
+        except sqlite3.OperationalError as exc:
+            if not is_lock_error(exc):
+                raise
+            return PayrollResult(False, "База данных занята, повторите попытку позже.", total=total)
+        if rejected is not None:
+            return rejected
+
+        return PayrollResult(
+            True,
+            f"Выплачено получателям: {len(parsed)}.",
+            applied=len(parsed),
+            total=total,
+            elapsed=time.perf_counter() - started,
+        )
+
+    @staticmethod
+    def _resolve_cards(conn: sqlite3.Connection, card_numbers: set[str]) -> dict[str, int]:
+        # One join against a temp table instead of one lookup per row.
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS payroll_cards (card_number TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM payroll_cards")
+        conn.executemany(
+            "INSERT INTO payroll_cards (card_number) VALUES (?)",
+            ((number,) for number in card_numbers),
+        )
+        rows = conn.execute(
+            """
+            SELECT p.card_number, c.account_id
+            FROM payroll_cards p
+            JOIN cards c ON c.card_number = p.card_number
+            """
+        ).fetchall()
+        conn.execute("DELETE FROM payroll_cards")
+        return {row["card_number"]: row["account_id"] for row in rows}
+
+    @staticmethod
+    def _apply(
+        conn: sqlite3.Connection,
+        payer_account_id: int,
+        rows: list[PayrollRow],
+        accounts: dict[str, int],
+        total: int,
+    ) -> None:
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        conn.execute(
+            "UPDATE accounts SET balance = balance - ? WHERE id = ?",
+            (total, payer_account_id),
+        )
+        conn.execute(
+            """
+            INSERT INTO ledger (account_id, counterparty_account_id, amount, message, created_at)
+            VALUES (?, NULL, ?, ?, ?)
+            """,
+            (payer_account_id, -total, f"Зарплатная ведомость: {len(rows)} получателей", created_at),
+        )
+
+        credits = Counter()
+        for start in range(0, len(rows), CHUNK_SIZE):
+            chunk = rows[start : start + CHUNK_SIZE]
+            conn.executemany(
+                """
+                INSERT INTO ledger (account_id, counterparty_account_id, amount, message, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [
+                    (accounts[row.card_number], payer_account_id, row.amount, row.message, created_at)
+                    for row in chunk
+                ],
+            )
+            for row in chunk:
+                credits[accounts[row.card_number]] += row.amount
+
+        items = [(amount, account_id) for account_id, amount in credits.items()]
+        for start in range(0, len(items), CHUNK_SIZE):
+            conn.executemany(
+                "UPDATE accounts SET balance = balance + ? WHERE id = ?",
+                items[start : start + CHUNK_SIZE],
+            )
+
+
+def read_payroll_csv(path: Path) -> Iterator[list[str]]:
+    """Rows of ``card_number;amount;message`` (comma also accepted)."""
+    with path.open(encoding="utf-8-sig", newline="") as handle:
+        sample = handle.read(4096)
+        handle.seek(0)
+        delimiter = ";" if sample.count(";") >= sample.count(",") else ","
+        yield from csv.reader(handle, delimiter=delimiter)
+
+
+def parse_rows(rows: Iterable[Sequence[str]]) -> tuple[list[PayrollRow], list[RowError]]:
+    parsed: list[PayrollRow] = []
+    errors: list[RowError] = []
+    for line, raw in enumerate(rows, start=1):
+        if not raw or not any(cell.strip() for cell in raw):
+            continue
+        card_number = raw[0].replace(" ", "").strip()
+        if line == 1 and not card_number.isdigit() and not _looks_like_amount(raw):
+            continue  # header row
+
+        if len(raw) < 2:
+            errors.append(RowError(line, card_number, "Не указана сумма."))
+            continue
+        message = raw[2].strip() if len(raw) > 2 else ""
+
+        if len(card_number) != 16 or not card_number.isdigit():
+            errors.append(RowError(line, card_number, "Номер карты должен содержать 16 цифр."))
+            continue
+        if not is_luhn_valid(card_number):
+            errors.append(RowError(line, card_number, "Неверная контрольная цифра номера карты."))
+            continue
+
+        amount = parse_amount(raw[1])
+        if amount is None:
+            errors.append(RowError(line, card_number, "Неверная сумма."))
+            continue
+        if len(message) > MAX_MESSAGE_LENGTH:
+            errors.append(RowError(line, card_number, "Слишком длинное сообщение."))
+            continue
+
+        parsed.append(PayrollRow(line, card_number, amount, message))
+    return parsed, errors
+
+
+def parse_amount(text: str) -> int | None:
+    """Rubles as text (``1234.56`` or ``1 234,56``) to kopecks."""
+    try:
+        value = Decimal(text.replace(" ", "").replace(" ", "").replace(",", "."))
+    except InvalidOperation:
+        return None
+    if not value.is_finite() or value <= 0 or value.as_tuple().exponent < -2:
+        return None
+    kopecks = int(value * 100)
+    if kopecks > MAX_AMOUNT:
+        return None
+    return kopecks
+
+
+def _looks_like_amount(raw: Sequence[str]) -> bool:
+    return len(raw) > 1 and parse_amount(raw[1]) is not None
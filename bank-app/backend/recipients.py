@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .database import BankDatabase
+
+MAX_RESULTS = 8
+
+
+@dataclass(frozen=True)
+class Recipient:
+    card_number: str
+    login: str
+    first_name: str
+    last_name: str
+
+    @property
+    def display(self) -> str:
+        return f"**** {self.card_number[-4:]} — {self.first_name} {self.last_name[:1]}. ({self.login})"
+
+
+class RecipientService:
+    """Prefix lookup of transfer recipients by card number or login.
+
+    Both columns carry UNIQUE indexes, so a prefix becomes a bounded range
+    scan (``col >= prefix AND col < upper``) that stops after ``limit`` rows.
+    """
+
+    def __init__(self, database: BankDatabase) -> None:
+        self.database = database
+
+    def search(self, query: str, limit: int = MAX_RESULTS) -> list[Recipient]:
+        prefix = query.replace(" ", "")
+        if len(prefix) < 2:
+            return []
+
+        column = "c.card_number" if prefix.isdigit() else "u.login"
+        with self.database.connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT c.card_number, u.login, u.first_name, u.last_name
+                FROM users u
+                JOIN accounts a ON a.user_id = u.id
+                JOIN cards c ON c.account_id = a.id
+                WHERE {column} >= ? AND {column} < ?
+                ORDER BY {column}
+                LIMIT ?
+                """,
+                (prefix, _prefix_upper_bound(prefix), limit),
+            ).fetchall()
+
+        return [
+            Recipient(
+                card_number=row["card_number"],
+                login=row["login"],
+                first_name=row["first_name"],
+                last_name=row["last_name"],
+            )
+            for row in rows
+        ]
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    # Smallest string greater than every string starting with prefix.
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
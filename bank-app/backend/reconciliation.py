@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .database import BankDatabase
+
+RANGE_SIZE = 20_000
+
+
+@dataclass(frozen=True)
+class Mismatch:
+    account_id: int
+    balance: int
+    ledger_total: int
+    ledger_id: int
+
+    @property
+    def difference(self) -> int:
+        return self.balance - self.ledger_total
+
+
+@dataclass
+class ReconciliationResult:
+    run_id: int
+    accounts: int
+    workers: int
+    elapsed: float
+    mismatches: list[Mismatch] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+
+class ReconciliationService:
+    """Checks that every stored balance equals the sum of its ledger rows.
+
+    The account id space is cut into ranges that are checked by a pool of
+    processes, each with its own read-only connection. A range is checked
+    inside one read transaction, so balance and ledger are seen at the same
+    point; since a transfer changes both in one transaction, that is all
+    the per-account invariant needs. Ranges are kept small so no snapshot
+    holds the database lock for long.
+
+    Archived months count through ``archived_totals``, which is updated in
+    the same transaction that removes their rows from the hot ledger.
+    """
+
+    def __init__(self, database: BankDatabase) -> None:
+        self.database = database
+
+    def run(
+        self,
+        workers: int | None = None,
+        range_size: int = RANGE_SIZE,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> ReconciliationResult:
+        workers = workers or os.cpu_count() or 1
+        started = time.perf_counter()
+        started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.database.connection() as conn:
+            low, high, total = conn.execute(
+                "SELECT COALESCE(MIN(id), 1), COALESCE(MAX(id), 0), COUNT(*) FROM accounts"
+            ).fetchone()
+        ranges = [(start, min(start + range_size - 1, high)) for start in range(low, high + 1, range_size)]
+
+        mismatches: list[Mismatch] = []
+        checked = 0
+        for count, found in self._check_ranges(ranges, workers):
+            checked += count
+            mismatches.extend(found)
+            if progress is not None:
+                progress(checked, total)
+
+        mismatches.sort(key=lambda mismatch: mismatch.account_id)
+        with self.database.connection() as conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO reconciliation_runs (started_at, finished_at, accounts, mismatches, workers)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (started_at, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), checked, len(mismatches), workers),
+            )
+            run_id = cursor.lastrowid
+            conn.executemany(
+                """
+                INSERT INTO reconciliation_mismatches (run_id, account_id, balance, ledger_total, ledger_id)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    (run_id, m.account_id, m.balance, m.ledger_total, m.ledger_id)
+                    for m in mismatches
+                ),
+            )
+
+        return ReconciliationResult(
+            run_id=run_id,
+            accounts=checked,
+            workers=workers,
+            elapsed=time.perf_counter() - started,
+            mismatches=mismatches,
+        )
+
+    def _check_ranges(
+        self, ranges: list[tuple[int, int]], workers: int
+    ) -> Iterator[tuple[int, list[Mismatch]]]:
+        path = str(self.database.db_path)
+        if workers == 1 or len(ranges) <= 1:
+            for low, high in ranges:
+                yield check_range(path, low, high)
+            return
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+            futures = [pool.submit(check_range, path, low, high) for low, high in ranges]
+            for future in as_completed(futures):
+                yield future.result()
+
+
+def check_range(db_path: str, low: int, high: int) -> tuple[int, list[Mismatch]]:
+    """Accounts checked and mismatches found in ``low..high``; runs in a worker process."""
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, isolation_level=None)
+    try:
+        conn.execute("BEGIN")
+        ledger_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM ledger").fetchone()[0]
+        count = conn.execute(
+            "SELECT COUNT(*) FROM accounts WHERE id BETWEEN ? AND ?",
+            (low, high),
+        ).fetchone()[0]
+        rows = conn.execute(
+            """
+            SELECT a.id, a.balance, COALESCE(l.total, 0) + COALESCE(t.amount, 0)
+            FROM accounts a
+            LEFT JOIN (
+                SELECT account_id, SUM(amount) AS total
+                FROM ledger
+                WHERE account_id BETWEEN ? AND ?
+                GROUP BY account_id
+            ) l ON l.account_id = a.id
+            LEFT JOIN archived_totals t ON t.account_id = a.id
+            WHERE a.id BETWEEN ? AND ? AND a.balance != COALESCE(l.total, 0) + COALESCE(t.amount, 0)
+            """,
+            (low, high, low, high),
+        ).fetchall()
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    return count, [Mismatch(account_id, balance, total, ledger_id) for account_id, balance, total in rows]
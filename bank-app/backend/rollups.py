@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable, ContextManager
+
+from .archive import LedgerArchive
+from .database import BankDatabase
+
+BACKFILL_CHUNK = 50_000
+
+
+@dataclass(frozen=True)
+class DailyStats:
+    day: str
+    new_users: int
+    transfers: int
+    volume: int
+
+
+@dataclass(frozen=True)
+class AccountDay:
+    day: str
+    credits: int
+    credit_volume: int
+    debits: int
+    debit_volume: int
+
+
+class RollupService:
+    """Reads and rebuilds the per-day rollup tables.
+
+    ``daily_stats`` and ``daily_account_stats`` are kept current by the
+    insert triggers on ``users`` and ``ledger``; this class only queries them
+    and rebuilds them from scratch when needed. Transfers in ``daily_stats``
+    are credits with a counterparty; system rows such as interest only
+    show up in the per-account totals.
+    """
+
+    def __init__(self, database: BankDatabase, archive: LedgerArchive | None = None) -> None:
+        self.database = database
+        self.archive = archive
+
+    def daily(self, first_day: str, last_day: str) -> list[DailyStats]:
+        with self.database.connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT day, new_users, transfers, volume
+                FROM daily_stats
+                WHERE day BETWEEN ? AND ?
+                ORDER BY day
+                """,
+                (first_day, last_day),
+            ).fetchall()
+        return [DailyStats(*row) for row in rows]
+
+    def account_days(self, account_id: int, first_day: str, last_day: str) -> list[AccountDay]:
+        with self.database.connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT day, credits, credit_volume, debits, debit_volume
+                FROM daily_account_stats
+                WHERE account_id = ? AND day BETWEEN ? AND ?
+                ORDER BY day
+                """,
+                (account_id, first_day, last_day),
+            ).fetchall()
+        return [AccountDay(*row) for row in rows]
+
+    def backfill(
+        self,
+        chunk_size: int = BACKFILL_CHUNK,
+        progress: Callable[[str, int, int], None] | None = None,
+    ) -> None:
+        """Rebuild both rollup tables from ``users`` and ``ledger``.
+
+        The tables are cleared and the current max ids are captured in one
+        transaction. Rows above those ids are counted by the triggers, rows
+        up to them are re-aggregated here in id-range chunks, each in its own
+        short transaction, so the app can keep writing during a rebuild.
+        """
+        with self.database.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM daily_stats")
+            conn.execute("DELETE FROM daily_account_stats")
+            max_user = conn.execute("SELECT COALESCE(MAX(id), 0) FROM users").fetchone()[0]
+            max_entry = conn.execute("SELECT COALESCE(MAX(id), 0) FROM ledger").fetchone()[0]
+
+        for low in range(0, max_user, chunk_size):
+            high = min(low + chunk_size, max_user)
+            with self.database.connection() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO daily_stats (day, new_users)
+                    SELECT substr(registered_at, 1, 10), COUNT(*)
+                    FROM users
+                    WHERE id > ? AND id <= ?
+                    GROUP BY 1
+                    ON CONFLICT (day) DO UPDATE SET new_users = new_users + excluded.new_users
+                    """,
+                    (low, high),
+                )
+            if progress is not None:
+                progress("users", high, max_user)
+
+        # Archived months are read through the ledger_all view.
+        source = "ledger" if self.archive is None else "ledger_all"
+        for low in range(0, max_entry, chunk_size):
+            high = min(low + chunk_size, max_entry)
+            with self._ledger_connection(low + 1) as conn:
+                conn.execute(
+                    f"""
+                    INSERT INTO daily_stats (day, transfers, volume)
+                    SELECT substr(created_at, 1, 10), COUNT(*), SUM(amount)
+                    FROM {source}
+                    WHERE id > ? AND id <= ? AND amount > 0 AND counterparty_account_id IS NOT NULL
+                    GROUP BY 1
+                    ON CONFLICT (day) DO UPDATE SET
+                        transfers = transfers + excluded.transfers,
+                        volume = volume + excluded.volume
+                    """,
+                    (low, high),
+                )
+                conn.execute(
+                    f"""
+                    INSERT INTO daily_account_stats (
+                        account_id, day, credits, credit_volume, debits, debit_volume
+                    )
+                    SELECT
+                        account_id,
+                        substr(created_at, 1, 10),
+                        SUM(amount > 0),
+                        SUM(MAX(amount, 0)),
+                        SUM(amount < 0),
+                        SUM(MAX(-amount, 0))
+                    FROM {source}
+                    WHERE id > ? AND id <= ?
+                    GROUP BY 1, 2
+                    ON CONFLICT (account_id, day) DO UPDATE SET
+                        credits = credits + excluded.credits,
+                        credit_volume = credit_volume + excluded.credit_volume,
+                        debits = debits + excluded.debits,
+                        debit_volume = debit_volume + excluded.debit_volume
+                    """,
+                    (low, high),
+                )
+            if progress is not None:
+                progress("ledger", high, max_entry)
+
+    def _ledger_connection(self, first_id: int) -> ContextManager[sqlite3.Connection]:
+        if self.archive is None:
+            return self.database.connection()
+        return self.archive.connection(first_id)
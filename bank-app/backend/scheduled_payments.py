@@ -0,0 +1,355 @@
+from __future__ import annotations
+
+import calendar
+import heapq
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from .database import BankDatabase, is_lock_error
+from .transfers import TransferResult, TransferService
+
+ONCE = "once"
+DAILY = "daily"
+WEEKLY = "weekly"
+MONTHLY = "monthly"
+INTERVALS = (ONCE, DAILY, WEEKLY, MONTHLY)
+_STEPS = {DAILY: timedelta(days=1), WEEKLY: timedelta(weeks=1)}
+
+HORIZON_SECONDS = 3600.0
+MAX_LOADED = 10_000
+BATCH_SIZE = 200
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def occurrence(anchor: datetime, interval: str, index: int) -> datetime:
+    """The ``index``-th run of a schedule; monthly runs keep the anchor's day, clamped to the month."""
+    if interval == MONTHLY:
+        month = anchor.month - 1 + index
+        year = anchor.year + month // 12
+        month = month % 12 + 1
+        return anchor.replace(year=year, month=month, day=min(anchor.day, calendar.monthrange(year, month)[1]))
+    if interval == ONCE:
+        return anchor
+    return anchor + _STEPS[interval] * index
+
+
+def next_index(anchor: datetime, interval: str, index: int, now: datetime) -> int | None:
+    """Index of the first run after ``now`` following run ``index``; ``None`` when there is none.
+
+    Runs missed while the app was down are skipped rather than replayed:
+    after downtime a standing order pays once, not once per missed period.
+    """
+    if interval == ONCE:
+        return None
+    index += 1
+    if interval in _STEPS:
+        behind = (now - occurrence(anchor, interval, index)) // _STEPS[interval]
+        index += max(behind, 0)
+    while occurrence(anchor, interval, index) <= now:
+        index += 1
+    return index
+
+
+@dataclass(frozen=True)
+class Schedule:
+    id: int
+    payer_account_id: int
+    card_number: str
+    amount: int
+    message: str
+    interval: str
+    next_run: str | None
+    active: bool
+    last_run: str | None
+    last_result: str | None
+
+
+@dataclass(frozen=True)
+class ScheduleResult:
+    ok: bool
+    message: str
+    schedule_id: int | None = None
+
+
+@dataclass(frozen=True)
+class PaymentRun:
+    schedule_id: int
+    due_at: str
+    ok: bool
+    message: str
+
+
+class PaymentScheduler:
+    """Runs standing orders from ``payment_schedules`` when they fall due.
+
+    Only the schedules due within ``horizon`` seconds are kept in memory, in
+    a min-heap of ``(next_run, id)``, and loaded through the partial index
+    on ``next_run`` (at most ``max_loaded`` of them at a time). The thread
+    sleeps until the heap's top is due or the horizon runs out, so an idle
+    scheduler reads the table about once per horizon, however many
+    schedules it holds.
+
+    Due payments run in batches of ``batch_size``, each batch in one write
+    transaction through ``TransferService.apply``. Each schedule's next_run
+    moves forward in the same transaction as its transfer, so a crash or
+    restart can neither skip nor repeat a payment. Rejected payments
+    (e.g. no funds) are logged and the schedule moves to its next run.
+    """
+
+    def __init__(
+        self,
+        database: BankDatabase,
+        transfers: TransferService,
+        horizon: float = HORIZON_SECONDS,
+        max_loaded: int = MAX_LOADED,
+        batch_size: int = BATCH_SIZE,
+    ) -> None:
+        self.database = database
+        self.transfers = transfers
+        self.horizon = horizon
+        self.max_loaded = max_loaded
+        self.batch_size = batch_size
+        self._heap: list[tuple[str, int]] = []
+        # Every active schedule with (next_run, id) <= _loaded_until is in the heap.
+        self._loaded_until: tuple[str, int] | None = None
+        self._wakeup = threading.Condition()
+        self._stop = False
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        with self._wakeup:
+            if self._thread is not None:
+                return
+            self._stop = False
+            self._thread = threading.Thread(target=self._loop, name="scheduled-payments", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._wakeup:
+            self._stop = True
+            self._wakeup.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def add(
+        self,
+        payer_account_id: int,
+        card_number: str,
+        amount_text: str,
+        message: str,
+        interval: str,
+        first_run: datetime,
+    ) -> ScheduleResult:
+        if interval not in INTERVALS:
+            return ScheduleResult(False, "Неизвестная периодичность.")
+        parsed = TransferService.parse(card_number, amount_text, message)
+        if isinstance(parsed, TransferResult):
+            return ScheduleResult(False, parsed.message)
+        card_number, amount, message = parsed
+        first_run = first_run.replace(microsecond=0)
+        if first_run < datetime.now().replace(microsecond=0):
+            return ScheduleResult(False, "Дата первого платежа уже прошла.")
+
+        next_run = first_run.strftime(TIME_FORMAT)
+        with self.database.connection() as conn:
+            schedule_id = conn.execute(
+                """
+                INSERT INTO payment_schedules (
+                    payer_account_id, card_number, amount, message, interval, anchor, occurrence,
+                    next_run, active, created_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, 0, ?, 1, ?)
+                """,
+                (
+                    payer_account_id,
+                    card_number,
+                    amount,
+                    message,
+                    interval,
+                    next_run,
+                    next_run,
+                    datetime.now().strftime(TIME_FORMAT),
+                ),
+            ).lastrowid
+        self._offer(next_run, schedule_id)
+        return ScheduleResult(True, f"Платёж запланирован на {first_run:%d.%m.%Y %H:%M}.", schedule_id)
+
+    def cancel(self, schedule_id: int, payer_account_id: int) -> bool:
+        # The heap entry stays and is dropped when it comes up.
+        with self.database.connection() as conn:
+            cursor = conn.execute(
+                "UPDATE payment_schedules SET active = 0 WHERE id = ? AND payer_account_id = ? AND active = 1",
+                (schedule_id, payer_account_id),
+            )
+        return cursor.rowcount == 1
+
+    def schedules(self, payer_account_id: int) -> list[Schedule]:
+        with self.database.connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, payer_account_id, card_number, amount, message, interval,
+                    next_run, active, last_run, last_result
+                FROM payment_schedules
+                WHERE payer_account_id = ?
+                ORDER BY active DESC, next_run, id
+                """,
+                (payer_account_id,),
+            ).fetchall()
+        return [Schedule(**{**dict(row), "active": bool(row["active"])}) for row in rows]
+
+    def run_due(self, now: datetime | None = None) -> list[PaymentRun]:
+        """Run every payment due at ``now``, in batches; returns what ran."""
+        now = (now or datetime.now()).replace(microsecond=0)
+        stamp = now.strftime(TIME_FORMAT)
+        runs: list[PaymentRun] = []
+        while True:
+            with self._wakeup:
+                if self._stop:
+                    return runs  # what is left stays due for the next start
+                if self._needs_refill(stamp):
+                    self._refill(now)
+                batch = self._pop_due(stamp)
+            if not batch:
+                return runs
+            runs += self._run_batch(batch, now)
+
+    def _offer(self, next_run: str, schedule_id: int) -> None:
+        with self._wakeup:
+            if self._loaded_until is None or (next_run, schedule_id) > self._loaded_until:
+                return
+            heapq.heappush(self._heap, (next_run, schedule_id))
+            if self._heap[0] == (next_run, schedule_id):
+                self._wakeup.notify_all()
+
+    def _needs_refill(self, stamp: str) -> bool:
+        if self._loaded_until is None:
+            return True
+        # Everything loaded has been taken and the window may hold more.
+        return not self._heap and self._loaded_until[0] <= stamp
+
+    def _refill(self, now: datetime) -> None:
+        horizon = (now + timedelta(seconds=self.horizon)).strftime(TIME_FORMAT)
+        with self.database.connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT next_run, id
+                FROM payment_schedules
+                WHERE active = 1 AND next_run < ?
+                ORDER BY next_run, id
+                LIMIT ?
+                """,
+                (horizon, self.max_loaded),
+            ).fetchall()
+        self._heap = [(row[0], row[1]) for row in rows]  # already in heap order
+        self._loaded_until = self._heap[-1] if len(rows) == self.max_loaded else (horizon, -1)
+
+    def _pop_due(self, stamp: str) -> list[tuple[str, int]]:
+        batch: list[tuple[str, int]] = []
+        while self._heap and self._heap[0][0] <= stamp and len(batch) < self.batch_size:
+            batch.append(heapq.heappop(self._heap))
+        if self._loaded_until is not None and self._loaded_until[0] <= stamp and not self._heap:
+            # The window was full; the next refill continues past it.
+            self._loaded_until = None
+        return batch
+
+    def _run_batch(self, batch: list[tuple[str, int]], now: datetime) -> list[PaymentRun]:
+        stamp = now.strftime(TIME_FORMAT)
+        limits = self.transfers.limits
+        # Limit reservations of the current attempt; write() may run work again.
+        reserved: list[tuple[int, int]] = []
+
+        def release_reserved() -> None:
+            for payer, amount in reserved:
+                limits.release(payer, amount, now)
+            reserved.clear()
+
+        def work(conn: sqlite3.Connection) -> tuple[list[PaymentRun], list[tuple[str, int]]]:
+            release_reserved()
+            runs, rescheduled = [], []
+            for due_at, schedule_id in batch:
+                row = conn.execute(
+                    """
+                    SELECT payer_account_id, card_number, amount, message, interval, anchor, occurrence
+                    FROM payment_schedules
+                    WHERE id = ? AND active = 1 AND next_run = ?
+                    """,
+                    (schedule_id, due_at),
+                ).fetchone()
+                if row is None:
+                    continue  # cancelled or already run
+                payer, amount = row["payer_account_id"], row["amount"]
+
+                reason = None if limits is None else limits.reserve(payer, amount, now)
+                if reason is not None:
+                    rejected = TransferResult(False, reason)
+                else:
+                    rejected = self.transfers.apply(conn, payer, row["card_number"], amount, row["message"], stamp)
+                    if limits is not None:
+                        if rejected is None:
+                            reserved.append((payer, amount))
+                        else:
+                            limits.release(payer, amount, now)
+                result = "Выполнен." if rejected is None else rejected.message
+                anchor = datetime.strptime(row["anchor"], TIME_FORMAT)
+                index = next_index(anchor, row["interval"], row["occurrence"], now)
+                next_run = None if index is None else occurrence(anchor, row["interval"], index).strftime(TIME_FORMAT)
+                conn.execute(
+                    """
+                    UPDATE payment_schedules
+                    SET next_run = ?, occurrence = ?, active = ?, last_run = ?, last_result = ?
+                    WHERE id = ?
+                    """,
+                    (next_run, index or row["occurrence"], next_run is not None, stamp, result, schedule_id),
+                )
+                conn.execute(
+                    "INSERT INTO payment_runs (schedule_id, due_at, ran_at, ok, message) VALUES (?, ?, ?, ?, ?)",
+                    (schedule_id, due_at, stamp, rejected is None, result),
+                )
+                runs.append(PaymentRun(schedule_id, due_at, rejected is None, result))
+                if next_run is not None:
+                    rescheduled.append((next_run, schedule_id))
+            return runs, rescheduled
+
+        try:
+            runs, rescheduled = self.database.write("scheduled_payments", work)
+        except Exception as exc:
+            # Nothing was committed: the reservations go, and after a lock
+            # error the batch is due again on the next pass.
+            release_reserved()
+            if is_lock_error(exc):
+                for due_at, schedule_id in batch:
+                    self._offer(due_at, schedule_id)
+            raise
+        for next_run, schedule_id in rescheduled:
+            self._offer(next_run, schedule_id)
+        return runs
+
+    def _seconds_until_next(self) -> float:
+        now = datetime.now()
+        targets = []
+        if self._heap:
+            targets.append(self._heap[0][0])
+        if self._loaded_until is not None:
+            targets.append(self._loaded_until[0])
+        if not targets:
+            return 0.0
+        return max((datetime.strptime(min(targets), TIME_FORMAT) - now).total_seconds(), 0.0)
+
+    def _loop(self) -> None:
+        while True:
+            with self._wakeup:
+                if self._stop:
+                    return
+                if self._loaded_until is not None:
+                    self._wakeup.wait(self._seconds_until_next())
+                if self._stop:
+                    return
+            try:
+                self.run_due()
+            except sqlite3.Error:
+                # A failed pass leaves its payments due; wait a little before retrying.
+                with self._wakeup:
+                    self._wakeup.wait(1.0)
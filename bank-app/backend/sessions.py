@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import os
+import secrets
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .database import BankDatabase
+
+SESSION_TTL_SECONDS = 30 * 24 * 3600
+
+
+class SessionService:
+    """HMAC-signed "remember me" tokens.
+
+    A token is ``<session id>.<user id>.<expires>.<signature>``. Resuming only
+    checks the signature and expiry and does a primary-key lookup for
+    revocation, instead of re-running PBKDF2 on the password.
+    """
+
+    def __init__(
+        self,
+        database: BankDatabase,
+        key_path: Path,
+        token_path: Path,
+        ttl_seconds: int = SESSION_TTL_SECONDS,
+    ) -> None:
+        self.database = database
+        self.key_path = key_path
+        self.token_path = token_path
+        self.ttl_seconds = ttl_seconds
+        self._key: bytes | None = None
+
+    def issue(self, user_id: int) -> str:
+        session_id = secrets.token_hex(16)
+        expires_at = int(time.time()) + self.ttl_seconds
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.database.connection() as conn:
+            conn.execute(
+                """
+                INSERT INTO sessions (id, user_id, created_at, expires_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (session_id, user_id, created_at, expires_at),
+            )
+
+        payload = f"{session_id}.{user_id}.{expires_at}"
+        return f"{payload}.{self._sign(payload)}"
+
+    def verify(self, token: str) -> int | None:
+        parsed = self._parse(token)
+        if parsed is None:
+            return None
+        session_id, user_id, _expires_at = parsed
+
+        with self.database.connection() as conn:
+            row = conn.execute(
+                "SELECT revoked_at FROM sessions WHERE id = ? AND user_id = ?",
+                (session_id, user_id),
+            ).fetchone()
+
+        if row is None or row["revoked_at"] is not None:
+            return None
+        return user_id
+
+    def revoke(self, token: str) -> None:
+        parsed = self._parse(token)
+        if parsed is None:
+            return
+        revoked_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.database.connection() as conn:
+            conn.execute(
+                "UPDATE sessions SET revoked_at = ? WHERE id = ? AND revoked_at IS NULL",
+                (revoked_at, parsed[0]),
+            )
+
+    def revoke_user(self, user_id: int) -> int:
+        revoked_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self.database.connection() as conn:
+            cursor = conn.execute(
+                "UPDATE sessions SET revoked_at = ? WHERE user_id = ? AND revoked_at IS NULL",
+                (revoked_at, user_id),
+            )
+        return cursor.rowcount
+
+    def cleanup_expired(self, now: int | None = None) -> int:
+        # Revoked sessions are kept until they would have expired anyway, so a
+        # stolen token can never outlive its revocation record.
+        now = int(time.time()) if now is None else now
+        with self.database.connection() as conn:
+            cursor = conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+        return cursor.rowcount
+
+    def load_local(self) -> str | None:
+        try:
+            return self.token_path.read_text(encoding="ascii").strip() or None
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def save_local(self, token: str) -> None:
+        _write_private(self.token_path, token.encode("ascii"))
+
+    def forget_local(self) -> None:
+        try:
+            self.token_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _parse(self, token: str) -> tuple[str, int, int] | None:
+        if not token.isascii():
+            return None
+        try:
+            session_id, user_id, expires_at, signature = token.split(".")
+            user_id_value = int(user_id)
+            expires_value = int(expires_at)
+        except ValueError:
+            return None
+
+        payload = f"{session_id}.{user_id}.{expires_at}"
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            return None
+        if expires_value <= time.time():
+            return None
+        return session_id, user_id_value, expires_value
+
+    def _sign(self, payload: str) -> str:
+        return hmac.new(self._secret(), payload.encode("ascii"), hashlib.sha256).hexdigest()
+
+    def _secret(self) -> bytes:
+        if self._key is None:
+            try:
+                self._key = self.key_path.read_bytes()
+            except FileNotFoundError:
+                self._key = secrets.token_bytes(32)
+                _write_private(self.key_path, self._key)
+        return self._key
+
+
+def _write_private(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(data)
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import json
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .archive import LedgerArchive
+from .database import BankDatabase
+from .numpy_support import require_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+LEDGER_COLUMNS = ("id", "account_id", "counterparty_id", "amount", "created_at")
+ACCOUNT_COLUMNS = ("id", "user_id", "balance")
+FETCH_ROWS = 100_000
+MAX_SEGMENTS = 16
+MANIFEST = "manifest.json"
+
+
+@dataclass
+class Snapshot:
+    """Column arrays of the ledger and accounts tables.
+
+    ``created_at`` holds seconds since the epoch of the stored local time and
+    ``counterparty_id`` is 0 where the ledger has NULL.
+    """
+
+    ledger: dict[str, np.ndarray]
+    accounts: dict[str, np.ndarray]
+    last_ledger_id: int
+
+    @property
+    def ledger_rows(self) -> int:
+        return len(self.ledger["id"])
+
+
+@dataclass(frozen=True)
+class RefreshResult:
+    new_rows: int
+    total_rows: int
+    segments: int
+    elapsed: float
+
+
+class SnapshotExporter:
+    """Writes the ledger as memory-mappable ``.npy`` files, one per column.
+
+    The ledger is append-only, so each refresh exports only rows above the
+    last exported id as a new segment directory; once there are more than
+    ``MAX_SEGMENTS`` they are merged into one. Accounts are small and
+    mutable and are rewritten in full. ``manifest.json`` is replaced last,
+    so readers never see a half-written refresh.
+    """
+
+    def __init__(self, database: BankDatabase, directory: Path, archive: LedgerArchive | None = None) -> None:
+        self.database = database
+        self.directory = directory
+        self.archive = archive
+
+    def refresh(self) -> RefreshResult:
+        np = require_numpy("Ledger snapshots")
+        started = time.perf_counter()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        manifest = self._read_manifest()
+        serial = manifest["serial"] + 1
+        obsolete: list[str] = []
+
+        # Rows archived before they were ever exported are read back through
+        # ledger_all; normally no archive holds ids above the last export.
+        if self.archive is None:
+            source, connection = "ledger", self.database.connection()
+        else:
+            source, connection = "ledger_all", self.archive.connection(manifest["last_ledger_id"] + 1)
+        with connection as conn:
+            conn.row_factory = None
+            # One read transaction, so accounts and ledger are mutually consistent.
+            conn.execute("BEGIN")
+            ledger = self._fetch(
+                np,
+                conn.execute(
+                    f"""
+                    SELECT
+                        id,
+                        account_id,
+                        COALESCE(counterparty_account_id, 0),
+                        amount,
+                        CAST(strftime('%s', created_at) AS INTEGER)
+                    FROM {source}
+                    WHERE id > ?
+                    ORDER BY id
+                    """,
+                    (manifest["last_ledger_id"],),
+                ),
+                len(LEDGER_COLUMNS),
+            )
+            accounts = self._fetch(
+                np,
+                conn.execute("SELECT id, user_id, balance FROM accounts ORDER BY id"),
+                len(ACCOUNT_COLUMNS),
+            )
+
+        if len(ledger):
+            name = f"ledger-{serial:06d}"
+            self._write_columns(np, name, _split(ledger, LEDGER_COLUMNS))
+            manifest["segments"].append({"name": name, "rows": len(ledger)})
+            manifest["last_ledger_id"] = int(ledger[-1, 0])
+
+        if len(manifest["segments"]) > MAX_SEGMENTS:
+            obsolete.extend(segment["name"] for segment in manifest["segments"])
+            name = f"ledger-{serial:06d}c"
+            merged = self._load_segments(np, manifest["segments"], mmap=False)
+            self._write_columns(np, name, merged)
+            manifest["segments"] = [{"name": name, "rows": len(merged["id"])}]
+
+        accounts_name = f"accounts-{serial:06d}"
+        self._write_columns(np, accounts_name, _split(accounts, ACCOUNT_COLUMNS))
+        if manifest["accounts"]:
+            obsolete.append(manifest["accounts"])
+        manifest["accounts"] = accounts_name
+        manifest["serial"] = serial
+
+        self._write_manifest(manifest)
+        for name in obsolete:
+            shutil.rmtree(self.directory / name, ignore_errors=True)
+
+        return RefreshResult(
+            new_rows=len(ledger),
+            total_rows=sum(segment["rows"] for segment in manifest["segments"]),
+            segments=len(manifest["segments"]),
+            elapsed=time.perf_counter() - started,
+        )
+
+    def load(self) -> Snapshot:
+        np = require_numpy("Ledger snapshots")
+        manifest = self._read_manifest()
+        if not manifest["accounts"]:
+            raise FileNotFoundError(f"No snapshot in {self.directory}; run a refresh first.")
+        accounts = {
+            column: np.load(self.directory / manifest["accounts"] / f"{column}.npy", mmap_mode="r")
+            for column in ACCOUNT_COLUMNS
+        }
+        return Snapshot(
+            ledger=self._load_segments(np, manifest["segments"], mmap=True),
+            accounts=accounts,
+            last_ledger_id=manifest["last_ledger_id"],
+        )
+
+    def _load_segments(self, np: Any, segments: list[dict], mmap: bool) -> dict[str, np.ndarray]:
+        mode = "r" if mmap else None
+        columns: dict[str, list] = {column: [] for column in LEDGER_COLUMNS}
+        for segment in segments:
+            for column in LEDGER_COLUMNS:
+                columns[column].append(
+                    np.load(self.directory / segment["name"] / f"{column}.npy", mmap_mode=mode)
+                )
+        result = {}
+        for column, parts in columns.items():
+            if not parts:
+                result[column] = np.empty(0, dtype=np.int64)
+            elif len(parts) == 1:
+                result[column] = parts[0]  # stays memory-mapped
+            else:
+                result[column] = np.concatenate(parts)
+        return result
+
+    @staticmethod
+    def _fetch(np: Any, cursor: Any, width: int) -> np.ndarray:
+        blocks = []
+        while True:
+            rows = cursor.fetchmany(FETCH_ROWS)
+            if not rows:
+                break
+            blocks.append(np.array(rows, dtype=np.int64))
+        if not blocks:
+            return np.empty((0, width), dtype=np.int64)
+        return np.concatenate(blocks)
+
+    def _write_columns(self, np: Any, name: str, columns: dict[str, np.ndarray]) -> None:
+        target = self.directory / name
+        shutil.rmtree(target, ignore_errors=True)
+        target.mkdir()
+        for column, values in columns.items():
+            np.save(target / f"{column}.npy", np.ascontiguousarray(values))
+
+    def _read_manifest(self) -> dict:
+        try:
+            return json.loads((self.directory / MANIFEST).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {"serial": 0, "last_ledger_id": 0, "segments": [], "accounts": None}
+
+    def _write_manifest(self, manifest: dict) -> None:
+        temporary = self.directory / f"{MANIFEST}.tmp"
+        temporary.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        temporary.replace(self.directory / MANIFEST)
+
+
+def _split(block: np.ndarray, columns: tuple[str, ...]) -> dict[str, np.ndarray]:
+    return {column: block[:, index] for index, column in enumerate(columns)}
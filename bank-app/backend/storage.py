@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Protocol
+
+from .database import BankDatabase, is_lock_error
+
+LOGIN = "login"
+ACCOUNT_NUMBER = "account_number"
+CARD_NUMBER = "card_number"
+
+
+@dataclass(frozen=True)
+class UserProfile:
+    user_id: int
+    login: str
+    first_name: str
+    last_name: str
+    password_hash: str
+    account_id: int
+    account_number: str
+    card_number: str
+
+
+@dataclass(frozen=True)
+class NewUser:
+    login: str
+    first_name: str
+    last_name: str
+    password_hash: str
+    registered_at: str
+    account_number: str
+    card_number: str
+
+
+class DuplicateError(Exception):
+    """A unique field of ``NewUser`` is taken; ``field`` is LOGIN, ACCOUNT_NUMBER or CARD_NUMBER."""
+
+    def __init__(self, field: str) -> None:
+        super().__init__(f"{field} already exists")
+        self.field = field
+
+
+class StoreBusyError(Exception):
+    """The store stayed locked for longer than its retry policy allows."""
+
+
+class UserStore(Protocol):
+    """User, account and card operations ``AuthService`` needs.
+
+    ``insert_user`` creates the user, its account and its card atomically
+    or not at all.
+    """
+
+    def initialize(self) -> None: ...
+
+    def profile_by_login(self, login: str) -> UserProfile | None: ...
+
+    def profile_by_id(self, user_id: int) -> UserProfile | None: ...
+
+    def number_exists(self, field: str, value: str) -> bool: ...
+
+    def insert_user(self, user: NewUser) -> UserProfile: ...
+
+
+class SqliteUserStore:
+    def __init__(self, database: BankDatabase) -> None:
+        self.database = database
+
+    def initialize(self) -> None:
+        self.database.initialize()
+
+    def profile_by_login(self, login: str) -> UserProfile | None:
+        return self._profile("u.login = ?", login)
+
+    def profile_by_id(self, user_id: int) -> UserProfile | None:
+        return self._profile("u.id = ?", user_id)
+
+    def number_exists(self, field: str, value: str) -> bool:
+        table = {ACCOUNT_NUMBER: "accounts", CARD_NUMBER: "cards"}[field]
+        with self.database.connection() as conn:
+            row = conn.execute(f"SELECT 1 FROM {table} WHERE {field} = ? LIMIT 1", (value,)).fetchone()
+        return row is not None
+
+    def insert_user(self, user: NewUser) -> UserProfile:
+        def insert(conn: sqlite3.Connection) -> tuple[int, int]:
+            user_id = conn.execute(
+                """
+                INSERT INTO users (login, first_name, last_name, password_hash, registered_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (user.login, user.first_name, user.last_name, user.password_hash, user.registered_at),
+            ).lastrowid
+            account_id = conn.execute(
+                "INSERT INTO accounts (user_id, account_number) VALUES (?, ?)",
+                (user_id, user.account_number),
+            ).lastrowid
+            conn.execute(
+                "INSERT INTO cards (account_id, card_number) VALUES (?, ?)",
+                (account_id, user.card_number),
+            )
+            return user_id, account_id
+
+        try:
+            user_id, account_id = self.database.write("register_user", insert)
+        except sqlite3.IntegrityError as exc:
+            text = str(exc)
+            for table, field in (("users", LOGIN), ("accounts", ACCOUNT_NUMBER), ("cards", CARD_NUMBER)):
+                if f"{table}.{field}" in text:
+                    raise DuplicateError(field) from exc
+            raise
+        except sqlite3.OperationalError as exc:
+            if not is_lock_error(exc):
+                raise
+            raise StoreBusyError(str(exc)) from exc
+        return _profile_of(user, user_id, account_id)
+
+    def _profile(self, condition: str, value: object) -> UserProfile | None:
+        with self.database.connection() as conn:
+            row = conn.execute(
+                f"""
+                SELECT
+                    u.id AS user_id,
+                    u.login,
+                    u.first_name,
+                    u.last_name,
+                    u.password_hash,
+                    a.id AS account_id,
+                    a.account_number,
+                    c.card_number
+                FROM users u
+                JOIN accounts a ON a.user_id = u.id
+                JOIN cards c ON c.account_id = a.id
+                WHERE {condition}
+                """,
+                (value,),
+            ).fetchone()
+        return None if row is None else UserProfile(**dict(row))
+
+
+class _User:
+    __slots__ = ("id", "login", "first_name", "last_name", "password_hash", "registered_at", "account")
+
+    def __init__(
+        self,
+        id: int,
+        login: str,
+        first_name: str,
+        last_name: str,
+        password_hash: str,
+        registered_at: str,
+        account: _Account,
+    ) -> None:
+        self.id = id
+        self.login = login
+        self.first_name = first_name
+        self.last_name = last_name
+        self.password_hash = password_hash
+        self.registered_at = registered_at
+        self.account = account
+
+
+class _Account:
+    __slots__ = ("id", "number", "card_number")
+
+    def __init__(self, id: int, number: str, card_number: str) -> None:
+        self.id = id
+        self.number = number
+        self.card_number = card_number
+
+
+class MemoryUserStore:
+    """Dict-indexed store for tests and benchmarks; nothing is persisted.
+
+    Each unique column has its own dict, so every lookup is one hash probe.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_id: dict[int, _User] = {}
+        self._by_login: dict[str, _User] = {}
+        self._by_account_number: dict[str, _User] = {}
+        self._by_card_number: dict[str, _User] = {}
+
+    def initialize(self) -> None:
+        pass
+
+    def profile_by_login(self, login: str) -> UserProfile | None:
+        user = self._by_login.get(login)
+        return None if user is None else _profile_from_record(user)
+
+    def profile_by_id(self, user_id: int) -> UserProfile | None:
+        user = self._by_id.get(user_id)
+        return None if user is None else _profile_from_record(user)
+
+    def number_exists(self, field: str, value: str) -> bool:
+        index = {ACCOUNT_NUMBER: self._by_account_number, CARD_NUMBER: self._by_card_number}[field]
+        return value in index
+
+    def insert_user(self, user: NewUser) -> UserProfile:
+        with self._lock:
+            # Checked in the same order SQLite inserts the rows.
+            for field, index, value in (
+                (LOGIN, self._by_login, user.login),
+                (ACCOUNT_NUMBER, self._by_account_number, user.account_number),
+                (CARD_NUMBER, self._by_card_number, user.card_number),
+            ):
+                if value in index:
+                    raise DuplicateError(field)
+            user_id = len(self._by_id) + 1
+            record = _User(
+                user_id,
+                user.login,
+                user.first_name,
+                user.last_name,
+                user.password_hash,
+                user.registered_at,
+                _Account(user_id, user.account_number, user.card_number),
+            )
+            self._by_id[user_id] = record
+            self._by_login[user.login] = record
+            self._by_account_number[user.account_number] = record
+            self._by_card_number[user.card_number] = record
+        return _profile_from_record(record)
+
+
+def _profile_of(user: NewUser, user_id: int, account_id: int) -> UserProfile:
+    return UserProfile(
+        user_id=user_id,
+        login=user.login,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        password_hash=user.password_hash,
+        account_id=account_id,
+        account_number=user.account_number,
+        card_number=user.card_number,
+    )
+
+
+def _profile_from_record(user: _User) -> UserProfile:
+    return UserProfile(
+        user_id=user.id,
+        login=user.login,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        password_hash=user.password_hash,
+        account_id=user.account.id,
+        account_number=user.account.number,
+        card_number=user.account.card_number,
+    )
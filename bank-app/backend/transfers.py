@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+
+from .database import BankDatabase, is_lock_error
+from .limits import TransferLimits
+from .payroll import MAX_MESSAGE_LENGTH, parse_amount
+
+
+@dataclass(frozen=True)
+class TransferResult:
+    ok: bool
+    message: str
+    amount: int = 0
+
+
+class TransferService:
+    """Card-to-card transfers from the logged-in account.
+
+    The limit check is done in memory before the database is touched; the
+    balances and both ledger rows are written in one IMMEDIATE transaction,
+    retried by ``BankDatabase.write`` if the database is locked.
+    """
+
+    def __init__(self, database: BankDatabase, limits: TransferLimits | None = None) -> None:
+        self.database = database
+        self.limits = limits
+
+    def transfer(
+        self,
+        payer_account_id: int,
+        card_number: str,
+        amount_text: str,
+        message: str = "",
+    ) -> TransferResult:
+        parsed = self.parse(card_number, amount_text, message)
+        if isinstance(parsed, TransferResult):
+            return parsed
+        card_number, amount, message = parsed
+
+        now = datetime.now()
+        if self.limits is not None:
+            reason = self.limits.reserve(payer_account_id, amount, now)
+            if reason is not None:
+                return TransferResult(False, reason)
+
+        created_at = now.strftime("%Y-%m-%d %H:%M:%S")
+
+        try:
+            rejected = self.database.write(
+                "transfer",
+                lambda conn: self.apply(conn, payer_account_id, card_number, amount, message, created_at),
+            )
+        except Exception as exc:
+            if self.limits is not None:
+                self.limits.release(payer_account_id, amount, now)
+            if not is_lock_error(exc):
+                raise
+            return TransferResult(False, "База данных занята, повторите попытку позже.")
+        if rejected is not None:
+            if self.limits is not None:
+                self.limits.release(payer_account_id, amount, now)
+            return rejected
+
+        return TransferResult(True, f"Переведено {amount / 100:,.2f} ₽.".replace(",", " "), amount)
+
+    @staticmethod
+    def parse(card_number: str, amount_text: str, message: str) -> tuple[str, int, str] | TransferResult:
+        """Normalised ``(card_number, kopecks, message)``, or the rejection."""
+        card_number = card_number.replace(" ", "").strip()
+        message = message.strip()
+        if len(card_number) != 16 or not card_number.isdigit():
+            return TransferResult(False, "Номер карты должен содержать 16 цифр.")
+        amount = parse_amount(amount_text)
+        if amount is None:
+            return TransferResult(False, "Неверная сумма.")
+        if len(message) > MAX_MESSAGE_LENGTH:
+            return TransferResult(False, "Слишком длинное сообщение.")
+        return card_number, amount, message
+
+    @staticmethod
+    def apply(
+        conn: sqlite3.Connection,
+        payer_account_id: int,
+        card_number: str,
+        amount: int,
+        message: str,
+        created_at: str,
+    ) -> TransferResult | None:
+        """Move the money inside the caller's write transaction.
+
+        Returns the rejection, or ``None`` once both balances and ledger rows
+        are written. Nothing is written before every check has passed.
+        """
+        payee = conn.execute(
+            "SELECT account_id FROM cards WHERE card_number = ?",
+            (card_number,),
+        ).fetchone()
+        if payee is None:
+            return TransferResult(False, "Карта получателя не найдена.")
+        payee_account_id = payee["account_id"]
+        if payee_account_id == payer_account_id:
+            return TransferResult(False, "Нельзя перевести деньги самому себе.")
+
+        balance = conn.execute(
+            "SELECT balance FROM accounts WHERE id = ?",
+            (payer_account_id,),
+        ).fetchone()
+        if balance is None:
+            return TransferResult(False, "Счёт отправителя не найден.")
+        if balance["balance"] < amount:
+            return TransferResult(False, "Недостаточно средств.")
+
+        conn.executemany(
+            "UPDATE accounts SET balance = balance + ? WHERE id = ?",
+            ((-amount, payer_account_id), (amount, payee_account_id)),
+        )
+        conn.executemany(
+            """
+            INSERT INTO ledger (account_id, counterparty_account_id, amount, message, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (
+                (payer_account_id, payee_account_id, -amount, message, created_at),
+                (payee_account_id, payer_account_id, amount, message, created_at),
+            ),
+        )
+        return None
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import secrets
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+MAGIC = b"BNKW"
+VERSION = 1
+FLUSH_EVERY = 64
+
+LOGIN = "login"
+REGISTER = "register"
+TRANSFER = "transfer"
+HISTORY_COUNT = "history_count"
+HISTORY_PAGE = "history_page"
+SEARCH = "search"
+
+_FILE_HEADER = struct.Struct("<4sBd")
+# Milliseconds since capture start, call latency in microseconds, op, ok.
+_RECORD_HEADER = struct.Struct("<IIBB")
+_PAYLOADS = {
+    LOGIN: (1, struct.Struct("<8s")),
+    REGISTER: (2, struct.Struct("<8s")),
+    TRANSFER: (3, struct.Struct("<8s8sqH")),
+    HISTORY_COUNT: (4, struct.Struct("<8s")),
+    HISTORY_PAGE: (5, struct.Struct("<8sIH?")),
+    SEARCH: (6, struct.Struct("<B")),
+}
+_BY_CODE = {code: (name, payload) for name, (code, payload) in _PAYLOADS.items()}
+
+
+@dataclass(frozen=True)
+class WorkloadEvent:
+    """One captured backend call.
+
+    ``args`` per operation:
+
+    - login, register: ``(user token,)``
+    - transfer: ``(payer account token, payee card token, kopecks, message length)``
+    - history_count: ``(account token,)``
+    - history_page: ``(account token, offset, limit, keyset)``
+    - search: ``(query length,)``
+    """
+
+    at: float
+    op: str
+    ok: bool
+    latency: float
+    args: tuple
+
+
+class WorkloadRecorder:
+    """Appends backend calls to a compact binary log.
+
+    Logins, accounts and cards are replaced by 8-byte keyed hashes. The key
+    is random per capture and never written, so tokens are stable within a
+    log but cannot be reversed or matched across logs. Passwords, names,
+    messages and search text are never recorded, only their shape.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._key = secrets.token_bytes(32)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._pending = 0
+        self._handle: BinaryIO | None = path.open("wb")
+        self._handle.write(_FILE_HEADER.pack(MAGIC, VERSION, time.time()))
+
+    def token(self, value: object) -> bytes:
+        return hmac.new(self._key, str(value).encode("utf-8"), hashlib.sha256).digest()[:8]
+
+    def record(self, op: str, started: float, ok: bool, *args: object) -> None:
+        """``started`` is the ``time.monotonic()`` value taken before the call."""
+        code, payload = _PAYLOADS[op]
+        latency_us = min(int((time.monotonic() - started) * 1_000_000), 2**32 - 1)
+        at_ms = int((started - self._started) * 1000)
+        data = _RECORD_HEADER.pack(at_ms, latency_us, code, ok) + payload.pack(*args)
+        with self._lock:
+            if self._handle is None:
+                return
+            self._handle.write(data)
+            self._pending += 1
+            if self._pending >= FLUSH_EVERY:
+                self._handle.flush()
+                self._pending = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+
+def read_workload(path: Path) -> Iterator[WorkloadEvent]:
+    with path.open("rb") as handle:
+        magic, version, _started_at = _FILE_HEADER.unpack(handle.read(_FILE_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} workload log")
+        while True:
+            header = handle.read(_RECORD_HEADER.size)
+            if len(header) < _RECORD_HEADER.size:
+                return
+            at_ms, latency_us, code, ok = _RECORD_HEADER.unpack(header)
+            op, payload = _BY_CODE[code]
+            body = handle.read(payload.size)
+            if len(body) < payload.size:
+                return  # truncated by a crash mid-write
+            yield WorkloadEvent(at_ms / 1000, op, bool(ok), latency_us / 1_000_000, payload.unpack(body))
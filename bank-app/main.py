@@ -1,10 +1,66 @@
-from ui.app import BankApp
+from __future__ import annotations
 
+import argparse
+from pathlib import Path
 
-def main() -> None:
-    app = BankApp()
+from ui.profiling import PhaseTimer
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Уралсиб — макет")
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="print per-phase startup timings once the window is fully ready",
+    )
+    parser.add_argument(
+        "--lag-monitor",
+        action="store_true",
+        help="track event-loop stalls; F12 prints the report, it is also printed on exit",
+    )
+    parser.add_argument(
+        "--lag-dump",
+        type=Path,
+        metavar="PATH",
+        help="write the event-loop lag data as JSON on exit (implies --lag-monitor)",
+    )
+    parser.add_argument(
+        "--capture",
+        type=Path,
+        metavar="PATH",
+        help="log backend calls (anonymised) to a binary workload file for tools.replay",
+    )
+    args = parser.parse_args(argv)
+
+    timer = PhaseTimer()
+    from ui.app import BankApp
+
+    timer.mark("import_ui")
+    app = BankApp(
+        timer=timer,
+        startup_profile=args.startup_profile,
+        lag_monitor=args.lag_monitor or args.lag_dump is not None,
+        capture=args.capture,
+    )
     app.mainloop()
 
+    # Let background batches finish their transactions rather than die mid-way.
+    if app.payment_scheduler is not None:
+        app.payment_scheduler.stop()
+    if app.maintenance is not None:
+        app.maintenance.stop()
+
+    if app.audit is not None:
+        app.audit.close()
+
+    if app.backend is not None and app.backend.recorder is not None:
+        app.backend.recorder.close()
+
+    if app.lag_monitor is not None:
+        print(app.lag_monitor.report(), flush=True)
+        if args.lag_dump is not None:
+            app.lag_monitor.dump(args.lag_dump)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1 @@
+"""Command-line maintenance and benchmark tools (run as ``python -m tools.<name>``)."""
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from backend.analytics import LedgerAnalytics
+from backend.archive import LedgerArchive
+from backend.database import BankDatabase
+from backend.snapshots import SnapshotExporter
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Columnar ledger snapshots and reports")
+    parser.add_argument("--db", type=Path, default=DATA_DIR / "bank.db")
+    parser.add_argument("--snapshot", type=Path, default=DATA_DIR / "snapshots")
+    parser.add_argument("--archive", type=Path, default=DATA_DIR / "archive")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("refresh", help="export ledger rows added since the last snapshot")
+    report = commands.add_parser("report", help="print monthly spend, top recipients and balances")
+    report.add_argument("--account", type=int, default=None)
+    report.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    database = BankDatabase(args.db)
+    database.initialize()
+    exporter = SnapshotExporter(database, args.snapshot, LedgerArchive(database, args.archive))
+
+    if args.command == "refresh":
+        result = exporter.refresh()
+        print(
+            f"{result.new_rows} new rows, {result.total_rows} total "
+            f"in {result.segments} segment(s), {result.elapsed:.2f} s"
+        )
+        return
+
+    analytics = LedgerAnalytics(exporter.load())
+    print("Spend per month, ₽")
+    for month, total in analytics.spend_per_month(args.account):
+        print(f"  {month}  {total / 100:>16,.2f}")
+    print("Top recipients, ₽")
+    for account_id, total, count in analytics.top_recipients(args.top):
+        print(f"  {account_id:>10}  {total / 100:>16,.2f}  ({count})")
+    print("Balances, ₽")
+    for low, high, count in analytics.balance_distribution():
+        low_label = "−∞" if low is None else f"{low // 100:,}"
+        high_label = "∞" if high is None else f"{high // 100:,}"
+        print(f"  [{low_label}, {high_label})  {count}")
+
+
+if __name__ == "__main__":
+    main()
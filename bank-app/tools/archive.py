@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from backend.archive import KEEP_MONTHS, ArchivePeriod, LedgerArchive
+from backend.database import BankDatabase
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Move closed ledger months to archive files")
+    parser.add_argument("--db", type=Path, default=DATA_DIR / "bank.db")
+    parser.add_argument("--archive", type=Path, default=DATA_DIR / "archive")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="archive every month older than --keep-months")
+    run.add_argument("--keep-months", type=int, default=KEEP_MONTHS)
+    commands.add_parser("list", help="list archived months")
+    args = parser.parse_args(argv)
+
+    database = BankDatabase(args.db)
+    database.initialize()
+    archive = LedgerArchive(database, args.archive)
+
+    if args.command == "list":
+        for period in archive.periods():
+            print(f"{period.period}  ids {period.first_id}-{period.last_id}  {period.rows} rows  {period.path.name}")
+        return
+
+    size_before = args.db.stat().st_size
+    started = time.perf_counter()
+
+    def progress(period: ArchivePeriod) -> None:
+        print(f"{period.period}: {period.rows} rows -> {period.path.name}")
+
+    archived = archive.archive(args.keep_months, progress=progress)
+    print(f"archived {len(archived)} month(s) in {time.perf_counter() - started:.2f} s")
+    with database.connection() as conn:
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    print(
+        f"hot database: {size_before / 2**20:.1f} MiB, "
+        f"{free * page_size / 2**20:.1f} MiB now free for reuse"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from backend.audit import LoginAuditTrail
+from backend.database import BankDatabase
+
+DEFAULT_DB = Path(__file__).resolve().parent.parent / "data" / "bank.db"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Show recorded login attempts, newest first")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--login", help="only attempts for this login")
+    parser.add_argument("--since", help="only attempts at or after this time, e.g. '2024-05-01 09:00:00'")
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    database = BankDatabase(args.db)
+    database.initialize()
+    for event in LoginAuditTrail(database).recent(args.login, args.since, args.limit):
+        user = "" if event.user_id is None else f"  user {event.user_id}"
+        print(f"{event.attempted_at}  {event.login:<20}{event.outcome}{user}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from backend.analytics import DEFAULT_BALANCE_EDGES, LedgerAnalytics
+from backend.database import BankDatabase
+from backend.numpy_support import numpy_available
+from backend.snapshots import SnapshotExporter
+
+from .seed import seed_accounts, seed_transfers
+
+
+def sql_spend_per_month(database: BankDatabase) -> list[tuple[str, int]]:
+    with database.connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT substr(created_at, 1, 7), -SUM(amount)
+            FROM ledger
+            WHERE amount < 0
+            GROUP BY 1
+            ORDER BY 1
+            """
+        ).fetchall()
+    return [tuple(row) for row in rows]
+
+
+def sql_top_recipients(database: BankDatabase, limit: int = 10) -> list[tuple[int, int, int]]:
+    with database.connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT account_id, SUM(amount), COUNT(*)
+            FROM ledger
+            WHERE amount > 0 AND counterparty_account_id IS NOT NULL
+            GROUP BY account_id
+            ORDER BY 2 DESC, 1
+            LIMIT ?
+            """,
+            (limit,),
+        ).fetchall()
+    return [tuple(row) for row in rows]
+
+
+def sql_balance_distribution(database: BankDatabase, edges=DEFAULT_BALANCE_EDGES) -> list[tuple]:
+    cases = " ".join(f"WHEN balance < {edge} THEN {i}" for i, edge in enumerate(edges))
+    with database.connection() as conn:
+        counts = dict(
+            conn.execute(
+                f"SELECT CASE {cases} ELSE {len(edges)} END, COUNT(*) FROM accounts GROUP BY 1"
+            ).fetchall()
+        )
+    bounds = [None, *edges, None]
+    return [(bounds[i], bounds[i + 1], counts.get(i, 0)) for i in range(len(edges) + 1)]
+
+
+def timed(callback: Callable[[], object]) -> tuple[object, float]:
+    started = time.perf_counter()
+    result = callback()
+    return result, time.perf_counter() - started
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Columnar snapshot analytics vs SQL")
+    parser.add_argument("--accounts", type=int, default=10_000)
+    parser.add_argument("--transfers", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+    if not numpy_available():
+        parser.exit(1, "NumPy is not installed; nothing to compare.\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = BankDatabase(Path(tmp) / "bench.db")
+        database.initialize()
+        accounts = [account_id for account_id, _card in seed_accounts(database, args.accounts, balance=50_000_00)]
+        seed_transfers(database, accounts, args.transfers)
+
+        exporter = SnapshotExporter(database, Path(tmp) / "snapshot")
+        result, _ = timed(exporter.refresh)
+        print(f"full export: {result.new_rows} rows in {result.elapsed:.2f} s")
+        seed_transfers(database, accounts, max(args.transfers // 100, 1), days=1)
+        result, _ = timed(exporter.refresh)
+        print(f"incremental export: {result.new_rows} rows in {result.elapsed:.2f} s")
+
+        snapshot, elapsed = timed(exporter.load)
+        print(f"load: {snapshot.ledger_rows} rows in {elapsed * 1000:.1f} ms")
+        analytics = LedgerAnalytics(snapshot)
+
+        cases = [
+            ("spend per month", lambda: sql_spend_per_month(database), analytics.spend_per_month),
+            ("top recipients", lambda: sql_top_recipients(database), analytics.top_recipients),
+            ("balance distribution", lambda: sql_balance_distribution(database), analytics.balance_distribution),
+        ]
+        print(f"{'query':<22}{'sql, ms':>10}{'numpy, ms':>12}{'speedup':>10}  match")
+        for name, sql, vectorized in cases:
+            expected, sql_time = timed(sql)
+            actual, numpy_time = timed(vectorized)
+            print(
+                f"{name:<22}{sql_time * 1000:>10.1f}{numpy_time * 1000:>12.1f}"
+                f"{sql_time / numpy_time:>9.1f}x  {'yes' if expected == actual else 'NO'}"
+            )
+
+
+if __name__ == "__main__":
+    main()
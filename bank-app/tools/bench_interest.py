@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import date
+from decimal import ROUND_HALF_EVEN, Decimal
+from pathlib import Path
+
+from backend.database import BankDatabase
+from backend.interest import MESSAGE, InterestAccrual, InterestPolicy
+from backend.numpy_support import numpy_available
+
+from .seed import seed_accounts
+
+
+def per_row(database: BankDatabase, policy: InterestPolicy, account_ids: list[int], day: str) -> None:
+    """The straightforward version: one read, one UPDATE and one commit per account."""
+    denominator = Decimal(10_000 * policy.days_in_year)
+    for account_id in account_ids:
+        with database.connection() as conn:
+            balance = conn.execute("SELECT balance FROM accounts WHERE id = ?", (account_id,)).fetchone()[0]
+            rate = policy.annual_rate_bp if balance > 0 else policy.overdraft_rate_bp if balance < 0 else 0
+            amount = int((Decimal(balance * rate) / denominator).quantize(Decimal(1), ROUND_HALF_EVEN))
+            if amount:
+                conn.execute("UPDATE accounts SET balance = balance + ? WHERE id = ?", (amount, account_id))
+                conn.execute(
+                    """
+                    INSERT INTO ledger (account_id, counterparty_account_id, amount, message, created_at)
+                    VALUES (?, NULL, ?, ?, ?)
+                    """,
+                    (account_id, amount, MESSAGE, f"{day} 23:59:59"),
+                )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Interest accrual: vectorized chunks vs one account at a time")
+    parser.add_argument("--accounts", type=int, default=1_000_000)
+    parser.add_argument("--sample", type=int, default=2_000, help="accounts for the per-row baseline")
+    parser.add_argument("--chunk", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args(argv)
+
+    if not numpy_available():
+        raise SystemExit("bench_interest needs NumPy (pip install numpy)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = BankDatabase(Path(tmp) / "bench.db")
+        database.initialize()
+        accounts = [account_id for account_id, _card in seed_accounts(database, args.accounts, balance=250_000_00)]
+        with database.connection() as conn:
+            # Every tenth account overdrawn, so both branches are exercised.
+            conn.execute("UPDATE accounts SET balance = -balance / 10 WHERE id % 10 = 0")
+            # Seeded opening entries run years ahead; accrual refuses days
+            # in a month the ledger has already left.
+            conn.execute("UPDATE ledger SET created_at = '2024-01-01 00:00:00'")
+
+        policy = InterestPolicy()
+        started = time.perf_counter()
+        per_row(database, policy, accounts[: args.sample], "2024-01-01")
+        baseline = args.sample / (time.perf_counter() - started)
+        print(f"{'per row':<18}{baseline:>12,.0f} accounts/s  ({args.accounts / baseline / 60:,.1f} min for all)")
+
+        for index, chunk in enumerate(args.chunk):
+            result = InterestAccrual(database, policy).run(date(2024, 1, 2 + index), chunk_size=chunk)
+            print(
+                f"{f'chunks of {chunk:,}':<18}{result.accounts_per_second:>12,.0f} accounts/s"
+                f"  ({result.elapsed:.1f} s for all, {result.accounts_per_second / baseline:.0f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from backend.database import BankDatabase
+from backend.message_search import MessageSearchService
+
+from .seed import seed_accounts
+
+WORDS = (
+    "за аренду квартиры обед кофе подарок долг возврат такси билеты кино ужин продукты "
+    "ремонт машины коммуналка интернет телефон детский сад школа кружок секция бассейн "
+    "спасибо с днём рождения на свадьбу отпуск гостиница бронь заказ счёт оплата услуги "
+    "доставка курьер маме папе сестре брату другу коллеге на хозяйство бензин штраф"
+).split()
+QUERIES = (
+    ("frequent term", "аренду", False, 0),
+    ("two terms", "за аренду", False, 0),
+    ("rare term", "штраф бассейн", False, 0),
+    ("prefix", "бронь гост", True, 0),
+    ("deep page", "оплата", False, 10_000),
+)
+
+
+def message(rng: random.Random) -> str:
+    words = rng.sample(WORDS, rng.randint(1, 4))
+    if rng.random() < 0.3:
+        words.append(f"№{rng.randrange(10**6)}")
+    return " ".join(words)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="FTS5 message index: build time and query latency")
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--like", action="store_true", help="also time counting LIKE '%%term%%' matches")
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = BankDatabase(Path(tmp) / "bench.db")
+        database.initialize()
+        service = MessageSearchService(database)
+        accounts = [account_id for account_id, _card in seed_accounts(database, 1_000)]
+
+        started = time.perf_counter()
+        with database.connection() as conn:
+            # Bulk load without the per-row trigger; the index is built once below.
+            conn.execute("DROP TRIGGER trg_ledger_messages_insert")
+            for start in range(0, args.messages, args.chunk_size):
+                conn.executemany(
+                    """
+                    INSERT INTO ledger (account_id, counterparty_account_id, amount, message, created_at)
+                    VALUES (?, ?, ?, ?, '2024-06-01 12:00:00')
+                    """,
+                    (
+                        (*rng.sample(accounts, 2), rng.randrange(100, 1_000_000), message(rng))
+                        for _ in range(min(args.chunk_size, args.messages - start))
+                    ),
+                )
+        print(f"loaded {args.messages:,} messages in {time.perf_counter() - started:.1f} s")
+
+        started = time.perf_counter()
+        service.rebuild()
+        build = time.perf_counter() - started
+        database.initialize()  # puts the trigger back
+        print(f"index build: {build:.1f} s ({args.messages / build:,.0f} messages/s)")
+
+        print(f"{'query':<15}{'matches':>11}{'p50 ms':>9}{'max ms':>9}")
+        for name, text, prefix, offset in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                page = service.search(text, offset=offset, prefix=prefix)
+                timings.append(time.perf_counter() - started)
+            timings.sort()
+            print(f"{name:<15}{page.total:>11,}{timings[len(timings) // 2] * 1000:>9.1f}{timings[-1] * 1000:>9.1f}")
+
+        if args.like:
+            started = time.perf_counter()
+            with database.connection() as conn:
+                matches = conn.execute("SELECT COUNT(*) FROM ledger WHERE message LIKE '%аренду%'").fetchone()[0]
+            print(f"{'LIKE count':<15}{matches:>11,}{(time.perf_counter() - started) * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
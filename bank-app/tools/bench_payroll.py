@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from backend.database import BankDatabase
+from backend.payroll import PayrollService
+
+from .seed import seed_accounts
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Payroll batch transfer throughput")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = BankDatabase(Path(tmp) / "bench.db")
+        database.initialize()
+
+        started = time.perf_counter()
+        payer_id, _payer_card = seed_accounts(database, 1, balance=10**15, login_prefix="payer")[0]
+        recipients = seed_accounts(database, args.rows)
+        print(f"seeded {args.rows} recipients in {time.perf_counter() - started:.2f} s")
+
+        rows = [[card, f"{1000 + i % 5000}.{i % 100:02d}", "Зарплата"] for i, (_, card) in enumerate(recipients)]
+        result = PayrollService(database).run(payer_id, rows)
+        print(result.message)
+        if result.ok:
+            print(
+                f"{result.applied} rows in {result.elapsed:.2f} s "
+                f"({result.applied / result.elapsed:,.0f} rows/s)"
+            )
+        for error in result.errors[:10]:
+            print(f"  line {error.line}: {error.reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from backend.database import BankDatabase
+from backend.reconciliation import RANGE_SIZE, ReconciliationService
+
+from .seed import seed_accounts, seed_transfers
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Reconciliation scaling with worker count")
+    parser.add_argument("--accounts", type=int, default=200_000)
+    parser.add_argument("--transfers", type=int, default=1_000_000)
+    parser.add_argument("--range-size", type=int, default=RANGE_SIZE)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = BankDatabase(Path(tmp) / "bench.db")
+        database.initialize()
+        accounts = [account_id for account_id, _card in seed_accounts(database, args.accounts, balance=10_000_00)]
+        seed_transfers(database, accounts, args.transfers)
+        with database.connection() as conn:
+            conn.execute("UPDATE accounts SET balance = balance + 1 WHERE id = ?", (accounts[len(accounts) // 2],))
+
+        service = ReconciliationService(database)
+        baseline = None
+        workers = 1
+        while workers <= args.max_workers:
+            result = service.run(workers=workers, range_size=args.range_size)
+            baseline = baseline or result.elapsed
+            print(
+                f"{workers:>3} workers: {result.elapsed:6.2f} s, speedup {baseline / result.elapsed:4.1f}x, "
+                f"{len(result.mismatches)} mismatch(es)"
+            )
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
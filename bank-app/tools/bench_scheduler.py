@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from backend.database import BankDatabase
+from backend.scheduled_payments import DAILY, MONTHLY, TIME_FORMAT, WEEKLY, PaymentScheduler
+from backend.transfers import TransferService
+
+from .seed import seed_accounts
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Standing-order scheduler with many active schedules")
+    parser.add_argument("--schedules", type=int, default=1_000_000)
+    parser.add_argument("--due", type=int, default=5_000, help="schedules already due at start")
+    parser.add_argument("--accounts", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=30, help="spread of future next_run values")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = BankDatabase(Path(tmp) / "bench.db")
+        database.initialize()
+        accounts = seed_accounts(database, args.accounts, balance=10**12)
+        now = datetime.now().replace(microsecond=0)
+
+        def row(index: int) -> tuple:
+            (payer, _), (_, card) = rng.sample(accounts, 2)
+            if index < args.due:
+                at = now - timedelta(seconds=rng.randrange(1, 3600))
+            else:
+                at = now + timedelta(seconds=rng.randrange(60, args.days * 86400))
+            stamp = at.strftime(TIME_FORMAT)
+            return (payer, card, rng.randrange(100, 10_000_00), rng.choice((DAILY, WEEKLY, MONTHLY)), stamp, stamp)
+
+        started = time.perf_counter()
+        with database.connection() as conn:
+            conn.executemany(
+                """
+                INSERT INTO payment_schedules (
+                    payer_account_id, card_number, amount, message, interval, anchor, next_run, created_at
+                )
+                VALUES (?, ?, ?, 'Автоплатёж', ?, ?, ?, '2024-01-01 00:00:00')
+                """,
+                (row(index) for index in range(args.schedules)),
+            )
+            conn.execute("ANALYZE")
+        print(f"inserted {args.schedules:,} schedules in {time.perf_counter() - started:.1f} s")
+
+        horizon = (now + timedelta(hours=1)).strftime(TIME_FORMAT)
+        with database.connection() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT next_run, id FROM payment_schedules "
+                "WHERE active = 1 AND next_run < ? ORDER BY next_run, id LIMIT 10000",
+                (horizon,),
+            ).fetchall()
+            started = time.perf_counter()
+            conn.execute(
+                "SELECT COUNT(*) FROM payment_schedules NOT INDEXED WHERE active = 1 AND next_run < ?",
+                (horizon,),
+            ).fetchone()
+            scan = time.perf_counter() - started
+        print("refill plan: " + "; ".join(step[3] for step in plan))
+        print(f"same filter as a full scan: {scan * 1000:.1f} ms")
+
+        scheduler = PaymentScheduler(database, TransferService(database))
+        started = time.perf_counter()
+        with scheduler._wakeup:
+            scheduler._refill(now)
+        refill = time.perf_counter() - started
+        print(f"refill (next hour, {len(scheduler._heap):,} schedules): {refill * 1000:.1f} ms")
+
+        started = time.perf_counter()
+        runs = scheduler.run_due(now)
+        elapsed = time.perf_counter() - started
+        ok = sum(run.ok for run in runs)
+        print(f"catch-up: {len(runs):,} payments ({ok:,} ok) in {elapsed:.2f} s, {len(runs) / elapsed:,.0f}/s")
+
+        started = time.perf_counter()
+        idle = scheduler.run_due(now)
+        print(f"idle pass: {len(idle)} payments, {(time.perf_counter() - started) * 1e6:.0f} µs")
+        print(f"sleep until next due: {scheduler._seconds_until_next():.0f} s")
+
+
+if __name__ == "__main__":
+    main()
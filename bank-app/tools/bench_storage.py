@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from backend.database import BankDatabase
+from backend.storage import ACCOUNT_NUMBER, CARD_NUMBER, MemoryUserStore, SqliteUserStore, UserStore
+
+from .check_storage import new_user
+
+
+def timed(operation: Callable[[int], object], count: int) -> float:
+    started = time.perf_counter()
+    for index in range(count):
+        operation(index)
+    return (time.perf_counter() - started) / count
+
+
+def bench(store: UserStore, users: int, lookups: int, seed: int) -> dict[str, float]:
+    rng = random.Random(seed)
+    results = {"insert_user": timed(lambda i: store.insert_user(new_user(i + 1)), users)}
+    logins = [f"user{rng.randrange(1, users + 1)}" for _ in range(lookups)]
+    ids = [rng.randrange(1, users + 1) for _ in range(lookups)]
+    cards = [f"2200{rng.randrange(1, 2 * users):012d}" for _ in range(lookups)]
+    accounts = [f"40817{rng.randrange(1, 2 * users):015d}" for _ in range(lookups)]
+    results["profile_by_login"] = timed(lambda i: store.profile_by_login(logins[i]), lookups)
+    results["profile_by_id"] = timed(lambda i: store.profile_by_id(ids[i]), lookups)
+    results["number_exists"] = timed(
+        lambda i: store.number_exists(CARD_NUMBER, cards[i]) or store.number_exists(ACCOUNT_NUMBER, accounts[i]),
+        lookups,
+    )
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="UserStore engines: SQLite file vs in-memory dicts")
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = BankDatabase(Path(tmp) / "bench.db")
+        database.initialize()
+        sqlite = bench(SqliteUserStore(database), args.users, args.lookups, args.seed)
+    memory = bench(MemoryUserStore(), args.users, args.lookups, args.seed)
+
+    print(f"{'operation':<18}{'sqlite µs':>11}{'memory µs':>11}{'gap':>9}")
+    for operation, sqlite_time in sqlite.items():
+        memory_time = memory[operation]
+        print(
+            f"{operation:<18}{sqlite_time * 1e6:>11.1f}{memory_time * 1e6:>11.2f}"
+            f"{sqlite_time / memory_time:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
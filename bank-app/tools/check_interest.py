@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable
+
+from backend.archive import LedgerArchive
+from backend.database import BankDatabase
+from backend.interest import MESSAGE, InterestAccrual, InterestPolicy, accrue
+from backend.numpy_support import require_numpy
+from backend.rollups import RollupService
+
+from .checks import expect
+from .seed import seed_accounts, seed_transfers
+
+Check = Callable[[BankDatabase, Path], None]
+
+
+def _daily_stats(database: BankDatabase) -> list[tuple]:
+    with database.connection() as conn:
+        return [tuple(row) for row in conn.execute("SELECT * FROM daily_stats ORDER BY day")]
+
+
+def _credit_volume(database: BankDatabase) -> int:
+    with database.connection() as conn:
+        return conn.execute("SELECT COALESCE(SUM(credit_volume), 0) FROM daily_account_stats").fetchone()[0]
+
+
+def check_accrual_is_not_a_transfer(database: BankDatabase, _directory: Path) -> None:
+    accounts = [account_id for account_id, _card in seed_accounts(database, 200, balance=10_000_00)]
+    seed_transfers(database, accounts, 1_000, days=3)
+    before = _daily_stats(database)
+    credited_before = _credit_volume(database)
+
+    result = InterestAccrual(database).run()
+    expect(result.credited > 0, "nothing was credited")
+    expect(_daily_stats(database) == before, "the accrual changed daily_stats")
+    expect(
+        _credit_volume(database) - credited_before == result.credited,
+        "daily_account_stats does not show the interest credits",
+    )
+
+    RollupService(database).backfill()
+    expect(_daily_stats(database) == before, "backfill counts interest as transfers")
+
+
+def check_catch_up_uses_day_end_balance(database: BankDatabase, _directory: Path) -> None:
+    """Accruing yesterday this morning ignores the transfers made since midnight."""
+    yesterday = date.today() - timedelta(days=1)
+    if yesterday.month != date.today().month:
+        return  # yesterday's month is closed; check_closed_month covers it
+    accounts = [account_id for account_id, _card in seed_accounts(database, 200, balance=10_000_00)]
+    seed_transfers(database, accounts, 2_000, days=2)
+    day_end = f"{yesterday} 23:59:59"
+    with database.connection() as conn:
+        balances = dict(
+            conn.execute(
+                """
+                SELECT a.id, a.balance - COALESCE(SUM(l.amount), 0)
+                FROM accounts a
+                LEFT JOIN ledger l ON l.account_id = a.id AND l.created_at > ?
+                GROUP BY a.id
+                """,
+                (day_end,),
+            ).fetchall()
+        )
+        moved = conn.execute("SELECT COUNT(*) FROM ledger WHERE created_at > ?", (day_end,)).fetchone()[0]
+    expect(moved > 0, "no transfers after the day to ignore")
+
+    InterestAccrual(database).run(yesterday, chunk_size=64)
+
+    np = require_numpy("check_interest")
+    expected = accrue(np.array(list(balances.values()), dtype=np.int64), InterestPolicy())
+    with database.connection() as conn:
+        credited = dict(
+            conn.execute(
+                "SELECT account_id, amount FROM ledger WHERE message = ? AND created_at = ?",
+                (MESSAGE, day_end),
+            ).fetchall()
+        )
+    for account_id, amount in zip(balances, expected.tolist()):
+        expect(
+            credited.get(account_id, 0) == amount,
+            f"account {account_id}: accrued {credited.get(account_id, 0)}, end-of-day balance gives {amount}",
+        )
+
+
+def check_future_day(database: BankDatabase, _directory: Path) -> None:
+    _expect_refused(database, date.today() + timedelta(days=1), "has not come yet")
+
+
+def check_closed_month(database: BankDatabase, _directory: Path) -> None:
+    (account_id, _card), = seed_accounts(database, 1)
+    last_month = date.today().replace(day=1) - timedelta(days=1)
+    with database.connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO ledger (account_id, counterparty_account_id, amount, message, created_at)
+            VALUES (?, NULL, 100, '', ?)
+            """,
+            (account_id, f"{date.today()} 00:00:00"),
+        )
+    _expect_refused(database, last_month, "is closed")
+
+
+def check_archived_month(database: BankDatabase, directory: Path) -> None:
+    (account_id, _card), = seed_accounts(database, 1)
+    last_month = date.today().replace(day=1) - timedelta(days=1)
+    with database.connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO ledger (account_id, counterparty_account_id, amount, message, created_at)
+            VALUES (?, NULL, 100, '', ?)
+            """,
+            (account_id, f"{last_month.replace(day=1)} 12:00:00"),
+        )
+    LedgerArchive(database, directory / "archive").archive_period(last_month.strftime("%Y-%m"))
+    _expect_refused(database, last_month, "is archived")
+
+
+def _expect_refused(database: BankDatabase, day: date, reason: str) -> None:
+    try:
+        InterestAccrual(database).run(day)
+    except ValueError as exc:
+        expect(reason in str(exc), f"refused for another reason: {exc}")
+    else:
+        raise AssertionError(f"accrual for {day} accepted")
+    with database.connection() as conn:
+        runs = conn.execute("SELECT COUNT(*) FROM interest_runs").fetchone()[0]
+    expect(runs == 0, "a refused day left an interest_runs row")
+
+
+CHECKS: list[Check] = [
+    check_accrual_is_not_a_transfer,
+    check_catch_up_uses_day_end_balance,
+    check_future_day,
+    check_closed_month,
+    check_archived_month,
+]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Check interest accrual against rollups and archiving")
+    parser.parse_args(argv)
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for check in CHECKS:
+            directory = Path(tmp) / check.__name__
+            directory.mkdir()
+            database = BankDatabase(directory / "bank.db")
+            database.initialize()
+            try:
+                check(database, directory)
+            except AssertionError as exc:
+                failures += 1
+                print(f"FAIL {check.__name__}: {exc}")
+            else:
+                print(f"ok   {check.__name__}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from backend.database import BankDatabase
+from backend.limits import WINDOW_HOURS, TransferLimits, _Window, hour_of
+
+from .checks import expect
+
+START = datetime(2024, 1, 1)
+
+
+class _YieldingSlots(array):
+    """Hour slots that give up the GIL on every read, so a thread is preempted inside advance()."""
+
+    def __getitem__(self, index):
+        time.sleep(0)
+        return super().__getitem__(index)
+
+
+def check_two_threads(database: BankDatabase, steps: int, step: int, per_hour: int) -> None:
+    """Two threads reserve, release and read usage of one account while its window moves.
+
+    Each makes ``per_hour`` transfers of 1 kopeck every ``step`` hours
+    (plus one reservation of 5 that is released again),
+    and both move the window at the same moment; whatever the
+    interleaving, the window must end up holding exactly the transfers of
+    the last 24 hours.
+    """
+    limits = TransferLimits(database, daily_amount=10**12, daily_transfers=10**9)
+    window = limits._windows[1] = _Window(hour_of(START))
+    window.volumes = _YieldingSlots("q", window.volumes)
+    window.counts = _YieldingSlots("q", window.counts)
+    barrier = threading.Barrier(2)
+    errors: list[str] = []
+
+    def worker() -> None:
+        for hour in range(0, steps * step, step):
+            try:
+                barrier.wait()
+            except threading.BrokenBarrierError:
+                return  # the other thread has already failed
+            now = START + timedelta(hours=hour)
+            for _ in range(per_hour):
+                limits.reserve(1, 1, now)
+                limits.reserve(1, 5, now)
+                limits.release(1, 5, now)
+                volume, count = limits.usage(1, now)
+                if volume < 0 or count < 0:
+                    errors.append(f"hour {hour}: volume {volume}, count {count}")
+                    barrier.abort()
+                    return
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    expect(not errors, errors[0] if errors else "")
+    expect(window.volume == sum(window.volumes), f"volume {window.volume} != slots {sum(window.volumes)}")
+    expected = 2 * per_hour * min(steps, -(-WINDOW_HOURS // step))
+    volume, count = limits.usage(1, START + timedelta(hours=(steps - 1) * step))
+    expect((volume, count) == (expected, expected), f"usage {(volume, count)}, expected {expected}")
+
+
+def check_reserve_at_limit(database: BankDatabase, attempts: int) -> None:
+    """Two threads reserve for one account at once; exactly the limit gets through."""
+    limits = TransferLimits(database, daily_amount=10**12, daily_transfers=attempts // 2 + 1)
+    barrier = threading.Barrier(2)
+    accepted: list[int] = []
+
+    def worker() -> None:
+        barrier.wait()
+        accepted.append(sum(limits.reserve(1, 1, START) is None for _ in range(attempts)))
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    expect(sum(accepted) == limits.daily_transfers, f"{sum(accepted)} accepted, limit {limits.daily_transfers}")
+    expect(limits.usage(1, START) == (limits.daily_transfers,) * 2, f"usage {limits.usage(1, START)}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Check TransferLimits under concurrent use")
+    parser.add_argument("--steps", type=int, default=1_000)
+    parser.add_argument("--step", type=int, default=5, help="hours between rounds of transfers")
+    parser.add_argument("--per-hour", type=int, default=1)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        database = BankDatabase(Path(tmp) / "limits.db")
+        for round_number in range(args.rounds):
+            for name, check in (
+                ("two threads", lambda: check_two_threads(database, args.steps, args.step, args.per_hour)),
+                ("reserve at limit", lambda: check_reserve_at_limit(database, 10_000)),
+            ):
+                try:
+                    check()
+                except AssertionError as exc:
+                    failures += 1
+                    print(f"FAIL round {round_number} {name}: {exc}")
+                else:
+                    print(f"ok   round {round_number} {name}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+from backend.auth_service import AuthService
+from backend.database import BankDatabase
+from backend.storage import (
+    ACCOUNT_NUMBER,
+    CARD_NUMBER,
+    LOGIN,
+    DuplicateError,
+    MemoryUserStore,
+    NewUser,
+    SqliteUserStore,
+    UserStore,
+)
+
+from .checks import expect
+
+Check = Callable[[UserStore], None]
+
+
+def new_user(index: int, **changes: str) -> NewUser:
+    fields = {
+        "login": f"user{index}",
+        "first_name": "Тест",
+        "last_name": "Тестов",
+        "password_hash": "00$00",
+        "registered_at": "2024-01-01 00:00:00",
+        "account_number": f"40817{index:015d}",
+        "card_number": f"2200{index:012d}",
+    }
+    fields.update(changes)
+    return NewUser(**fields)
+
+
+def check_round_trip(store: UserStore) -> None:
+    created = store.insert_user(new_user(1))
+    expect(store.profile_by_login("user1") == created, "profile_by_login differs from insert_user")
+    expect(store.profile_by_id(created.user_id) == created, "profile_by_id differs from insert_user")
+    expect(
+        (created.login, created.account_number, created.card_number)
+        == ("user1", "40817000000000000001", "2200000000000001"),
+        f"stored {created}",
+    )
+
+
+def check_missing(store: UserStore) -> None:
+    expect(store.profile_by_login("nobody") is None, "unknown login found")
+    expect(store.profile_by_id(10**9) is None, "unknown id found")
+    expect(not store.number_exists(ACCOUNT_NUMBER, "40817000000000000001"), "account number exists in an empty store")
+    expect(not store.number_exists(CARD_NUMBER, "2200000000000001"), "card number exists in an empty store")
+
+
+def check_number_exists(store: UserStore) -> None:
+    store.insert_user(new_user(1))
+    expect(store.number_exists(ACCOUNT_NUMBER, "40817000000000000001"), "account number not found")
+    expect(store.number_exists(CARD_NUMBER, "2200000000000001"), "card number not found")
+    expect(not store.number_exists(CARD_NUMBER, "40817000000000000001"), "account number found among cards")
+
+
+def check_distinct_ids(store: UserStore) -> None:
+    first = store.insert_user(new_user(1))
+    second = store.insert_user(new_user(2))
+    expect(first.user_id != second.user_id, "user ids repeat")
+    expect(first.account_id != second.account_id, "account ids repeat")
+
+
+def _expect_duplicate(store: UserStore, user: NewUser, field: str) -> None:
+    try:
+        store.insert_user(user)
+    except DuplicateError as exc:
+        expect(exc.field == field, f"duplicate {field} reported as {exc.field}")
+    else:
+        raise AssertionError(f"duplicate {field} accepted")
+
+
+def check_duplicates_are_atomic(store: UserStore) -> None:
+    store.insert_user(new_user(1))
+    _expect_duplicate(store, new_user(2, login="user1"), LOGIN)
+    _expect_duplicate(store, new_user(2, account_number="40817000000000000001"), ACCOUNT_NUMBER)
+    _expect_duplicate(store, new_user(2, card_number="2200000000000001"), CARD_NUMBER)
+    # None of the rejected bundles may leave a partial user behind.
+    expect(store.profile_by_login("user2") is None, "rejected user left behind")
+    expect(not store.number_exists(ACCOUNT_NUMBER, "40817000000000000002"), "rejected account left behind")
+    expect(not store.number_exists(CARD_NUMBER, "2200000000000002"), "rejected card left behind")
+    store.insert_user(new_user(2))
+
+
+def check_auth_service(store: UserStore) -> None:
+    auth = AuthService(store=store)
+    auth.bootstrap()
+    expect(store.profile_by_login("demo") is not None, "bootstrap created no demo user")
+    expect(auth.register_user("alice", "Алиса", "Иванова", "secret").ok, "registration failed")
+    expect(not auth.register_user("alice", "Алиса", "Иванова", "secret").ok, "duplicate login registered")
+    result = auth.authenticate("alice", "secret")
+    expect(result.ok and result.user_id is not None, "right password rejected")
+    expect(not auth.authenticate("alice", "wrong").ok, "wrong password accepted")
+    expect(not auth.authenticate("bob", "secret").ok, "unknown login accepted")
+    expect(auth.resume(result.user_id).account_id == result.account_id, "resume returned another account")
+
+
+CHECKS: list[Check] = [
+    check_round_trip,
+    check_missing,
+    check_number_exists,
+    check_distinct_ids,
+    check_duplicates_are_atomic,
+    check_auth_service,
+]
+
+
+def sqlite_store(directory: Path, name: str) -> UserStore:
+    database = BankDatabase(directory / f"{name}.db")
+    database.initialize()
+    return SqliteUserStore(database)
+
+
+def run(engines: dict[str, Callable[[str], UserStore]]) -> int:
+    failures = 0
+    for engine, factory in engines.items():
+        for check in CHECKS:
+            try:
+                check(factory(check.__name__))
+            except AssertionError as exc:
+                failures += 1
+                print(f"FAIL {engine:<7}{check.__name__}: {exc}")
+            else:
+                print(f"ok   {engine:<7}{check.__name__}")
+    return failures
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the UserStore conformance checks against every engine")
+    parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        failures = run(
+            {
+                "sqlite": lambda name: sqlite_store(Path(tmp), name),
+                "memory": lambda _name: MemoryUserStore(),
+            }
+        )
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+from __future__ import annotations
+
+
+def expect(condition: bool, message: str) -> None:
+    """Fail a check_* script; unlike assert, this survives python -O."""
+    if not condition:
+        raise AssertionError(message)
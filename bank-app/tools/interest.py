@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import argparse
+from datetime import date
+from pathlib import Path
+
+from backend.database import BankDatabase
+from backend.interest import ANNUAL_RATE_BP, CHUNK_SIZE, OVERDRAFT_RATE_BP, InterestAccrual, InterestPolicy
+
+DEFAULT_DB = Path(__file__).resolve().parent.parent / "data" / "bank.db"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="End-of-day interest accrual")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="accrue one day; resumes an interrupted run of that day")
+    run.add_argument("--day", type=date.fromisoformat, default=None, help="YYYY-MM-DD, default today; must not be in a closed month")
+    run.add_argument("--rate-bp", type=int, default=ANNUAL_RATE_BP, help="annual rate on positive balances")
+    run.add_argument("--overdraft-bp", type=int, default=OVERDRAFT_RATE_BP, help="annual rate on negative balances")
+    run.add_argument("--min-balance", type=int, default=0, help="kopecks; smaller positive balances earn nothing")
+    run.add_argument("--chunk", type=int, default=CHUNK_SIZE, help="accounts per transaction")
+
+    commands.add_parser("status", help="show recent accrual days")
+    args = parser.parse_args(argv)
+
+    database = BankDatabase(args.db)
+    database.initialize()
+
+    if args.command == "status":
+        with database.connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT day, accounts, credited, charged, last_account_id, finished_at
+                FROM interest_runs
+                ORDER BY day DESC
+                LIMIT 14
+                """
+            ).fetchall()
+        for row in rows:
+            state = f"finished {row['finished_at']}" if row["finished_at"] else f"stopped after id {row['last_account_id']}"
+            print(
+                f"{row['day']}  {row['accounts']:>10,} accounts  +{row['credited'] / 100:,.2f} ₽"
+                f"  -{row['charged'] / 100:,.2f} ₽  {state}"
+            )
+        return
+
+    policy = InterestPolicy(args.rate_bp, args.overdraft_bp, args.min_balance)
+
+    def progress(done: int, total: int) -> None:
+        print(f"\r{done:,}/{total:,} accounts", end="", flush=True)
+
+    try:
+        result = InterestAccrual(database, policy).run(args.day, args.chunk, progress)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    if result.already_done:
+        print(f"{result.day} is already accrued")
+        return
+    resumed = f", resumed after account {result.resumed_from}" if result.resumed_from else ""
+    print(
+        f"\n{result.day}: {result.accounts:,} accounts in {result.elapsed:.1f} s "
+        f"({result.accounts_per_second:,.0f} accounts/s){resumed}; "
+        f"credited {result.credited / 100:,.2f} ₽, charged {result.charged / 100:,.2f} ₽"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import argparse
+import random
+import secrets
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import asdict
+from multiprocessing import Pool
+from pathlib import Path
+
+from backend.auth_service import AuthService
+from backend.database import BankDatabase, RetryPolicy
+from backend.transfers import TransferService
+
+from .seed import seed_accounts
+
+LOGIN_PASSWORD = "load-test-1"
+DEFAULT_MIX = "login=3,register=1,transfer=6"
+
+
+def parse_mix(text: str) -> dict[str, int]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("login", "register", "transfer"):
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def percentile(values: list[float], share: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def worker(
+    db_path: str,
+    index: int,
+    duration: float,
+    mix: dict[str, int],
+    logins: list[str],
+    accounts: list[tuple[int, str]],
+    retry: RetryPolicy,
+) -> dict:
+    database = BankDatabase(Path(db_path), retry=retry)
+    auth = AuthService(database)
+    transfers = TransferService(database)
+    rng = random.Random(secrets.randbits(32))
+    names, weights = list(mix), list(mix.values())
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    failures: dict[str, int] = defaultdict(int)
+    serial = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        operation = rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        try:
+            if operation == "login":
+                ok = auth.authenticate(rng.choice(logins), LOGIN_PASSWORD).ok
+            elif operation == "register":
+                serial += 1
+                ok = auth.register_user(f"load{index}_{serial}_{rng.randrange(10**9)}", "Нагрузка", "Тест", "x").ok
+            else:
+                (payer, _), (_, card) = rng.sample(accounts, 2)
+                ok = transfers.transfer(payer, card, f"{rng.randrange(1, 500)}.00").ok
+        except Exception:
+            ok = False
+        latencies[operation].append(time.perf_counter() - started)
+        if not ok:
+            failures[operation] += 1
+
+    return {
+        "latencies": dict(latencies),
+        "failures": dict(failures),
+        "retry": {name: asdict(counter) for name, counter in database.retry_stats().items()},
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Multi-process login/register/transfer load against one SQLite file")
+    parser.add_argument("--processes", default="1,2,4,8", help="comma-separated process counts to try")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per step")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX))
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--busy-timeout", type=float, default=RetryPolicy.busy_timeout)
+    parser.add_argument("--attempts", type=int, default=RetryPolicy.attempts)
+    args = parser.parse_args(argv)
+    retry = RetryPolicy(busy_timeout=args.busy_timeout, attempts=args.attempts)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "load.db"
+        database = BankDatabase(db_path)
+        database.initialize()
+        auth = AuthService(database)
+        logins = [f"login{i}" for i in range(8)]
+        for login in logins:
+            auth.register_user(login, "Нагрузка", "Тест", LOGIN_PASSWORD)
+        accounts = seed_accounts(database, args.accounts, balance=10**9, login_prefix="payer")
+
+        print(
+            f"{'procs':>5}{'ops/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'lock wait':>11}"
+            f"{'retries':>9}{'failed':>8}  per operation p99, ms"
+        )
+        for processes in (int(value) for value in args.processes.split(",")):
+            with Pool(processes) as pool:
+                results = pool.starmap(
+                    worker,
+                    [
+                        (str(db_path), index, args.duration, args.mix, logins, accounts, retry)
+                        for index in range(processes)
+                    ],
+                )
+
+            by_operation: dict[str, list[float]] = defaultdict(list)
+            failed = retries = 0
+            lock_wait = 0.0
+            for result in results:
+                for operation, values in result["latencies"].items():
+                    by_operation[operation].extend(values)
+                failed += sum(result["failures"].values())
+                for counter in result["retry"].values():
+                    retries += counter["retries"]
+                    lock_wait += counter["lock_wait"]
+            everything = [value for values in by_operation.values() for value in values]
+            per_operation = "  ".join(
+                f"{operation}={percentile(values, 0.99) * 1000:.0f}"
+                for operation, values in sorted(by_operation.items())
+            )
+            print(
+                f"{processes:>5}{len(everything) / args.duration:>9.0f}"
+                f"{percentile(everything, 0.5) * 1000:>9.1f}{percentile(everything, 0.99) * 1000:>9.1f}"
+                f"{lock_wait:>10.2f}s{retries:>9}{failed:>8}  {per_operation}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from backend.database import BankDatabase
+from backend.maintenance import DEFAULT_TASKS, TICK_SECONDS, MaintenanceScheduler, TaskRun
+
+DEFAULT_DB = Path(__file__).resolve().parent.parent / "data" / "bank.db"
+TASK_NAMES = [task.name for task in DEFAULT_TASKS]
+
+
+def print_runs(runs: list[TaskRun]) -> None:
+    for run in runs:
+        took = f" in {run.elapsed:.2f} s" if run.ran else ""
+        print(f"{run.task:<26}{run.result}{took}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="SQLite maintenance: ANALYZE, optimize, vacuum, checkpoints")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run due tasks once")
+    run.add_argument("--task", action="append", choices=TASK_NAMES, help="limit to these tasks")
+    run.add_argument("--force", action="store_true", help="ignore schedules, budgets and traffic")
+
+    watch = commands.add_parser("watch", help="keep running due tasks until interrupted")
+    watch.add_argument("--tick", type=float, default=TICK_SECONDS)
+
+    commands.add_parser("status", help="show last runs and free pages")
+    args = parser.parse_args(argv)
+
+    database = BankDatabase(args.db)
+    database.initialize()
+
+    if args.command == "status":
+        with database.connection(track=False) as conn:
+            rows = conn.execute("SELECT task, ran_at, elapsed, result FROM maintenance_runs ORDER BY task").fetchall()
+            auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+            free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            pages = conn.execute("PRAGMA page_count").fetchone()[0]
+        for row in rows:
+            print(f"{row['task']:<26}{row['ran_at']}  {row['elapsed']:.2f} s  {row['result']}")
+        modes = {0: "NONE", 1: "FULL", 2: "INCREMENTAL"}
+        print(f"auto_vacuum={modes.get(auto_vacuum, auto_vacuum)}, {free} of {pages} pages free")
+        return
+
+    if args.command == "run":
+        scheduler = MaintenanceScheduler(database)
+        only = set(args.task) if args.task else None
+        print_runs(scheduler.run_due(force=args.force, only=only))
+        return
+
+    scheduler = MaintenanceScheduler(database, tick=args.tick)
+    try:
+        while True:
+            print_runs(scheduler.run_due())
+            time.sleep(args.tick)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
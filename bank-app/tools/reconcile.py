@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from backend.database import BankDatabase
+from backend.reconciliation import RANGE_SIZE, ReconciliationService
+
+DEFAULT_DB = Path(__file__).resolve().parent.parent / "data" / "bank.db"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Check balances against ledger sums")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--range-size", type=int, default=RANGE_SIZE)
+    parser.add_argument("--show", type=int, default=20, help="mismatches to print")
+    args = parser.parse_args(argv)
+
+    database = BankDatabase(args.db)
+    database.initialize()
+
+    def progress(done: int, total: int) -> None:
+        share = done / total if total else 1.0
+        print(f"\r{done}/{total} accounts ({share:.0%})", end="", flush=True)
+
+    result = ReconciliationService(database).run(
+        workers=args.workers, range_size=args.range_size, progress=progress
+    )
+    print(
+        f"\nrun {result.run_id}: {result.accounts} accounts, {len(result.mismatches)} mismatches, "
+        f"{result.workers} workers, {result.elapsed:.2f} s"
+    )
+    for mismatch in result.mismatches[: args.show]:
+        print(
+            f"  account {mismatch.account_id}: balance {mismatch.balance}, "
+            f"ledger {mismatch.ledger_total} (diff {mismatch.difference}, ledger id ≤ {mismatch.ledger_id})"
+        )
+    if not result.ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from backend.auth_service import AuthService
+from backend.database import BankDatabase
+from backend.history import HistoryService
+from backend.recipients import RecipientService
+from backend.transfers import TransferService
+from backend.workload import (
+    HISTORY_COUNT,
+    HISTORY_PAGE,
+    LOGIN,
+    REGISTER,
+    SEARCH,
+    TRANSFER,
+    WorkloadEvent,
+    read_workload,
+)
+
+from .loadgen import percentile
+from .seed import seed_accounts, seed_transfers
+
+REPLAY_PASSWORD = "replay-1"
+TAKEN_LOGIN = "replay_taken"
+# Never issued: registered and seeded cards all start with 2200.
+UNKNOWN_CARD = "9999000000000007"
+
+
+def parse_speed(text: str) -> float:
+    if text == "original":
+        return 1.0
+    if text == "max":
+        return float("inf")
+    speed = float(text)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive")
+    return speed
+
+
+class Replayer:
+    """Re-creates the shape of a captured workload on a fresh database.
+
+    Every token in the log is mapped to a synthetic user, account or card,
+    so the same log always drives the same sequence of calls: logins that
+    failed use a wrong password, failed transfers go to an unknown card,
+    keyset history pages continue from the previous page of that account.
+    """
+
+    def __init__(self, database: BankDatabase, events: list[WorkloadEvent], seed: int, history_rows: int) -> None:
+        self.database = database
+        self.rng = random.Random(seed)
+        self.auth = AuthService(database)
+        self.transfers = TransferService(database)
+        self.history = HistoryService(database)
+        self.recipients = RecipientService(database)
+
+        registered = {event.args[0] for event in events if event.op == REGISTER and event.ok}
+        login_tokens = sorted({event.args[0] for event in events if event.op == LOGIN} - registered)
+        self.logins = {token: f"replay_{token.hex()}" for token in login_tokens}
+        for login in [TAKEN_LOGIN, *self.logins.values()]:
+            self.auth.register_user(login, "Повтор", "Нагрузки", REPLAY_PASSWORD)
+        for token in registered:
+            self.logins[token] = f"replay_{token.hex()}"
+
+        account_tokens = sorted(
+            {event.args[0] for event in events if event.op in (TRANSFER, HISTORY_COUNT, HISTORY_PAGE)}
+        )
+        card_tokens = sorted({event.args[1] for event in events if event.op == TRANSFER})
+        seeded = seed_accounts(
+            database, max(len(account_tokens) + len(card_tokens), 2), balance=10**12, login_prefix="replay"
+        )
+        self.accounts = {token: seeded[i][0] for i, token in enumerate(account_tokens)}
+        self.cards = {token: seeded[len(account_tokens) + i][1] for i, token in enumerate(card_tokens)}
+        self.card_pool = [card for _, card in seeded]
+        if self.accounts and history_rows:
+            ids = list(self.accounts.values()) + [account_id for account_id, _ in seeded[len(account_tokens) :]]
+            seed_transfers(database, ids, len(self.accounts) * history_rows // 2)
+        self.last_ids: dict[bytes, int | None] = {}
+        # Tokens whose REGISTER has been replayed; later logins go to that user.
+        self.created: set[bytes] = set()
+        self.serial = 0
+
+    def run(self, event: WorkloadEvent) -> bool:
+        if event.op == LOGIN:
+            return self.auth.authenticate(
+                self.logins[event.args[0]], REPLAY_PASSWORD if event.ok else REPLAY_PASSWORD + "x"
+            ).ok
+        if event.op == REGISTER:
+            token = event.args[0]
+            if not event.ok:
+                login = TAKEN_LOGIN
+            elif token not in self.created:
+                login = self.logins[token]
+                self.created.add(token)
+            else:
+                # Only possible across captures of different databases.
+                self.serial += 1
+                login = f"{self.logins[token]}_{self.serial}"
+            return self.auth.register_user(login, "Повтор", "Нагрузки", REPLAY_PASSWORD).ok
+        if event.op == TRANSFER:
+            account, card, amount, message_length = event.args
+            card_number = self.cards[card] if event.ok else UNKNOWN_CARD
+            amount_text = f"{amount / 100:.2f}" if amount else "abc"
+            return self.transfers.transfer(self.accounts[account], card_number, amount_text, "x" * message_length).ok
+        if event.op == HISTORY_COUNT:
+            self.history.count(self.accounts[event.args[0]])
+            return True
+        if event.op == HISTORY_PAGE:
+            account, offset, limit, keyset = event.args
+            before_id = self.last_ids.get(account) if keyset else None
+            rows = self.history.page(self.accounts[account], offset, limit, before_id)
+            self.last_ids[account] = rows[-1].id if rows else before_id
+            return True
+        if event.op == SEARCH:
+            (length,) = event.args
+            if event.ok:
+                query = self.rng.choice(self.card_pool)[: max(min(length, 16), 2)]
+            else:
+                query = UNKNOWN_CARD[: max(min(length, 16), 2)]
+            return bool(self.recipients.search(query))
+        raise ValueError(f"unknown operation {event.op!r}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay a workload log captured with main.py --capture")
+    parser.add_argument("log", type=Path)
+    parser.add_argument(
+        "--speed",
+        type=parse_speed,
+        default=1.0,
+        help="'original' keeps the captured timing, a number scales it, 'max' replays back to back",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed for the choices the log leaves open")
+    parser.add_argument("--history-rows", type=int, default=200, help="seeded ledger rows per replayed account")
+    args = parser.parse_args(argv)
+
+    events = list(read_workload(args.log))
+    if not events:
+        print("empty workload")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = BankDatabase(Path(tmp) / "replay.db")
+        database.initialize()
+        replayer = Replayer(database, events, args.seed, args.history_rows)
+
+        latencies: dict[str, list[float]] = defaultdict(list)
+        original: dict[str, list[float]] = defaultdict(list)
+        diverged: dict[str, int] = defaultdict(int)
+        max_lag = 0.0
+        started = time.perf_counter()
+        for event in events:
+            due = started + event.at / args.speed
+            now = time.perf_counter()
+            if due > now:
+                time.sleep(due - now)
+            elif args.speed != float("inf"):
+                max_lag = max(max_lag, now - due)
+            call_started = time.perf_counter()
+            ok = replayer.run(event)
+            latencies[event.op].append(time.perf_counter() - call_started)
+            original[event.op].append(event.latency)
+            if ok != event.ok:
+                diverged[event.op] += 1
+        elapsed = time.perf_counter() - started
+
+    print(
+        f"{'operation':<14}{'count':>7}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+        f"{'orig p50':>10}{'orig p99':>10}{'diverged':>10}"
+    )
+    for op, values in sorted(latencies.items()):
+        print(
+            f"{op:<14}{len(values):>7}"
+            f"{percentile(values, 0.5) * 1000:>9.2f}{percentile(values, 0.9) * 1000:>9.2f}"
+            f"{percentile(values, 0.99) * 1000:>9.2f}{max(values) * 1000:>9.2f}"
+            f"{percentile(original[op], 0.5) * 1000:>10.2f}{percentile(original[op], 0.99) * 1000:>10.2f}"
+            f"{diverged[op]:>10}"
+        )
+    print(
+        f"{len(events)} calls in {elapsed:.2f} s (captured over {events[-1].at:.2f} s), "
+        f"max schedule lag {max_lag * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
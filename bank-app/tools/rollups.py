@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from backend.archive import LedgerArchive
+from backend.database import BankDatabase
+from backend.rollups import BACKFILL_CHUNK, RollupService
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Daily rollup maintenance")
+    parser.add_argument("--db", type=Path, default=DATA_DIR / "bank.db")
+    parser.add_argument("--archive", type=Path, default=DATA_DIR / "archive")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser("backfill", help="rebuild rollups from users and ledger")
+    backfill.add_argument("--chunk", type=int, default=BACKFILL_CHUNK)
+
+    report = commands.add_parser("report", help="print daily totals")
+    report.add_argument("--days", type=int, default=14)
+
+    args = parser.parse_args(argv)
+    database = BankDatabase(args.db)
+    database.initialize()
+    service = RollupService(database, LedgerArchive(database, args.archive))
+
+    if args.command == "backfill":
+        started = time.perf_counter()
+
+        def progress(table: str, done: int, total: int) -> None:
+            print(f"\r{table}: {done}/{total}", end="", flush=True)
+
+        service.backfill(chunk_size=args.chunk, progress=progress)
+        print(f"\nbackfill finished in {time.perf_counter() - started:.2f} s")
+        return
+
+    last_day = date.today()
+    first_day = last_day - timedelta(days=args.days - 1)
+    print(f"{'day':<12}{'new users':>10}{'transfers':>11}{'volume, ₽':>16}")
+    for row in service.daily(first_day.isoformat(), last_day.isoformat()):
+        print(f"{row.day:<12}{row.new_users:>10}{row.transfers:>11}{row.volume / 100:>16,.2f}")
+
+
+if __name__ == "__main__":
+    main()
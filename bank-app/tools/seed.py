@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import random
+import secrets
+from collections import Counter
+from datetime import datetime, timedelta
+
+from backend.cards import luhn_check_digit
+from backend.database import BankDatabase
+
+# Synthetic users get a fixed, non-verifiable password hash: seeding millions
+# of accounts must not pay for PBKDF2.
+SEED_PASSWORD_HASH = "00$00"
+
+
+def seed_accounts(
+    database: BankDatabase,
+    count: int,
+    balance: int = 0,
+    login_prefix: str = "user",
+) -> list[tuple[int, str]]:
+    """Insert ``count`` users with accounts and Luhn-valid cards.
+
+    Returns ``(account_id, card_number)`` pairs in insertion order.
+    """
+    rng = random.Random(secrets.randbits(32))
+    registered = datetime(2024, 1, 1)
+    with database.connection() as conn:
+        start = conn.execute("SELECT COALESCE(MAX(id), 0) FROM users").fetchone()[0] + 1
+        account_start = conn.execute("SELECT COALESCE(MAX(id), 0) FROM accounts").fetchone()[0] + 1
+        existing = {row[0] for row in conn.execute("SELECT card_number FROM cards")}
+
+        cards: list[str] = []
+        while len(cards) < count:
+            body = "2200" + f"{rng.randrange(10**11):011d}"
+            number = body + luhn_check_digit(body)
+            if number not in existing:
+                existing.add(number)
+                cards.append(number)
+
+        conn.executemany(
+            """
+            INSERT INTO users (id, login, first_name, last_name, password_hash, registered_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                (
+                    start + i,
+                    f"{login_prefix}{start + i}",
+                    "Тест",
+                    "Тестов",
+                    SEED_PASSWORD_HASH,
+                    (registered + timedelta(minutes=7 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+                )
+                for i in range(count)
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO accounts (id, user_id, account_number, balance) VALUES (?, ?, ?, ?)",
+            (
+                (account_start + i, start + i, f"40817{account_start + i:015d}", balance)
+                for i in range(count)
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO cards (account_id, card_number) VALUES (?, ?)",
+            ((account_start + i, cards[i]) for i in range(count)),
+        )
+        if balance:
+            # Opening entries keep balance == SUM(ledger.amount) for reconciliation.
+            conn.executemany(
+                """
+                INSERT INTO ledger (account_id, counterparty_account_id, amount, message, created_at)
+                VALUES (?, NULL, ?, 'Начальный остаток', ?)
+                """,
+                (
+                    (account_start + i, balance, (registered + timedelta(minutes=7 * i)).strftime("%Y-%m-%d %H:%M:%S"))
+                    for i in range(count)
+                ),
+            )
+    return [(account_start + i, cards[i]) for i in range(count)]
+
+
+def seed_transfers(
+    database: BankDatabase,
+    account_ids: list[int],
+    count: int,
+    days: int = 365,
+    chunk_size: int = 50_000,
+) -> None:
+    """Insert ``count`` random transfers (a debit and a credit ledger row each).
+
+    Balances are moved by the net amounts, so they stay equal to the ledger
+    sums; overdrafts are not prevented.
+    """
+    rng = random.Random(secrets.randbits(32))
+    first_day = datetime.now() - timedelta(days=days)
+    span = days * 86400
+    moments = sorted(rng.randrange(span) for _ in range(count))
+    net: Counter[int] = Counter()
+    with database.connection() as conn:
+        for start in range(0, count, chunk_size):
+            rows = []
+            for offset in moments[start : start + chunk_size]:
+                payer, payee = rng.sample(account_ids, 2)
+                amount = rng.randrange(100, 5_000_000)
+                created_at = (first_day + timedelta(seconds=offset)).strftime("%Y-%m-%d %H:%M:%S")
+                rows.append((payer, payee, -amount, "Перевод", created_at))
+                rows.append((payee, payer, amount, "Перевод", created_at))
+                net[payer] -= amount
+                net[payee] += amount
+            conn.executemany(
+                """
+                INSERT INTO ledger (account_id, counterparty_account_id, amount, message, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+        conn.executemany(
+            "UPDATE accounts SET balance = balance + ? WHERE id = ?",
+            ((amount, account_id) for account_id, amount in net.items()),
+        )
@@ -1,23 +1,60 @@
 from __future__ import annotations
 
 from pathlib import Path
+import threading
 import tkinter as tk
-import webbrowser
+from contextlib import nullcontext
 from tkinter import font as tkfont
 from tkinter import messagebox
+from typing import TYPE_CHECKING, Callable, ContextManager, TypeVar
 
 from .assets import AssetLoader
-from backend import AuthService, Backend, BankDatabase
+from .draw import canvas_item_count
+from .lag_monitor import LagMonitor
 from .layout import Colors, Fonts, Layout
-from .menu_window import MenuWindow
-from .registration_window import RegistrationWindow
+from .profiling import PhaseTimer
+from .recipient_search import RecipientSearch
+from .toasts import ToastManager
+
+if TYPE_CHECKING:
+    from backend import (
+        AuthResult,
+        Backend,
+        LoginAuditTrail,
+        MaintenanceScheduler,
+        PaymentScheduler,
+        Recipient,
+    )
+    from .history_view import HistoryWindow
+    from .menu_window import MenuWindow
+    from .registration_window import RegistrationWindow
+
+T = TypeVar("T")
+
+SESSION_CLEANUP_MS = 30 * 60 * 1000
 
 
 class BankApp(tk.Tk):
     """Static bank window mockup based on fixed coordinates."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        timer: PhaseTimer | None = None,
+        startup_profile: bool = False,
+        lag_monitor: bool = False,
+        capture: Path | None = None,
+    ) -> None:
+        self.timer = timer or PhaseTimer()
+        self.startup_profile = startup_profile
+        self.capture = capture
         super().__init__()
+        self.timer.mark("tk_init")
+
+        self.lag_monitor: LagMonitor | None = None
+        if lag_monitor:
+            self.lag_monitor = LagMonitor(self)
+            self.lag_monitor.start()
+            self.bind_all("<F12>", lambda _e: print(self.lag_monitor.report(), flush=True))
         self.title("Уралсиб — макет")
         self.geometry("1200x740")
         self.minsize(1200, 740)
@@ -44,25 +81,23 @@ class BankApp(tk.Tk):
         )
 
         self._init_fonts()
-        self._entries: list[tk.Entry] = []
+        self.timer.mark("fonts")
+        self._entries: dict[str, tk.Entry] = {}
         self.login_entry: tk.Entry | None = None
         self.password_entry: tk.Entry | None = None
         self.registration_window: RegistrationWindow | None = None
         self.menu_window: MenuWindow | None = None
+        self.history_window: HistoryWindow | None = None
+        self.backend: Backend | None = None
+        self.maintenance: MaintenanceScheduler | None = None
+        self.payment_scheduler: PaymentScheduler | None = None
+        self.audit: LoginAuditTrail | None = None
+        self._bootstrap_thread: threading.Thread | None = None
+        self._bootstrap_error: Exception | None = None
+        self._restored_session: AuthResult | None = None
 
         asset_dir = Path(__file__).resolve().parent.parent / "asset"
-        self.assets = AssetLoader(asset_dir)
-        if not self.assets.can_load():
-            messagebox.showerror(
-                "Pillow не установлен",
-                "Для отображения изображений нужен пакет Pillow.\n"
-                "Установите: pip install pillow",
-            )
-
-        db_path = Path(__file__).resolve().parent.parent / "data" / "bank.db"
-        auth_service = AuthService(BankDatabase(db_path))
-        auth_service.bootstrap()
-        self.backend = Backend(auth_service)
+        self.assets = AssetLoader(asset_dir, timer=self.timer)
 
         self.canvas = tk.Canvas(
             self,
@@ -72,22 +107,179 @@ class BankApp(tk.Tk):
             highlightthickness=0,
         )
         self.canvas.pack(fill="both", expand=True)
+        self.toasts = ToastManager(self.canvas, self.colors, self.fonts)
 
-        layout = Layout(
+        self.layout = Layout(
             self.canvas,
             self.colors,
             self.fonts,
             self.assets,
-            self._open_adv_link,
-            self.backend.on_help,
-            self._open_menu_window,
-            self._on_login_click,
-            self._open_registration_window,
-            self.backend.on_transfer,
-            self.backend.on_remember_toggle,
+            self._tracked("open_adv_link", self._open_adv_link),
+            self._backend_action("on_help"),
+            self._tracked("open_menu_window", self._open_menu_window),
+            self._tracked("on_login_click", self._on_login_click),
+            self._tracked("open_registration_window", self._open_registration_window),
+            self._tracked("on_transfer_click", self._on_transfer_click),
+            self._tracked("on_remember_toggle", self._on_remember_toggle),
         )
-        layout.draw()
+        with self._measure("layout.draw"):
+            self.layout.draw()
         self._place_entries()
+        self._set_db_actions_enabled(False)
+        self.timer.mark("layout_drawn")
+        self._first_paint_bind = self.canvas.bind("<Expose>", self._on_first_expose, add="+")
+
+    def _on_first_expose(self, _event: tk.Event) -> None:
+        self.canvas.unbind("<Expose>", self._first_paint_bind)
+        # Canvas items are repainted from an idle handler queued by the expose,
+        # so everything past the first frame is started behind it.
+        self.after_idle(self._after_first_paint)
+
+    def _after_first_paint(self) -> None:
+        self.timer.mark("first_paint")
+        if not self.assets.can_load():
+            messagebox.showerror(
+                "Pillow не установлен",
+                "Для отображения изображений нужен пакет Pillow.\n"
+                "Установите: pip install pillow",
+            )
+        self._start_backend()
+
+    def _start_backend(self) -> None:
+        from backend import (
+            AuthService,
+            Backend,
+            BankDatabase,
+            HistoryService,
+            LedgerArchive,
+            LoginAuditTrail,
+            MaintenanceScheduler,
+            MessageSearchService,
+            PaymentScheduler,
+            RecipientService,
+            SessionService,
+            TransferLimits,
+            TransferService,
+            WorkloadRecorder,
+        )
+
+        self.timer.mark("backend_import")
+        data_dir = Path(__file__).resolve().parent.parent / "data"
+        database = BankDatabase(data_dir / "bank.db")
+        self.audit = LoginAuditTrail(database)
+        auth_service = AuthService(database, self.audit)
+        transfer_service = TransferService(database, TransferLimits(database))
+        self.payment_scheduler = PaymentScheduler(database, transfer_service)
+        self.backend = Backend(
+            auth_service,
+            history_service=HistoryService(database, LedgerArchive(database, data_dir / "archive")),
+            message_search=MessageSearchService(database),
+            recipient_service=RecipientService(database),
+            session_service=SessionService(
+                database, data_dir / "session.key", data_dir / "session.token"
+            ),
+            transfer_service=transfer_service,
+            payment_scheduler=self.payment_scheduler,
+            notifier=self.toasts,
+            recorder=WorkloadRecorder(self.capture) if self.capture is not None else None,
+        )
+
+        self.maintenance = MaintenanceScheduler(database)
+
+        self._bootstrap_thread = threading.Thread(
+            target=self._run_bootstrap,
+            args=(self.backend,),
+            name="db-bootstrap",
+            daemon=True,
+        )
+        self._bootstrap_thread.start()
+        self.after(20, self._poll_startup)
+
+    def _run_bootstrap(self, backend: Backend) -> None:
+        try:
+            backend.auth_service.bootstrap()
+            backend.cleanup_sessions()
+            backend.load_transfer_limits()
+            self._restored_session = backend.restore_session()
+        except Exception as exc:  # reported on the Tk thread
+            self._bootstrap_error = exc
+
+    def _poll_startup(self) -> None:
+        if self._bootstrap_thread is not None:
+            if self._bootstrap_thread.is_alive():
+                self.after(20, self._poll_startup)
+                return
+
+            self._bootstrap_thread = None
+            self.timer.mark("db_bootstrap")
+            if self._bootstrap_error is not None:
+                messagebox.showerror(
+                    "База данных",
+                    f"Не удалось подготовить базу данных:\n{self._bootstrap_error}",
+                )
+                return
+            self._set_db_actions_enabled(True)
+            self.after(SESSION_CLEANUP_MS, self._cleanup_sessions)
+            if self.maintenance is not None:
+                self.maintenance.start()
+            if self.audit is not None:
+                self.audit.start()
+            if self.payment_scheduler is not None:
+                self.payment_scheduler.start()
+            if self._restored_session is not None and self.backend is not None:
+                self._update_remember_check()
+                self.backend.on_session_restored(self._restored_session)
+
+        if self.assets.pending() > 0:
+            self.after(20, self._poll_startup)
+            return
+
+        self.timer.mark("startup_complete")
+        if self.startup_profile:
+            print(self.timer.report(), flush=True)
+            print(f"canvas items: {canvas_item_count(self)}", flush=True)
+        self.after_idle(self._prewarm_windows)
+
+    def _cleanup_sessions(self) -> None:
+        if self.backend is not None:
+            threading.Thread(
+                target=self.backend.cleanup_sessions, name="session-cleanup", daemon=True
+            ).start()
+        self.after(SESSION_CLEANUP_MS, self._cleanup_sessions)
+
+    def _on_remember_toggle(self) -> None:
+        if self.backend is None:
+            return
+        self.backend.on_remember_toggle()
+        self._update_remember_check()
+
+    def _update_remember_check(self) -> None:
+        checked = self.backend is not None and self.backend.remember_login
+        self.canvas.itemconfigure("remember_check", text="✓" if checked else "")
+
+    def _set_db_actions_enabled(self, enabled: bool) -> None:
+        # Disabled canvas items ignore their tag bindings, so clicks are dropped
+        # until the schema and demo user exist.
+        state = "normal" if enabled else "disabled"
+        for tag in ("login_btn", "register_btn", "transfer_btn"):
+            self.canvas.itemconfigure(tag, state=state)
+
+    def _backend_action(self, name: str) -> Callable[[], None]:
+        def run() -> None:
+            if self.backend is not None:
+                getattr(self.backend, name)()
+
+        return self._tracked(name, run)
+
+    def _tracked(self, name: str, callback: Callable[..., T]) -> Callable[..., T]:
+        if self.lag_monitor is None:
+            return callback
+        return self.lag_monitor.track(name, callback)
+
+    def _measure(self, name: str) -> ContextManager[None]:
+        if self.lag_monitor is None:
+            return nullcontext()
+        return self.lag_monitor.measure(name)
 
     def _init_fonts(self) -> None:
         try:
@@ -104,20 +296,26 @@ class BankApp(tk.Tk):
 
     def _place_entries(self) -> None:
         self._entries.clear()
-        self.login_entry = self._make_entry(42, 124, 315, 42)
-        self.password_entry = self._make_entry(42, 194, 315, 42, show="•")
-        self._entries.extend(
-            [
-                self.login_entry,
-                self.password_entry,
-                self._make_entry(444, 271, 312, 42),
-                self._make_entry(444, 341, 132, 42),
-                self._make_entry(624, 341, 132, 42),
-                self._make_entry(425, 490, 350, 42),
-                self._make_entry(425, 587, 350, 42),
-            ]
+        for spec in self.layout.entries:
+            self._entries[spec.name] = self._make_entry(
+                spec.x, spec.y, spec.width, spec.height, show=spec.show
+            )
+        self.login_entry = self._entries["login"]
+        self.password_entry = self._entries["password"]
+        self.recipient_search = RecipientSearch(
+            self._entries["card_number"],
+            self.colors,
+            self.fonts,
+            self._search_recipients,
         )
 
+    def _search_recipients(self, query: str) -> list[Recipient]:
+        # Runs on the search worker thread.
+        backend = self.backend
+        if backend is None:
+            return []
+        return backend.search_recipients(query)
+
     def _make_entry(
         self, x: int, y: int, width: int, height: int, show: str | None = None
     ) -> tk.Entry:
@@ -135,30 +333,60 @@ class BankApp(tk.Tk):
 
     @staticmethod
     def _open_adv_link(_event: tk.Event) -> None:
+        import webbrowser
+
         webbrowser.open("https://i.pinimg.com/originals/3c/94/2c/3c942c625b2177e2390920ee1e8ebfda.jpg")
 
     def _on_login_click(self) -> None:
+        if self.backend is None:
+            return
+
         if self.login_entry is None or self.password_entry is None:
             messagebox.showerror("Авторизация", "Поля логина и пароля не инициализированы.")
             return
 
         self.backend.on_login(self.login_entry.get(), self.password_entry.get())
 
-    def _open_registration_window(self) -> None:
-        if self.registration_window is not None and self.registration_window.winfo_exists():
-            self.registration_window.lift()
-            self.registration_window.focus_force()
+    def _on_transfer_click(self) -> None:
+        if self.backend is None:
             return
 
-        self.registration_window = RegistrationWindow(
-            master=self,
-            colors=self.colors,
-            fonts=self.fonts,
-            on_submit=self._submit_registration,
-        )
-        self.registration_window.protocol("WM_DELETE_WINDOW", self._close_registration_window)
+        entries = self._entries
+        if self.backend.on_transfer(
+            entries["card_number"].get(),
+            entries["amount"].get(),
+            entries["message"].get(),
+        ):
+            for name in ("amount", "message"):
+                entries[name].delete(0, "end")
+
+    def _prewarm_windows(self) -> None:
+        # Built hidden during idle time so the first open only has to map them.
+        self._ensure_registration_window()
+        self._ensure_menu_window()
+        self._ensure_history_window()
+        self.timer.mark("windows_prewarmed")
+
+    def _ensure_registration_window(self) -> RegistrationWindow:
+        if self.registration_window is None or not self.registration_window.winfo_exists():
+            from .registration_window import RegistrationWindow
+
+            self.registration_window = RegistrationWindow(
+                master=self,
+                colors=self.colors,
+                fonts=self.fonts,
+                on_submit=self._tracked("submit_registration", self._submit_registration),
+            )
+            self.registration_window.protocol("WM_DELETE_WINDOW", self._close_registration_window)
+        return self.registration_window
+
+    def _open_registration_window(self) -> None:
+        self._ensure_registration_window().show()
 
     def _submit_registration(self, data: dict[str, str]) -> bool:
+        if self.backend is None:
+            return False
+
         ok = self.backend.on_register_submit(
             login=data.get("login", ""),
             first_name=data.get("first_name", ""),
@@ -171,36 +399,69 @@ class BankApp(tk.Tk):
 
     def _close_registration_window(self) -> None:
         if self.registration_window is not None and self.registration_window.winfo_exists():
-            self.registration_window.destroy()
-        self.registration_window = None
+            self.registration_window.hide()
+
+    def _ensure_menu_window(self) -> MenuWindow:
+        if self.menu_window is None or not self.menu_window.winfo_exists():
+            from .menu_window import MenuWindow
+
+            self.menu_window = MenuWindow(
+                master=self,
+                colors=self.colors,
+                fonts=self.fonts,
+                on_profile=self._backend_action("on_profile"),
+                on_settings=self._backend_action("on_settings"),
+                on_security=self._backend_action("on_security"),
+                on_support=self._backend_action("on_support"),
+                on_logout=self._tracked("on_logout_click", self._on_logout_click),
+                on_history=self._tracked("open_history_window", self._open_history_window),
+            )
+            self.menu_window.protocol("WM_DELETE_WINDOW", self._close_menu_window)
+        return self.menu_window
 
     def _open_menu_window(self) -> None:
-        if self.menu_window is not None and self.menu_window.winfo_exists():
-            self.menu_window.lift()
-            self.menu_window.focus_force()
+        if self.backend is None:
             return
 
-        self.menu_window = MenuWindow(
-            master=self,
-            colors=self.colors,
-            fonts=self.fonts,
-            on_profile=self.backend.on_profile,
-            on_settings=self.backend.on_settings,
-            on_security=self.backend.on_security,
-            on_support=self.backend.on_support,
-            on_logout=self._on_logout_click,
+        self._ensure_menu_window().show()
+
+    def _ensure_history_window(self) -> HistoryWindow:
+        if self.history_window is None or not self.history_window.winfo_exists():
+            from .history_view import HistoryWindow
+
+            self.history_window = HistoryWindow(self, self.colors, self.fonts)
+            self.history_window.protocol("WM_DELETE_WINDOW", self._close_history_window)
+        return self.history_window
+
+    def _open_history_window(self) -> None:
+        if self.backend is None or self.backend.history_service is None:
+            return
+
+        account_id = self.backend.history_account()
+        if account_id is None:
+            return
+
+        # Only one popup can hold the grab at a time.
+        self._close_menu_window()
+        backend = self.backend
+        self._ensure_history_window().show_account(
+            lambda: backend.history_count(account_id),
+            lambda offset, limit, before_id: backend.history_page(account_id, offset, limit, before_id),
         )
-        self.menu_window.protocol("WM_DELETE_WINDOW", self._close_menu_window)
+
+    def _close_history_window(self) -> None:
+        if self.history_window is not None and self.history_window.winfo_exists():
+            self.history_window.hide()
 
     def _on_logout_click(self) -> None:
         if self.login_entry is not None:
             self.login_entry.delete(0, "end")
         if self.password_entry is not None:
             self.password_entry.delete(0, "end")
-        self.backend.on_logout()
+        if self.backend is not None:
+            self.backend.on_logout()
         self._close_menu_window()
 
     def _close_menu_window(self) -> None:
         if self.menu_window is not None and self.menu_window.winfo_exists():
-            self.menu_window.destroy()
-        self.menu_window = None
+            self.menu_window.hide()
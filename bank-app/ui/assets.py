@@ -1,23 +1,32 @@
 from __future__ import annotations
 
+import importlib.util
+import queue
+import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Optional
 
-try:
-    from PIL import Image, ImageOps, ImageTk
-except ImportError:  # pragma: no cover - runtime dependency check
-    Image = None
-    ImageOps = None
-    ImageTk = None
+from .profiling import PhaseTimer
+
+if TYPE_CHECKING:
+    from PIL import Image, ImageTk
 
 
 class AssetLoader:
-    def __init__(self, base_dir: Path) -> None:
+    def __init__(self, base_dir: Path, timer: PhaseTimer | None = None) -> None:
         self.base_dir = base_dir
+        self.timer = timer
         self.images: dict[str, ImageTk.PhotoImage] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._ready: queue.Queue = queue.Queue()
+        self._pending = 0
+        self._polling = False
 
     def can_load(self) -> bool:
-        return Image is not None and ImageTk is not None and ImageOps is not None
+        # Pillow is only imported once an image is actually decoded, which keeps
+        # it off the path to the first frame.
+        return importlib.util.find_spec("PIL") is not None
 
     def load_image(
         self,
@@ -27,6 +36,70 @@ class AssetLoader:
         height: int,
         fill: bool = False,
     ) -> Optional[ImageTk.PhotoImage]:
+        image = self._decode(filename, width, height, fill)
+        if image is None:
+            return None
+        return self._to_photo(key, image)
+
+    def load_image_async(
+        self,
+        widget: tk.Misc,
+        key: str,
+        filename: str,
+        width: int,
+        height: int,
+        callback: Callable[[Optional[ImageTk.PhotoImage]], None],
+        fill: bool = False,
+    ) -> None:
+        # Decoding and resizing run on a worker thread; the PhotoImage itself
+        # must be created on the Tk thread, so results are drained via after().
+        if not self.can_load():
+            callback(None)
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="assets")
+
+        future = self._executor.submit(self._decode, filename, width, height, fill)
+        future.add_done_callback(lambda f: self._ready.put((key, f, callback)))
+        self._pending += 1
+        if not self._polling:
+            self._polling = True
+            widget.after(10, self._poll, widget)
+
+    def pending(self) -> int:
+        return self._pending
+
+    def _poll(self, widget: tk.Misc) -> None:
+        while True:
+            try:
+                key, future, callback = self._ready.get_nowait()
+            except queue.Empty:
+                break
+
+            self._pending -= 1
+            image = self._result(future)
+            photo = self._to_photo(key, image) if image is not None else None
+            callback(photo)
+
+        if self._pending > 0:
+            widget.after(15, self._poll, widget)
+            return
+
+        self._polling = False
+        if self.timer is not None and self.timer.elapsed("assets_ready") is None:
+            self.timer.mark("assets_ready")
+
+    @staticmethod
+    def _result(future: Future) -> Optional[Image.Image]:
+        try:
+            return future.result()
+        except (OSError, ValueError):
+            return None
+
+    def _decode(
+        self, filename: str, width: int, height: int, fill: bool
+    ) -> Optional[Image.Image]:
         if not self.can_load():
             return None
 
@@ -34,12 +107,18 @@ class AssetLoader:
         if not path.exists():
             return None
 
+        from PIL import Image, ImageOps
+
         image = Image.open(path)
         if fill:
-            image = ImageOps.fit(image, (width, height), method=Image.LANCZOS)
-        else:
-            image = image.resize((width, height), Image.LANCZOS)
+            return ImageOps.fit(image, (width, height), method=Image.LANCZOS)
+        return image.resize((width, height), Image.LANCZOS)
+
+    def _to_photo(self, key: str, image: Image.Image) -> ImageTk.PhotoImage:
+        from PIL import ImageTk
 
         photo = ImageTk.PhotoImage(image)
         self.images[key] = photo
+        if self.timer is not None:
+            self.timer.mark(f"asset:{key}")
         return photo
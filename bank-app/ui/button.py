@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import tkinter as tk
+from typing import Callable
+
+from .draw import rounded_rect_points
+
+
+class RoundedButton(tk.Canvas):
+    """Rounded canvas button whose items are created once and only recolored."""
+
+    def __init__(
+        self,
+        parent: tk.Misc,
+        text: str,
+        command: Callable[[], None],
+        bg: str,
+        fill: str,
+        hover_fill: str,
+        text_fill: str,
+        font: tuple,
+        height: int,
+        radius: int = 12,
+    ) -> None:
+        super().__init__(
+            parent,
+            bg=bg,
+            highlightthickness=0,
+            bd=0,
+            cursor="hand2",
+            height=height,
+        )
+        self.command = command
+        self.fill = fill
+        self.hover_fill = hover_fill
+        self.radius = radius
+        self._size: tuple[int, int] | None = None
+        self._relayout_pending = False
+
+        self._shape = self.create_polygon(
+            rounded_rect_points(1, 1, 2, 2, radius),
+            smooth=True,
+            fill=fill,
+            outline=fill,
+            tags=("btn",),
+        )
+        self._label = self.create_text(
+            0, 0, text=text, fill=text_fill, font=font, tags=("btn",)
+        )
+
+        self.bind("<Configure>", self._on_configure)
+        self.bind("<Button-1>", lambda _e: self.command())
+        self.bind("<Enter>", lambda _e: self.set_hover(True))
+        self.bind("<Leave>", lambda _e: self.set_hover(False))
+
+    def set_hover(self, active: bool) -> None:
+        color = self.hover_fill if active else self.fill
+        self.itemconfigure(self._shape, fill=color, outline=color)
+
+    def _on_configure(self, _event: tk.Event) -> None:
+        # A burst of <Configure> events during geometry propagation collapses
+        # into one relayout on the next idle pass.
+        if self._relayout_pending:
+            return
+        self._relayout_pending = True
+        self.after_idle(self._relayout)
+
+    def _relayout(self) -> None:
+        self._relayout_pending = False
+        if not self.winfo_exists():
+            return
+
+        size = (max(self.winfo_width(), 2), max(self.winfo_height(), 2))
+        if size == self._size:
+            return
+
+        self._size = size
+        width, height = size
+        self.coords(self._shape, *rounded_rect_points(1, 1, width - 1, height - 1, self.radius))
+        self.coords(self._label, width // 2, height // 2)
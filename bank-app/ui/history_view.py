@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import queue
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .layout import Colors, Fonts
+from .popup import PopupWindow
+
+if TYPE_CHECKING:
+    from backend import HistoryEntry
+
+PAGE_SIZE = 100
+ROW_HEIGHT = 48
+CACHED_PAGES = 8
+
+CountFetcher = Callable[[], int]
+PageFetcher = Callable[[int, int, Optional[int]], "list[HistoryEntry]"]
+
+
+class HistoryView(tk.Frame):
+    """Scrollable history that keeps only the visible rows on its canvas.
+
+    A fixed pool of row slots is moved and re-labelled on scroll; pages of
+    PAGE_SIZE entries are fetched on a worker thread and kept in a small LRU.
+    """
+
+    def __init__(
+        self,
+        master: tk.Misc,
+        colors: Colors,
+        fonts: Fonts,
+        width: int,
+        height: int,
+    ) -> None:
+        super().__init__(master, bg=colors.content)
+        self.colors = colors
+        self.fonts = fonts
+        self.view_width = width
+        self.view_height = height
+
+        self.canvas = tk.Canvas(
+            self,
+            width=width,
+            height=height,
+            bg=colors.content,
+            highlightthickness=0,
+        )
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self._fetch_count: CountFetcher | None = None
+        self._fetch_page: PageFetcher | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._ready: queue.Queue = queue.Queue()
+        self._polling = False
+        self._generation = 0
+
+        self._total: int | None = None
+        self._top = 0
+        self._pages: OrderedDict[int, list[HistoryEntry]] = OrderedDict()
+        self._inflight: set[int] = set()
+
+        self._status = self.canvas.create_text(
+            width // 2,
+            height // 2,
+            text="",
+            fill=colors.text_dark,
+            font=fonts.small,
+        )
+        self._slots = [self._create_slot(index) for index in range(height // ROW_HEIGHT + 2)]
+
+        for widget in (self.canvas, self.scrollbar):
+            widget.bind("<MouseWheel>", self._on_wheel)
+            widget.bind("<Button-4>", lambda _e: self.scroll_by(-3 * ROW_HEIGHT))
+            widget.bind("<Button-5>", lambda _e: self.scroll_by(3 * ROW_HEIGHT))
+
+    def load(self, fetch_count: CountFetcher, fetch_page: PageFetcher) -> None:
+        self.reset()
+        self._fetch_count = fetch_count
+        self._fetch_page = fetch_page
+        self.canvas.itemconfigure(self._status, text="Загрузка…", state="normal")
+        self._submit("count", fetch_count)
+
+    def reset(self) -> None:
+        # Results of requests issued before a reset carry an old generation
+        # and are dropped when they arrive.
+        self._generation += 1
+        self._fetch_count = None
+        self._fetch_page = None
+        self._total = None
+        self._top = 0
+        self._pages.clear()
+        self._inflight.clear()
+        self.canvas.itemconfigure(self._status, text="", state="hidden")
+        self._render()
+
+    def scroll_by(self, pixels: int) -> None:
+        self._scroll_to(self._top + pixels)
+
+    def _create_slot(self, index: int) -> dict[str, int]:
+        y = index * ROW_HEIGHT
+        width = self.view_width
+        tag = f"slot{index}"
+        fill = self.colors.white if index % 2 == 0 else self.colors.input
+        slot = {
+            "y": y,
+            "bg": self.canvas.create_rectangle(
+                0, y, width, y + ROW_HEIGHT, fill=fill, outline="", tags=(tag,)
+            ),
+            "date": self.canvas.create_text(
+                12, y + 14, anchor="w", fill=self.colors.text_dark,
+                font=("Poppins", 10), tags=(tag,),
+            ),
+            "party": self.canvas.create_text(
+                12, y + 33, anchor="w", fill=self.colors.text_dark,
+                font=("Poppins", 11, "bold"), tags=(tag,),
+            ),
+            "message": self.canvas.create_text(
+                160, y + 33, anchor="w", fill=self.colors.text_dark,
+                font=("Poppins", 10), tags=(tag,),
+            ),
+            "amount": self.canvas.create_text(
+                width - 12, y + ROW_HEIGHT // 2, anchor="e", fill=self.colors.text_dark,
+                font=self.fonts.small, tags=(tag,),
+            ),
+        }
+        self.canvas.itemconfigure(tag, state="hidden")
+        return slot
+
+    def _content_height(self) -> int:
+        return (self._total or 0) * ROW_HEIGHT
+
+    def _scroll_to(self, top: int) -> None:
+        max_top = max(0, self._content_height() - self.view_height)
+        top = max(0, min(int(top), max_top))
+        if top == self._top:
+            return
+        self._top = top
+        self._render()
+
+    def _on_scrollbar(self, action: str, amount: str, unit: str | None = None) -> None:
+        if action == "moveto":
+            self._scroll_to(float(amount) * self._content_height())
+        elif action == "scroll":
+            step = ROW_HEIGHT if unit == "units" else self.view_height - ROW_HEIGHT
+            self.scroll_by(int(amount) * step)
+
+    def _on_wheel(self, event: tk.Event) -> None:
+        self.scroll_by(-3 * ROW_HEIGHT if event.delta > 0 else 3 * ROW_HEIGHT)
+
+    def _render(self) -> None:
+        total = self._total or 0
+        first = self._top // ROW_HEIGHT
+        shift = self._top % ROW_HEIGHT
+
+        for offset, slot in enumerate(self._slots):
+            tag = f"slot{offset}"
+            index = first + offset
+            if index >= total:
+                self.canvas.itemconfigure(tag, state="hidden")
+                continue
+
+            y = offset * ROW_HEIGHT - shift
+            if y != slot["y"]:
+                self.canvas.move(tag, 0, y - slot["y"])
+                slot["y"] = y
+
+            entry = self._entry(index)
+            if entry is None:
+                self._set_slot_text(slot, "…", "", "", "")
+            else:
+                self._set_slot_text(
+                    slot,
+                    entry.created_at,
+                    entry.counterparty,
+                    entry.message,
+                    _format_amount(entry.amount),
+                )
+            self.canvas.itemconfigure(tag, state="normal")
+
+        content = self._content_height()
+        if content <= self.view_height:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._top / content, (self._top + self.view_height) / content)
+
+        if total:
+            last = min(total - 1, first + len(self._slots) - 1)
+            self._prefetch(first // PAGE_SIZE, last // PAGE_SIZE)
+
+    def _set_slot_text(
+        self, slot: dict[str, int], date: str, party: str, message: str, amount: str
+    ) -> None:
+        self.canvas.itemconfigure(slot["date"], text=date)
+        self.canvas.itemconfigure(slot["party"], text=party)
+        self.canvas.itemconfigure(slot["message"], text=message[:40])
+        self.canvas.itemconfigure(slot["amount"], text=amount)
+
+    def _entry(self, index: int) -> HistoryEntry | None:
+        page_index, row = divmod(index, PAGE_SIZE)
+        page = self._pages.get(page_index)
+        if page is None or row >= len(page):
+            return None
+        self._pages.move_to_end(page_index)
+        return page[row]
+
+    def _prefetch(self, first_page: int, last_page: int) -> None:
+        # Visible pages first, then one page either side of the viewport.
+        last_available = max(0, ((self._total or 0) - 1) // PAGE_SIZE)
+        wanted = list(range(first_page, last_page + 1))
+        wanted += [first_page - 1, last_page + 1]
+        for page_index in wanted:
+            if 0 <= page_index <= last_available:
+                self._request_page(page_index)
+
+    def _request_page(self, page_index: int) -> None:
+        if page_index in self._pages or page_index in self._inflight:
+            return
+        if self._fetch_page is None:
+            return
+
+        previous = self._pages.get(page_index - 1)
+        before_id = previous[-1].id if previous and len(previous) == PAGE_SIZE else None
+        fetch_page = self._fetch_page
+        self._inflight.add(page_index)
+        self._submit(
+            ("page", page_index),
+            lambda: fetch_page(page_index * PAGE_SIZE, PAGE_SIZE, before_id),
+        )
+
+    def _submit(self, key: object, job: Callable[[], object]) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history")
+
+        generation = self._generation
+        future = self._executor.submit(job)
+        future.add_done_callback(lambda f: self._ready.put((generation, key, f)))
+        if not self._polling:
+            self._polling = True
+            self.after(15, self._poll)
+
+    def _poll(self) -> None:
+        changed = False
+        while True:
+            try:
+                generation, key, future = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._generation:
+                continue
+            changed |= self._apply(key, future)
+
+        if changed:
+            self._render()
+
+        if self._inflight or self._total is None and self._fetch_count is not None:
+            self.after(15, self._poll)
+        else:
+            self._polling = False
+
+    def _apply(self, key: object, future: Future) -> bool:
+        try:
+            result = future.result()
+        except Exception:
+            result = None
+
+        if key == "count":
+            self._total = int(result or 0)
+            if self._total:
+                self.canvas.itemconfigure(self._status, state="hidden")
+            else:
+                self.canvas.itemconfigure(
+                    self._status, text="Операций пока нет.", state="normal"
+                )
+            return True
+
+        _, page_index = key
+        self._inflight.discard(page_index)
+        if result is None:
+            return False
+        self._pages[page_index] = result
+        while len(self._pages) > CACHED_PAGES:
+            self._pages.popitem(last=False)
+        return True
+
+
+class HistoryWindow(PopupWindow):
+    def __init__(self, master: tk.Misc, colors: Colors, fonts: Fonts) -> None:
+        super().__init__(master, "История операций", 560, 560)
+        self.colors = colors
+        self.fonts = fonts
+        self.configure(bg=self.colors.content)
+
+        header = tk.Frame(self, bg=self.colors.header, height=72)
+        header.pack(fill="x")
+        header.pack_propagate(False)
+
+        tk.Label(
+            header,
+            text="ИСТОРИЯ ОПЕРАЦИЙ",
+            bg=self.colors.header,
+            fg=self.colors.text_light,
+            font=self.fonts.subtitle,
+        ).pack(pady=18)
+
+        self.view = HistoryView(self, colors, fonts, width=500, height=448)
+        self.view.pack(fill="both", expand=True, padx=20, pady=20)
+
+    def show_account(self, fetch_count: CountFetcher, fetch_page: PageFetcher) -> None:
+        self.show()
+        self.view.load(fetch_count, fetch_page)
+
+    def reset(self) -> None:
+        self.view.reset()
+
+
+def _format_amount(kopecks: int) -> str:
+    sign = "−" if kopecks < 0 else "+"
+    rubles, rest = divmod(abs(kopecks), 100)
+    return f"{sign}{rubles:,}".replace(",", " ") + f",{rest:02d} ₽"
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import time
+import tkinter as tk
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+BUCKET_EDGES_MS = (16, 50, 100, 250, 500, 1000)
+
+
+@dataclass
+class Stall:
+    at: float
+    lag_ms: float
+    callback: str | None
+
+
+@dataclass
+class CallbackStats:
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+class LagMonitor:
+    """Heartbeat on the Tk event loop; stalls are blamed on tracked callbacks."""
+
+    def __init__(self, widget: tk.Misc, interval_ms: int = 50, stall_ms: float = 50.0) -> None:
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.stall_ms = stall_ms
+        self.started = time.perf_counter()
+        self.beats = 0
+        self.buckets = [0] * (len(BUCKET_EDGES_MS) + 1)
+        self.max_lag_ms = 0.0
+        self.stalls: list[Stall] = []
+        self.callbacks: dict[str, CallbackStats] = {}
+        self._ran_since_beat: list[tuple[str, float]] = []
+        self._expected = 0.0
+        self._after_id: str | None = None
+
+    def start(self) -> None:
+        if self._after_id is not None:
+            return
+        self._expected = time.perf_counter() + self.interval_ms / 1000
+        self._after_id = self.widget.after(self.interval_ms, self._beat)
+
+    def stop(self) -> None:
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+
+    def track(self, name: str, callback: Callable[..., T]) -> Callable[..., T]:
+        def run(*args: object) -> T:
+            with self.measure(name):
+                return callback(*args)
+
+        return run
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - began) * 1000
+            stats = self.callbacks.setdefault(name, CallbackStats())
+            stats.calls += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            self._ran_since_beat.append((name, elapsed_ms))
+
+    def _beat(self) -> None:
+        now = time.perf_counter()
+        lag_ms = max(0.0, (now - self._expected) * 1000)
+        self._record(now, lag_ms)
+        self._expected = now + self.interval_ms / 1000
+        self._after_id = self.widget.after(self.interval_ms, self._beat)
+
+    def _record(self, now: float, lag_ms: float) -> None:
+        self.beats += 1
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        self.buckets[_bucket_index(lag_ms)] += 1
+
+        if lag_ms >= self.stall_ms:
+            culprit = None
+            if self._ran_since_beat:
+                culprit = max(self._ran_since_beat, key=lambda item: item[1])[0]
+            self.stalls.append(Stall(at=now - self.started, lag_ms=lag_ms, callback=culprit))
+        self._ran_since_beat.clear()
+
+    def histogram(self) -> dict[str, int]:
+        labels = []
+        lower = 0
+        for edge in BUCKET_EDGES_MS:
+            labels.append(f"{lower}-{edge}ms")
+            lower = edge
+        labels.append(f">={lower}ms")
+        return dict(zip(labels, self.buckets))
+
+    def as_dict(self) -> dict:
+        return {
+            "interval_ms": self.interval_ms,
+            "stall_ms": self.stall_ms,
+            "beats": self.beats,
+            "max_lag_ms": round(self.max_lag_ms, 2),
+            "histogram": self.histogram(),
+            "stalls": [asdict(stall) for stall in self.stalls],
+            "callbacks": {name: asdict(stats) for name, stats in self.callbacks.items()},
+        }
+
+    def dump(self, path: Path) -> None:
+        path.write_text(json.dumps(self.as_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def report(self) -> str:
+        lines = [
+            f"heartbeats: {self.beats} every {self.interval_ms} ms, max lag {self.max_lag_ms:.1f} ms",
+            "lag histogram:",
+        ]
+        for label, count in self.histogram().items():
+            lines.append(f"  {label:<12} {count}")
+
+        by_callback: dict[str, list[float]] = {}
+        for stall in self.stalls:
+            by_callback.setdefault(stall.callback or "<untracked>", []).append(stall.lag_ms)
+        lines.append(f"stalls >= {self.stall_ms:.0f} ms: {len(self.stalls)}")
+        for name, lags in sorted(by_callback.items(), key=lambda item: -max(item[1])):
+            lines.append(f"  {name:<24} {len(lags):>4}x  worst {max(lags):.1f} ms")
+        return "\n".join(lines)
+
+
+def _bucket_index(lag_ms: float) -> int:
+    for index, edge in enumerate(BUCKET_EDGES_MS):
+        if lag_ms < edge:
+            return index
+    return len(BUCKET_EDGES_MS)
@@ -5,7 +5,21 @@ from dataclasses import dataclass
 from typing import Callable
 
 from .assets import AssetLoader
-from .draw import place_image, rounded_rect
+from .screen import (
+    ClickTarget,
+    CompiledScreen,
+    DrawOp,
+    EntrySpec,
+    Line,
+    Picture,
+    Rect,
+    Region,
+    RoundRect,
+    ScreenSpec,
+    Text,
+    compile_screen,
+    region_tag,
+)
 
 
 @dataclass(frozen=True)
@@ -30,6 +44,105 @@ class Fonts:
     small: tuple
 
 
+MAIN_SCREEN = ScreenSpec(
+    regions=(
+        Region(
+            "background",
+            items=(
+                Rect(0, 0, 400, 740, fill="left", outline="left"),
+                Rect(400, 0, 1200, 740, fill="content", outline="content"),
+            ),
+        ),
+        Region(
+            "header",
+            items=(
+                Rect(0, 0, 1200, 80, fill="header", outline="header"),
+                Picture("logo", "logo.jpg", 0, 0, 355, 80, placeholder="header"),
+                Rect(1040, 14, 1090, 64, outline="text_light", tag="help_btn"),
+                Text(1065, 39, "?", "text_light", ("Poppins", 34, "bold"), tag="help_btn"),
+                Rect(
+                    1130, 14, 1180, 64, fill="header", outline="text_light", tag="menu_btn"
+                ),
+                Line(1140, 24, 1170, 24, "text_light", width=5, tag="menu_btn"),
+                Line(1140, 39, 1170, 39, "text_light", width=5, tag="menu_btn"),
+                Line(1140, 54, 1170, 54, "text_light", width=5, tag="menu_btn"),
+            ),
+            targets=(
+                ClickTarget("help_btn", "on_help"),
+                ClickTarget("menu_btn", "on_menu"),
+            ),
+        ),
+        Region(
+            "left",
+            items=(
+                RoundRect(38, 120, 361, 170, 10, "input"),
+                RoundRect(38, 190, 361, 240, 10, "input"),
+                Text(54, 145, "ЛОГИН", "white", "label", anchor="w"),
+                Text(54, 215, "ПАРОЛЬ", "white", "label", anchor="w"),
+                Text(38, 278, "Запомнить логин", "text_light", "label", anchor="w"),
+                Rect(331, 263, 361, 293, fill="left", outline="#EEE0E5", tag="remember_btn"),
+                Text(
+                    346, 278, "", "text_light", ("Poppins", 24, "bold"), tag="remember_check"
+                ),
+                RoundRect(38, 336, 361, 396, 10, "accent", tag="login_btn"),
+                Text(200, 366, "АВТОРИЗОВАТЬСЯ", "text_light", "label", tag="login_btn"),
+                Text(38, 451, "Это длинный текст перед..", "text_light", "small", anchor="w"),
+                Picture("man", "man.png", 331, 436, 30, 30, placeholder="left"),
+                RoundRect(38, 486, 361, 536, 10, "white", tag="register_btn"),
+                Text(200, 511, "ЗАРЕГИСТРИРОВАТЬСЯ", "text_dark", "medium", tag="register_btn"),
+            ),
+            entries=(
+                EntrySpec("login", 42, 124, 315, 42),
+                EntrySpec("password", 42, 194, 315, 42, show="•"),
+            ),
+            targets=(
+                ClickTarget("remember_btn", "on_remember_toggle"),
+                ClickTarget("remember_check", "on_remember_toggle"),
+                ClickTarget("login_btn", "on_login"),
+                ClickTarget("register_btn", "on_register"),
+            ),
+        ),
+        Region(
+            "main",
+            items=(
+                Text(410, 112, "УМНАЯ СИСТЕМА ПЕРЕВОДОВ", "text_dark", "title", anchor="w"),
+                Text(415, 145, "С ВНЕДРЕНИЕМ СОВРЕМЕННЫХ ИИ", "text_dark", "subtitle", anchor="w"),
+                Text(880, 112, "НАМ ДОВЕРЯЮТ", "text_dark", "title", anchor="w"),
+                RoundRect(420, 190, 780, 419, 16, "accent"),
+                Text(450, 236, "Уралсиб", "white", ("Poppins", 18, "bold"), anchor="w"),
+                Text(740, 236, "Business", "white", ("Poppins", 14, "bold"), anchor="e"),
+                RoundRect(440, 267, 760, 317, 10, "input"),
+                RoundRect(440, 337, 580, 387, 10, "input"),
+                RoundRect(620, 337, 760, 387, 10, "input"),
+                Text(451, 292, "НОМЕР КАРТЫ", "white", "label", anchor="w"),
+                Text(451, 362, "MM/ГГ", "white", "label", anchor="w"),
+                Text(631, 362, "CVC/CVV", "white", "label", anchor="w"),
+                Text(426, 470, "Сумма перевода", "text_dark", "small", anchor="w"),
+                RoundRect(421, 486, 779, 536, 10, "input", "accent", 1),
+                Text(426, 567, "Сообщение получателю", "text_dark", "small", anchor="w"),
+                RoundRect(421, 583, 779, 633, 10, "input", "accent", 1),
+                RoundRect(421, 653, 779, 713, 10, "accent", tag="transfer_btn"),
+                Text(600, 683, "ПЕРЕВЕСТИ", "text_light", "label", tag="transfer_btn"),
+                Rect(804, 138, 1182, 735, outline="accent", width=3),
+                Picture("adv", "adv.jpg", 807, 141, 372, 591, placeholder="content", fill=True),
+            ),
+            entries=(
+                EntrySpec("card_number", 444, 271, 312, 42),
+                EntrySpec("expiry", 444, 341, 132, 42),
+                EntrySpec("cvc", 624, 341, 132, 42),
+                EntrySpec("amount", 425, 490, 350, 42),
+                EntrySpec("message", 425, 587, 350, 42),
+            ),
+            targets=(
+                ClickTarget("transfer_btn", "on_transfer"),
+                # Bound by tag so the click target survives the placeholder-to-image swap.
+                ClickTarget("adv", "on_adv_click", pass_event=True),
+            ),
+        ),
+    )
+)
+
+
 class Layout:
     def __init__(
         self,
@@ -44,322 +157,104 @@ class Layout:
         on_register: Callable[[], None],
         on_transfer: Callable[[], None],
         on_remember_toggle: Callable[[], None],
+        spec: ScreenSpec = MAIN_SCREEN,
     ) -> None:
         self.canvas = canvas
         self.colors = colors
         self.fonts = fonts
         self.assets = assets
-        self.on_adv_click = on_adv_click
-        self.on_help = on_help
-        self.on_menu = on_menu
-        self.on_login = on_login
-        self.on_register = on_register
-        self.on_transfer = on_transfer
-        self.on_remember_toggle = on_remember_toggle
+        self.spec = spec
+        self.actions: dict[str, Callable] = {
+            "on_adv_click": on_adv_click,
+            "on_help": on_help,
+            "on_menu": on_menu,
+            "on_login": on_login,
+            "on_register": on_register,
+            "on_transfer": on_transfer,
+            "on_remember_toggle": on_remember_toggle,
+        }
+        self._compiled: CompiledScreen | None = None
 
-    def draw(self) -> None:
-        self._draw_background()
-        self._draw_header()
-        self._draw_left_panel()
-        self._draw_main_content()
+    @property
+    def compiled(self) -> CompiledScreen:
+        if self._compiled is None:
+            self._compiled = compile_screen(self.spec, self.colors, self.fonts)
+        return self._compiled
 
-    def _bind_clickable(self, tag: str, callback: Callable[[], None]) -> None:
-        self.canvas.tag_bind(tag, "<Button-1>", lambda _e: callback())
-        self.canvas.tag_bind(tag, "<Enter>", lambda _e: self.canvas.configure(cursor="hand2"))
-        self.canvas.tag_bind(tag, "<Leave>", lambda _e: self.canvas.configure(cursor=""))
+    @property
+    def entries(self) -> tuple[EntrySpec, ...]:
+        return self.spec.entries
 
-    def _draw_background(self) -> None:
-        self.canvas.create_rectangle(
-            0, 0, 400, 740, fill=self.colors.left, outline=self.colors.left
-        )
-        self.canvas.create_rectangle(
-            400, 0, 1200, 740, fill=self.colors.content, outline=self.colors.content
-        )
+    def draw(self) -> None:
+        compiled = self.compiled
+        for name in compiled.order:
+            self._replay(compiled.ops[name])
+        for target in self.spec.targets:
+            self._bind_target(target)
 
-    def _draw_header(self) -> None:
-        self.canvas.create_rectangle(
-            0, 0, 1200, 80, fill=self.colors.header, outline=self.colors.header
-        )
+    def redraw_region(self, name: str) -> None:
+        compiled = self.compiled
+        tag = region_tag(name)
+        self.canvas.delete(tag)
+        self._replay(compiled.ops[name])
 
-        logo = self.assets.load_image("logo", "logo.jpg", 355, 80)
-        place_image(self.canvas, logo, 0, 0)
+        # Keep the region at its original depth: just under the next region
+        # that is currently on the canvas.
+        following = compiled.order[compiled.order.index(name) + 1 :]
+        for next_name in following:
+            if self.canvas.find_withtag(region_tag(next_name)):
+                self.canvas.tag_lower(tag, region_tag(next_name))
+                break
 
-        self.canvas.create_rectangle(
-            1040,
-            14,
-            1090,
-            64,
-            outline=self.colors.text_light,
-            width=1,
-            tags=("help_btn",),
-        )
-        self.canvas.create_text(
-            1065,
-            39,
-            text="?",
-            fill=self.colors.text_light,
-            font=("Poppins", 34, "bold"),
-            tags=("help_btn",),
-        )
-        self._bind_clickable("help_btn", self.on_help)
+    def _replay(self, ops: tuple[DrawOp, ...]) -> None:
+        canvas = self.canvas
+        for op in ops:
+            if op.method == "picture":
+                self._place_picture(op.args[0], **op.options)
+                continue
+            getattr(canvas, op.method)(*op.args, **op.options)
 
-        self.canvas.create_rectangle(
-            1130,
-            14,
-            1180,
-            64,
-            outline=self.colors.text_light,
-            width=1,
-            fill=self.colors.header,
-            tags=("menu_btn",),
-        )
-        self.canvas.create_line(
-            1140,
-            24,
-            1170,
-            24,
-            fill=self.colors.text_light,
-            width=5,
-            tags=("menu_btn",),
-        )
-        self.canvas.create_line(
-            1140,
-            39,
-            1170,
-            39,
-            fill=self.colors.text_light,
-            width=5,
-            tags=("menu_btn",),
-        )
-        self.canvas.create_line(
-            1140,
-            54,
-            1170,
-            54,
-            fill=self.colors.text_light,
-            width=5,
-            tags=("menu_btn",),
-        )
-        self._bind_clickable("menu_btn", self.on_menu)
+    def _bind_target(self, target: ClickTarget) -> None:
+        callback = self.actions[target.action]
+        if target.pass_event:
+            self.canvas.tag_bind(target.tag, "<Button-1>", callback)
+        else:
+            self.canvas.tag_bind(target.tag, "<Button-1>", lambda _e: callback())
+        self.canvas.tag_bind(target.tag, "<Enter>", lambda _e: self.canvas.configure(cursor="hand2"))
+        self.canvas.tag_bind(target.tag, "<Leave>", lambda _e: self.canvas.configure(cursor=""))
 
-    def _draw_left_panel(self) -> None:
-        rounded_rect(self.canvas, 38, 120, 361, 170, 10, self.colors.input, "")
-        rounded_rect(self.canvas, 38, 190, 361, 240, 10, self.colors.input, "")
-
-        self.canvas.create_text(
-            54,
-            145,
-            text="ЛОГИН",
-            anchor="w",
-            fill=self.colors.white,
-            font=self.fonts.label,
-        )
-        self.canvas.create_text(
-            54,
-            215,
-            text="ПАРОЛЬ",
-            anchor="w",
-            fill=self.colors.white,
-            font=self.fonts.label,
-        )
-
-        self.canvas.create_text(
-            38,
-            278,
-            text="Запомнить логин",
-            anchor="w",
-            fill=self.colors.text_light,
-            font=self.fonts.label,
-        )
+    def _place_picture(self, picture: Picture, placeholder: str, tags: tuple[str, ...]) -> None:
+        key = picture.key
+        x, y = picture.x, picture.y
+        cached = self.assets.images.get(key)
+        if cached is not None:
+            self.canvas.create_image(x, y, image=cached, anchor="nw", tags=(*tags, key))
+            return
 
+        placeholder_tag = f"{key}_placeholder"
         self.canvas.create_rectangle(
-            331, 263, 361, 293, outline="#EEE0E5", width=1, tags=("remember_btn",)
-        )
-        self.canvas.create_text(
-            346,
-            278,
-            text="✓",
-            fill=self.colors.text_light,
-            font=("Poppins", 24, "bold"),
-            tags=("remember_btn",),
-        )
-        self._bind_clickable("remember_btn", self.on_remember_toggle)
-
-        rounded_rect(
-            self.canvas,
-            38,
-            336,
-            361,
-            396,
-            10,
-            self.colors.accent,
-            "",
-            tag="login_btn",
-        )
-        self.canvas.create_text(
-            200,
-            366,
-            text="АВТОРИЗОВАТЬСЯ",
-            fill=self.colors.text_light,
-            font=self.fonts.label,
-            tags=("login_btn",),
-        )
-        self._bind_clickable("login_btn", self.on_login)
+            x,
+            y,
+            x + picture.width,
+            y + picture.height,
+            fill=placeholder,
+            outline="",
+            tags=(*tags, key, placeholder_tag),
+        )
+        image_id = self.canvas.create_image(x, y, anchor="nw", tags=(*tags, key))
 
-        self.canvas.create_text(
-            38,
-            451,
-            text="Это длинный текст перед..",
-            anchor="w",
-            fill=self.colors.text_light,
-            font=self.fonts.small,
-        )
-        man = self.assets.load_image("man", "man.png", 30, 30)
-        place_image(self.canvas, man, 331, 436)
+        def swap(photo: tk.PhotoImage | None) -> None:
+            if photo is None or not self.canvas.winfo_exists():
+                return
+            self.canvas.itemconfigure(image_id, image=photo)
+            self.canvas.delete(placeholder_tag)
 
-        rounded_rect(
+        self.assets.load_image_async(
             self.canvas,
-            38,
-            486,
-            361,
-            536,
-            10,
-            self.colors.white,
-            "",
-            tag="register_btn",
-        )
-        self.canvas.create_text(
-            200,
-            511,
-            text="ЗАРЕГИСТРИРОВАТЬСЯ",
-            fill=self.colors.text_dark,
-            font=self.fonts.medium,
-            tags=("register_btn",),
-        )
-        self._bind_clickable("register_btn", self.on_register)
-
-    def _draw_main_content(self) -> None:
-        self.canvas.create_text(
-            410,
-            112,
-            text="УМНАЯ СИСТЕМА ПЕРЕВОДОВ",
-            anchor="w",
-            fill=self.colors.text_dark,
-            font=self.fonts.title,
-        )
-        self.canvas.create_text(
-            415,
-            145,
-            text="С ВНЕДРЕНИЕМ СОВРЕМЕННЫХ ИИ",
-            anchor="w",
-            fill=self.colors.text_dark,
-            font=self.fonts.subtitle,
-        )
-        self.canvas.create_text(
-            880,
-            112,
-            text="НАМ ДОВЕРЯЮТ",
-            anchor="w",
-            fill=self.colors.text_dark,
-            font=self.fonts.title,
-        )
-
-        rounded_rect(self.canvas, 420, 190, 780, 419, 16, self.colors.accent, "")
-        self.canvas.create_text(
-            450,
-            236,
-            text="Уралсиб",
-            anchor="w",
-            fill=self.colors.white,
-            font=("Poppins", 18, "bold"),
-        )
-        self.canvas.create_text(
-            740,
-            236,
-            text="Business",
-            anchor="e",
-            fill=self.colors.white,
-            font=("Poppins", 14, "bold"),
-        )
-
-        rounded_rect(self.canvas, 440, 267, 760, 317, 10, self.colors.input, "")
-        rounded_rect(self.canvas, 440, 337, 580, 387, 10, self.colors.input, "")
-        rounded_rect(self.canvas, 620, 337, 760, 387, 10, self.colors.input, "")
-
-        self.canvas.create_text(
-            451,
-            292,
-            text="НОМЕР КАРТЫ",
-            anchor="w",
-            fill=self.colors.white,
-            font=self.fonts.label,
+            key,
+            picture.filename,
+            picture.width,
+            picture.height,
+            swap,
+            fill=picture.fill,
         )
-        self.canvas.create_text(
-            451,
-            362,
-            text="MM/ГГ",
-            anchor="w",
-            fill=self.colors.white,
-            font=self.fonts.label,
-        )
-        self.canvas.create_text(
-            631,
-            362,
-            text="CVC/CVV",
-            anchor="w",
-            fill=self.colors.white,
-            font=self.fonts.label,
-        )
-
-        self.canvas.create_text(
-            426,
-            470,
-            text="Сумма перевода",
-            anchor="w",
-            fill=self.colors.text_dark,
-            font=self.fonts.small,
-        )
-        rounded_rect(
-            self.canvas, 421, 486, 779, 536, 10, self.colors.input, self.colors.accent, 1
-        )
-
-        self.canvas.create_text(
-            426,
-            567,
-            text="Сообщение получателю",
-            anchor="w",
-            fill=self.colors.text_dark,
-            font=self.fonts.small,
-        )
-        rounded_rect(
-            self.canvas, 421, 583, 779, 633, 10, self.colors.input, self.colors.accent, 1
-        )
-
-        rounded_rect(
-            self.canvas,
-            421,
-            653,
-            779,
-            713,
-            10,
-            self.colors.accent,
-            "",
-            tag="transfer_btn",
-        )
-        self.canvas.create_text(
-            600,
-            683,
-            text="ПЕРЕВЕСТИ",
-            fill=self.colors.text_light,
-            font=self.fonts.label,
-            tags=("transfer_btn",),
-        )
-        self._bind_clickable("transfer_btn", self.on_transfer)
-
-        self.canvas.create_rectangle(804, 138, 1182, 735, outline=self.colors.accent, width=3)
-        adv = self.assets.load_image("adv", "adv.jpg", 372, 591, fill=True)
-        adv_id = place_image(self.canvas, adv, 807, 141)
-        if adv_id is not None:
-            self.canvas.tag_bind(adv_id, "<Button-1>", self.on_adv_click)
-            self.canvas.tag_bind(adv_id, "<Enter>", lambda _e: self.canvas.configure(cursor="hand2"))
-            self.canvas.tag_bind(adv_id, "<Leave>", lambda _e: self.canvas.configure(cursor=""))
@@ -3,11 +3,12 @@ from __future__ import annotations
 import tkinter as tk
 from typing import Callable
 
-from .draw import rounded_rect
+from .button import RoundedButton
 from .layout import Colors, Fonts
+from .popup import PopupWindow
 
 
-class MenuWindow(tk.Toplevel):
+class MenuWindow(PopupWindow):
     def __init__(
         self,
         master: tk.Misc,
@@ -18,18 +19,15 @@ class MenuWindow(tk.Toplevel):
         on_security: Callable[[], None],
         on_support: Callable[[], None],
         on_logout: Callable[[], None],
+        on_history: Callable[[], None],
     ) -> None:
-        super().__init__(master)
+        super().__init__(master, "Меню", 360, 452)
         self.colors = colors
         self.fonts = fonts
         self._accent_hover = "#331772"
+        self._buttons: list[RoundedButton] = []
 
-        self.title("Меню")
-        self.geometry("360x390")
-        self.resizable(False, False)
         self.configure(bg=self.colors.content)
-        self.transient(master)
-        self.grab_set()
 
         self._build_ui(
             on_profile=on_profile,
@@ -37,8 +35,14 @@ class MenuWindow(tk.Toplevel):
             on_security=on_security,
             on_support=on_support,
             on_logout=on_logout,
+            on_history=on_history,
         )
-        self._center_over_master(master)
+
+    def reset(self) -> None:
+        # The window may have been hidden while a button was hovered, in which
+        # case <Leave> never arrived.
+        for button in self._buttons:
+            button.set_hover(False)
 
     def _build_ui(
         self,
@@ -47,6 +51,7 @@ class MenuWindow(tk.Toplevel):
         on_security: Callable[[], None],
         on_support: Callable[[], None],
         on_logout: Callable[[], None],
+        on_history: Callable[[], None],
     ) -> None:
         header = tk.Frame(self, bg=self.colors.header, height=72)
         header.pack(fill="x")
@@ -64,76 +69,23 @@ class MenuWindow(tk.Toplevel):
         body.pack(fill="both", expand=True, padx=20, pady=16)
 
         self._menu_button(body, "ПРОФИЛЬ", on_profile).pack(fill="x", pady=(0, 10))
+        self._menu_button(body, "ИСТОРИЯ", on_history).pack(fill="x", pady=(0, 10))
         self._menu_button(body, "НАСТРОЙКИ", on_settings).pack(fill="x", pady=(0, 10))
         self._menu_button(body, "БЕЗОПАСНОСТЬ", on_security).pack(fill="x", pady=(0, 10))
         self._menu_button(body, "ПОДДЕРЖКА", on_support).pack(fill="x", pady=(0, 10))
         self._menu_button(body, "ВЫХОД", on_logout).pack(fill="x")
 
-    def _menu_button(self, parent: tk.Misc, text: str, command: Callable[[], None]) -> tk.Canvas:
-        button = tk.Canvas(
+    def _menu_button(self, parent: tk.Misc, text: str, command: Callable[[], None]) -> RoundedButton:
+        button = RoundedButton(
             parent,
+            text=text,
+            command=command,
             bg=self.colors.content,
-            highlightthickness=0,
-            bd=0,
-            cursor="hand2",
+            fill=self.colors.accent,
+            hover_fill=self._accent_hover,
+            text_fill=self.colors.text_light,
+            font=self.fonts.small,
             height=52,
         )
-
-        hover = {"active": False}
-
-        def redraw(_event: tk.Event | None = None) -> None:
-            button.delete("btn")
-            width = max(button.winfo_width(), 2)
-            height = max(button.winfo_height(), 2)
-            fill = self._accent_hover if hover["active"] else self.colors.accent
-            rounded_rect(
-                button,
-                1,
-                1,
-                width - 1,
-                height - 1,
-                radius=12,
-                fill=fill,
-                outline="",
-                tag="btn",
-            )
-            button.create_text(
-                width // 2,
-                height // 2,
-                text=text,
-                fill=self.colors.text_light,
-                font=self.fonts.small,
-                tags=("btn",),
-            )
-
-        def on_click(_event: tk.Event) -> None:
-            command()
-
-        def on_enter(_event: tk.Event) -> None:
-            hover["active"] = True
-            redraw()
-
-        def on_leave(_event: tk.Event) -> None:
-            hover["active"] = False
-            redraw()
-
-        button.bind("<Configure>", redraw)
-        button.bind("<Button-1>", on_click)
-        button.bind("<Enter>", on_enter)
-        button.bind("<Leave>", on_leave)
-
+        self._buttons.append(button)
         return button
-
-    def _center_over_master(self, master: tk.Misc) -> None:
-        self.update_idletasks()
-        width = self.winfo_width()
-        height = self.winfo_height()
-
-        master_x = master.winfo_rootx()
-        master_y = master.winfo_rooty()
-        master_w = master.winfo_width()
-        master_h = master.winfo_height()
-
-        x = master_x + (master_w - width) // 2
-        y = master_y + (master_h - height) // 2
-        self.geometry(f"{width}x{height}+{max(x, 0)}+{max(y, 0)}")
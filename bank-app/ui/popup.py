@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import tkinter as tk
+
+
+class PopupWindow(tk.Toplevel):
+    """Modal Toplevel that is built once and then shown or hidden on demand."""
+
+    def __init__(self, master: tk.Misc, title: str, width: int, height: int) -> None:
+        super().__init__(master)
+        # Stay hidden while the widget tree is built; show() maps the window.
+        self.withdraw()
+        self._master = master
+        self._size = (width, height)
+
+        self.title(title)
+        self.geometry(f"{width}x{height}")
+        self.resizable(False, False)
+        self.transient(master)
+
+    def is_shown(self) -> bool:
+        return self.state() != "withdrawn"
+
+    def show(self) -> None:
+        if self.is_shown():
+            self.lift()
+            self.focus_force()
+            return
+
+        self.reset()
+        self._center_over_master()
+        self.deiconify()
+        # The grab can only be taken once the window is viewable.
+        self.wait_visibility()
+        self.grab_set()
+        self.focus_force()
+        self.on_shown()
+
+    def hide(self) -> None:
+        self.grab_release()
+        self.withdraw()
+
+    def reset(self) -> None:
+        """Return the form to its initial state before each show."""
+
+    def on_shown(self) -> None:
+        """Hook run after the window is visible and holds the grab."""
+
+    def _center_over_master(self) -> None:
+        master = self._master
+        width, height = self._size
+
+        master_x = master.winfo_rootx()
+        master_y = master.winfo_rooty()
+        master_w = master.winfo_width()
+        master_h = master.winfo_height()
+
+        x = master_x + (master_w - width) // 2
+        y = master_y + (master_h - height) // 2
+        self.geometry(f"{width}x{height}+{max(x, 0)}+{max(y, 0)}")
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import time
+
+
+class PhaseTimer:
+    """Collects named timestamps relative to window construction."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.marks: list[tuple[str, float]] = []
+
+    def mark(self, name: str) -> float:
+        elapsed = time.perf_counter() - self.started
+        self.marks.append((name, elapsed))
+        return elapsed
+
+    def elapsed(self, name: str) -> float | None:
+        for mark_name, value in self.marks:
+            if mark_name == name:
+                return value
+        return None
+
+    def report(self) -> str:
+        lines = []
+        previous = 0.0
+        for name, value in self.marks:
+            lines.append(f"{name:<24} {value * 1000:9.1f} ms  (+{(value - previous) * 1000:.1f} ms)")
+            previous = value
+        return "\n".join(lines)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import queue
+import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable
+
+from .layout import Colors, Fonts
+
+if TYPE_CHECKING:
+    from backend import Recipient
+
+DEBOUNCE_MS = 180
+
+
+class RecipientSearch:
+    """Search-as-you-type dropdown attached to the card number entry.
+
+    Keystrokes are debounced, lookups run on a single worker thread and only
+    the answer to the latest query is shown.
+    """
+
+    def __init__(
+        self,
+        entry: tk.Entry,
+        colors: Colors,
+        fonts: Fonts,
+        lookup: Callable[[str], list[Recipient]],
+    ) -> None:
+        self.entry = entry
+        self.lookup = lookup
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recipients")
+        self._ready: queue.Queue = queue.Queue()
+        self._debounce_id: str | None = None
+        self._pending: Future | None = None
+        self._poll_id: str | None = None
+        self._seq = 0
+        self._results: list[Recipient] = []
+
+        self.listbox = tk.Listbox(
+            entry.master,
+            bg=colors.white,
+            fg=colors.input_text,
+            selectbackground=colors.accent,
+            selectforeground=colors.text_light,
+            font=("Poppins", 12),
+            relief="flat",
+            highlightthickness=1,
+            highlightbackground=colors.accent,
+            activestyle="none",
+        )
+
+        entry.bind("<KeyRelease>", self._on_key, add="+")
+        entry.bind("<Down>", self._focus_list, add="+")
+        entry.bind("<Escape>", lambda _e: self.hide(), add="+")
+        entry.bind("<FocusOut>", lambda _e: entry.after(150, self._hide_unless_focused), add="+")
+        self.listbox.bind("<ButtonRelease-1>", self._choose)
+        self.listbox.bind("<Return>", self._choose)
+        self.listbox.bind("<Escape>", lambda _e: self.hide())
+
+    def hide(self) -> None:
+        self.listbox.place_forget()
+
+    def _on_key(self, event: tk.Event) -> None:
+        if event.keysym in ("Down", "Up", "Escape", "Return", "Tab"):
+            return
+        if self._debounce_id is not None:
+            self.entry.after_cancel(self._debounce_id)
+        self._debounce_id = self.entry.after(DEBOUNCE_MS, self._start_lookup)
+
+    def _start_lookup(self) -> None:
+        self._debounce_id = None
+        query = self.entry.get().strip()
+        self._seq += 1
+        seq = self._seq
+
+        # A lookup still waiting in the executor queue is cancelled outright;
+        # one already running finishes, but its stale result is ignored.
+        if self._pending is not None:
+            self._pending.cancel()
+
+        if len(query.replace(" ", "")) < 2:
+            self._pending = None
+            self.hide()
+            return
+
+        self._pending = self._executor.submit(self.lookup, query)
+        self._pending.add_done_callback(lambda f: self._ready.put((seq, f)))
+        if self._poll_id is None:
+            self._poll_id = self.entry.after(10, self._poll)
+
+    def _poll(self) -> None:
+        self._poll_id = None
+        while True:
+            try:
+                seq, future = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            if seq != self._seq or future is not self._pending or future.cancelled():
+                continue
+            self._pending = None
+            try:
+                results = future.result()
+            except Exception:
+                results = []
+            self._show(results)
+
+        # done() turns true before the done-callback has queued the result,
+        # so polling goes on until the latest lookup has actually been taken.
+        if self._pending is not None:
+            self._poll_id = self.entry.after(10, self._poll)
+
+    def _show(self, results: list[Recipient]) -> None:
+        self._results = results
+        self.listbox.delete(0, "end")
+        if not results:
+            self.hide()
+            return
+
+        for recipient in results:
+            self.listbox.insert("end", recipient.display)
+        self.listbox.configure(height=len(results))
+        self.listbox.place(
+            in_=self.entry,
+            x=0,
+            rely=1.0,
+            relwidth=1.0,
+            y=4,
+        )
+        self.listbox.lift()
+
+    def _focus_list(self, _event: tk.Event) -> None:
+        if self._results and self.listbox.winfo_ismapped():
+            self.listbox.focus_set()
+            self.listbox.selection_clear(0, "end")
+            self.listbox.selection_set(0)
+            self.listbox.activate(0)
+
+    def _choose(self, _event: tk.Event) -> None:
+        selection = self.listbox.curselection()
+        if not selection:
+            return
+        recipient = self._results[selection[0]]
+        self.entry.delete(0, "end")
+        self.entry.insert(0, recipient.card_number)
+        self.hide()
+        self.entry.focus_set()
+
+    def _hide_unless_focused(self) -> None:
+        if self.listbox.focus_get() is not self.listbox:
+            self.hide()
@@ -3,11 +3,12 @@ from __future__ import annotations
 import tkinter as tk
 from typing import Callable
 
-from .draw import rounded_rect
+from .button import RoundedButton
 from .layout import Colors, Fonts
+from .popup import PopupWindow
 
 
-class RegistrationWindow(tk.Toplevel):
+class RegistrationWindow(PopupWindow):
     def __init__(
         self,
         master: tk.Misc,
@@ -15,22 +16,25 @@ class RegistrationWindow(tk.Toplevel):
         fonts: Fonts,
         on_submit: Callable[[dict[str, str]], bool],
     ) -> None:
-        super().__init__(master)
+        super().__init__(master, "Регистрация", 600, 600)
         self.colors = colors
         self.fonts = fonts
         self.on_submit = on_submit
         self._accent_hover = "#331772"
 
-        self.title("Регистрация")
-        self.geometry("600x600")
-        self.resizable(False, False)
         self.configure(bg=self.colors.content)
-        self.transient(master)
-        self.grab_set()
 
         self._entries: dict[str, tk.Entry] = {}
+        self._buttons: list[RoundedButton] = []
         self._build_ui()
-        self._center_over_master(master)
+
+    def reset(self) -> None:
+        for entry in self._entries.values():
+            entry.delete(0, "end")
+        for button in self._buttons:
+            button.set_hover(False)
+
+    def on_shown(self) -> None:
         self._entries["login"].focus_set()
 
     def _build_ui(self) -> None:
@@ -94,75 +98,21 @@ class RegistrationWindow(tk.Toplevel):
 
     def _action_button(
         self, parent: tk.Misc, text: str, command: Callable[[], None]
-    ) -> tk.Canvas:
-        button = tk.Canvas(
+    ) -> RoundedButton:
+        button = RoundedButton(
             parent,
+            text=text,
+            command=command,
             bg=self.colors.content,
-            highlightthickness=0,
-            bd=0,
-            cursor="hand2",
+            fill=self.colors.accent,
+            hover_fill=self._accent_hover,
+            text_fill=self.colors.text_light,
+            font=self.fonts.small,
             height=54,
         )
-
-        hover = {"active": False}
-
-        def redraw(_event: tk.Event | None = None) -> None:
-            button.delete("btn")
-            width = max(button.winfo_width(), 2)
-            height = max(button.winfo_height(), 2)
-            fill = self._accent_hover if hover["active"] else self.colors.accent
-            rounded_rect(
-                button,
-                1,
-                1,
-                width - 1,
-                height - 1,
-                radius=12,
-                fill=fill,
-                outline="",
-                tag="btn",
-            )
-            button.create_text(
-                width // 2,
-                height // 2,
-                text=text,
-                fill=self.colors.text_light,
-                font=self.fonts.small,
-                tags=("btn",),
-            )
-
-        def on_click(_event: tk.Event) -> None:
-            command()
-
-        def on_enter(_event: tk.Event) -> None:
-            hover["active"] = True
-            redraw()
-
-        def on_leave(_event: tk.Event) -> None:
-            hover["active"] = False
-            redraw()
-
-        button.bind("<Configure>", redraw)
-        button.bind("<Button-1>", on_click)
-        button.bind("<Enter>", on_enter)
-        button.bind("<Leave>", on_leave)
-
+        self._buttons.append(button)
         return button
 
     def _handle_submit(self) -> None:
         data = {key: entry.get() for key, entry in self._entries.items()}
         self.on_submit(data)
-
-    def _center_over_master(self, master: tk.Misc) -> None:
-        self.update_idletasks()
-        width = self.winfo_width()
-        height = self.winfo_height()
-
-        master_x = master.winfo_rootx()
-        master_y = master.winfo_rooty()
-        master_w = master.winfo_width()
-        master_h = master.winfo_height()
-
-        x = master_x + (master_w - width) // 2
-        y = master_y + (master_h - height) // 2
-        self.geometry(f"{width}x{height}+{max(x, 0)}+{max(y, 0)}")
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Union
+
+from .draw import rounded_rect_points
+
+if TYPE_CHECKING:
+    from .layout import Colors, Fonts
+
+
+# Colors and fonts in a spec are either attribute names on Colors/Fonts
+# ("accent", "label") or literal values ("#EEE0E5", ("Poppins", 24, "bold")),
+# so the same spec compiles against any theme.
+
+
+@dataclass(frozen=True)
+class Rect:
+    x1: int
+    y1: int
+    x2: int
+    y2: int
+    fill: str = ""
+    outline: str = ""
+    width: int = 1
+    tag: str | None = None
+
+
+@dataclass(frozen=True)
+class RoundRect:
+    x1: int
+    y1: int
+    x2: int
+    y2: int
+    radius: int
+    fill: str
+    outline: str = ""
+    width: int = 0
+    tag: str | None = None
+
+
+@dataclass(frozen=True)
+class Line:
+    x1: int
+    y1: int
+    x2: int
+    y2: int
+    fill: str
+    width: int = 1
+    tag: str | None = None
+
+
+@dataclass(frozen=True)
+class Text:
+    x: int
+    y: int
+    text: str
+    fill: str
+    font: Union[str, tuple]
+    anchor: str = "center"
+    tag: str | None = None
+
+
+@dataclass(frozen=True)
+class Picture:
+    key: str
+    filename: str
+    x: int
+    y: int
+    width: int
+    height: int
+    placeholder: str
+    fill: bool = False
+
+
+@dataclass(frozen=True)
+class EntrySpec:
+    name: str
+    x: int
+    y: int
+    width: int
+    height: int
+    show: str | None = None
+
+
+@dataclass(frozen=True)
+class ClickTarget:
+    tag: str
+    action: str
+    pass_event: bool = False
+
+
+SpecItem = Union[Rect, RoundRect, Line, Text, Picture]
+
+
+@dataclass(frozen=True)
+class Region:
+    name: str
+    items: tuple[SpecItem, ...]
+    entries: tuple[EntrySpec, ...] = ()
+    targets: tuple[ClickTarget, ...] = ()
+
+
+@dataclass(frozen=True)
+class ScreenSpec:
+    regions: tuple[Region, ...]
+
+    @property
+    def entries(self) -> tuple[EntrySpec, ...]:
+        return tuple(entry for region in self.regions for entry in region.entries)
+
+    @property
+    def targets(self) -> tuple[ClickTarget, ...]:
+        return tuple(target for region in self.regions for target in region.targets)
+
+
+@dataclass(frozen=True)
+class DrawOp:
+    method: str
+    args: tuple
+    options: dict = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class CompiledScreen:
+    order: tuple[str, ...]
+    ops: dict[str, tuple[DrawOp, ...]]
+
+    @property
+    def item_ops(self) -> int:
+        return sum(len(region_ops) for region_ops in self.ops.values())
+
+
+def region_tag(name: str) -> str:
+    return f"region:{name}"
+
+
+def compile_screen(spec: ScreenSpec, colors: Colors, fonts: Fonts) -> CompiledScreen:
+    ops: dict[str, tuple[DrawOp, ...]] = {}
+    for region in spec.regions:
+        base_tag = region_tag(region.name)
+        ops[region.name] = tuple(
+            _compile_item(item, base_tag, colors, fonts) for item in region.items
+        )
+
+    return CompiledScreen(order=tuple(region.name for region in spec.regions), ops=ops)
+
+
+def _compile_item(item: SpecItem, base_tag: str, colors: Colors, fonts: Fonts) -> DrawOp:
+    if isinstance(item, Picture):
+        # Pictures go through the asset loader at replay time; the op keeps
+        # their position in the stacking order.
+        placeholder = _color(colors, item.placeholder)
+        return DrawOp("picture", (item,), {"placeholder": placeholder, "tags": (base_tag,)})
+
+    tags = (base_tag, item.tag) if item.tag else (base_tag,)
+
+    if isinstance(item, Rect):
+        fill = _color(colors, item.fill)
+        outline = _color(colors, item.outline)
+        return DrawOp(
+            "create_rectangle",
+            (item.x1, item.y1, item.x2, item.y2),
+            {"fill": fill, "outline": outline, "width": item.width, "tags": tags},
+        )
+
+    if isinstance(item, RoundRect):
+        fill = _color(colors, item.fill)
+        outline = _color(colors, item.outline)
+        return DrawOp(
+            "create_polygon",
+            rounded_rect_points(item.x1, item.y1, item.x2, item.y2, item.radius),
+            {
+                "smooth": True,
+                "fill": fill,
+                "outline": outline or fill,
+                "width": item.width if outline else 1,
+                "tags": tags,
+            },
+        )
+
+    if isinstance(item, Line):
+        return DrawOp(
+            "create_line",
+            (item.x1, item.y1, item.x2, item.y2),
+            {"fill": _color(colors, item.fill), "width": item.width, "tags": tags},
+        )
+
+    if isinstance(item, Text):
+        return DrawOp(
+            "create_text",
+            (item.x, item.y),
+            {
+                "text": item.text,
+                "anchor": item.anchor,
+                "fill": _color(colors, item.fill),
+                "font": _font(fonts, item.font),
+                "tags": tags,
+            },
+        )
+
+    raise TypeError(f"Unsupported spec item: {item!r}")
+
+
+def _color(colors: Colors, value: str) -> str:
+    return getattr(colors, value, value) if value and not value.startswith("#") else value
+
+
+def _font(fonts: Fonts, value: Union[str, tuple]) -> tuple:
+    return getattr(fonts, value) if isinstance(value, str) else value
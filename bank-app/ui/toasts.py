@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import queue
+import threading
+import tkinter as tk
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .draw import rounded_rect_points
+from .layout import Colors, Fonts
+
+if TYPE_CHECKING:
+    from backend import Notification
+
+MAX_VISIBLE = 3
+TOAST_WIDTH = 360
+MARGIN = 16
+GAP = 10
+PADDING = 12
+PUMP_MS = 100
+DISMISS_MS = {"info": 4000, "warning": 5000, "error": 7000}
+LEVEL_FILLS = {"warning": "#7A5C00", "error": "#8B1E3F"}
+
+
+@dataclass
+class _Toast:
+    notification: Notification
+    tag: str
+    count: int = 1
+    y: int = 0
+    height: int = 0
+    title_id: int | None = None
+    after_id: str | None = None
+
+
+class ToastManager:
+    """In-canvas, non-blocking replacement for messagebox popups.
+
+    Implements the backend's NotificationSink: emit() may be called from any
+    thread, repeated notifications are folded into one toast with a counter,
+    and each toast dismisses itself after a level-dependent delay.
+    """
+
+    def __init__(self, canvas: tk.Canvas, colors: Colors, fonts: Fonts) -> None:
+        self.canvas = canvas
+        self.colors = colors
+        self.fonts = fonts
+        self._incoming: queue.Queue = queue.Queue()
+        self._visible: list[_Toast] = []
+        self._waiting: deque[_Toast] = deque()
+        self._seq = 0
+        self.canvas.after(PUMP_MS, self._pump)
+
+    def emit(self, notification: Notification) -> None:
+        if threading.current_thread() is threading.main_thread():
+            self._accept(notification)
+        else:
+            self._incoming.put(notification)
+
+    def _pump(self) -> None:
+        while True:
+            try:
+                notification = self._incoming.get_nowait()
+            except queue.Empty:
+                break
+            self._accept(notification)
+        self.canvas.after(PUMP_MS, self._pump)
+
+    def _accept(self, notification: Notification) -> None:
+        for toast in (*self._visible, *self._waiting):
+            if toast.notification.key == notification.key:
+                toast.count += 1
+                if toast in self._visible:
+                    self.canvas.itemconfigure(toast.title_id, text=self._title(toast))
+                    self._schedule_dismiss(toast)
+                return
+
+        self._seq += 1
+        self._waiting.append(_Toast(notification, tag=f"toast{self._seq}"))
+        self._show_waiting()
+
+    def _show_waiting(self) -> None:
+        while self._waiting and len(self._visible) < MAX_VISIBLE:
+            toast = self._waiting.popleft()
+            self._draw(toast)
+            self._visible.append(toast)
+            self._schedule_dismiss(toast)
+        self._restack()
+
+    def _draw(self, toast: _Toast) -> None:
+        canvas = self.canvas
+        x2 = int(canvas.cget("width")) - MARGIN
+        x1 = x2 - TOAST_WIDTH
+        wrap = TOAST_WIDTH - 2 * PADDING
+
+        toast.title_id = canvas.create_text(
+            x1 + PADDING,
+            PADDING,
+            text=self._title(toast),
+            anchor="nw",
+            width=wrap,
+            fill=self.colors.text_light,
+            font=("Poppins", 13, "bold"),
+            tags=(toast.tag,),
+        )
+        title_bottom = canvas.bbox(toast.title_id)[3]
+        body_id = canvas.create_text(
+            x1 + PADDING,
+            title_bottom + 4,
+            text=toast.notification.message,
+            anchor="nw",
+            width=wrap,
+            fill=self.colors.text_light,
+            font=("Poppins", 11),
+            tags=(toast.tag,),
+        )
+        toast.height = canvas.bbox(body_id)[3] + PADDING
+        fill = LEVEL_FILLS.get(toast.notification.level, self.colors.accent)
+        background = canvas.create_polygon(
+            rounded_rect_points(x1, 0, x2, toast.height, 10),
+            smooth=True,
+            fill=fill,
+            outline=fill,
+            tags=(toast.tag,),
+        )
+        canvas.tag_lower(background, toast.title_id)
+        canvas.tag_raise(toast.tag)
+        canvas.tag_bind(toast.tag, "<Button-1>", lambda _e: self._dismiss(toast))
+        toast.y = 0
+
+    def _schedule_dismiss(self, toast: _Toast) -> None:
+        if toast.after_id is not None:
+            self.canvas.after_cancel(toast.after_id)
+        delay = DISMISS_MS.get(toast.notification.level, DISMISS_MS["info"])
+        toast.after_id = self.canvas.after(delay, self._dismiss, toast)
+
+    def _dismiss(self, toast: _Toast) -> None:
+        if toast not in self._visible:
+            return
+        if toast.after_id is not None:
+            self.canvas.after_cancel(toast.after_id)
+            toast.after_id = None
+        self.canvas.delete(toast.tag)
+        self._visible.remove(toast)
+        self._show_waiting()
+
+    def _restack(self) -> None:
+        # Newest toast sits at the bottom edge, older ones stack upwards.
+        bottom = int(self.canvas.cget("height")) - MARGIN
+        for toast in reversed(self._visible):
+            top = bottom - toast.height
+            if top != toast.y:
+                self.canvas.move(toast.tag, 0, top - toast.y)
+                toast.y = top
+            bottom = top - GAP
+
+    @staticmethod
+    def _title(toast: _Toast) -> str:
+        title = toast.notification.title
+        return f"{title} ×{toast.count}" if toast.count > 1 else title